@@ -2,7 +2,7 @@ from fastapi import APIRouter
 from .endpoints import (
     auth, users, projects, submissions, tracks, newsletters, 
     code_editor, ai_assistant, portfolio, gamification, 
-    mentorship, collaboration, integrated_features, security, flow
+    mentorship, collaboration, integrated_features, security, flow, monitoring
 )
 
 api_router = APIRouter()
@@ -35,3 +35,6 @@ api_router.include_router(integrated_features.router, prefix="/integrated-featur
 # Security
 api_router.include_router(security.router, prefix="/security", tags=["security"])
 api_router.include_router(flow.router, prefix="/flow", tags=["flow"])
+
+# Operations
+api_router.include_router(monitoring.router, prefix="/monitoring", tags=["monitoring"])
@@ -35,7 +35,7 @@ class TutorQuestionRequest(BaseModel):
     user_level: Optional[str] = "beginner"
 
 @router.post("/project-ideas", response_model=List[Dict[str, Any]])
-async def generate_project_ideas(
+def generate_project_ideas(
     request: ProjectIdeaRequest,
     current_user: Optional[User] = Depends(get_optional_user),
     db: Session = Depends(get_db)
@@ -62,7 +62,7 @@ async def generate_project_ideas(
         )
 
 @router.post("/learning-path", response_model=Dict[str, Any])
-async def generate_learning_path(
+def generate_learning_path(
     request: LearningPathRequest,
     current_user: Optional[User] = Depends(get_optional_user),
     db: Session = Depends(get_db)
@@ -89,7 +89,7 @@ async def generate_learning_path(
         )
 
 @router.post("/code-review", response_model=Dict[str, Any])
-async def get_code_review(
+def get_code_review(
     request: CodeReviewRequest,
     current_user: Optional[User] = Depends(get_optional_user),
     db: Session = Depends(get_db)
@@ -116,7 +116,7 @@ async def get_code_review(
         )
 
 @router.post("/project-description", response_model=Dict[str, Any])
-async def generate_project_description(
+def generate_project_description(
     request: ProjectDescriptionRequest,
     current_user: Optional[User] = Depends(get_optional_user),
     db: Session = Depends(get_db)
@@ -143,7 +143,7 @@ async def generate_project_description(
         )
 
 @router.post("/tutor", response_model=Dict[str, Any])
-async def ask_ai_tutor(
+def ask_ai_tutor(
     request: TutorQuestionRequest,
     current_user: Optional[User] = Depends(get_optional_user),
     db: Session = Depends(get_db)
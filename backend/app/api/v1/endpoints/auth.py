@@ -21,7 +21,7 @@ router = APIRouter()
 
 
 @router.post("/signup", response_model=dict)
-async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
+def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     """User registration endpoint"""
     try:
         # Check if user already exists
@@ -96,7 +96,7 @@ def clear_failed_attempts(email: str):
         del login_attempts[email]
 
 @router.post("/login", response_model=dict)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     """User login endpoint"""
     try:
         # Check rate limiting
@@ -235,7 +235,7 @@ async def get_supported_languages():
     }
 
 @router.post("/save")
-async def save_code(
+def save_code(
     request: Dict[str, Any],
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -315,7 +315,7 @@ int main() {
     return templates.get(language.lower(), {"name": "Empty", "code": ""})
 
 @router.post("/sync")
-async def sync_project(
+def sync_project(
     request: Dict[str, Any],
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(get_optional_user)
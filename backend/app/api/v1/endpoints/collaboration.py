@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import uuid
 
-from ....core.database import get_db
+from ....core.database import get_db, query_budget
 from ....models.collaboration import (
     TeamProject, ProjectParticipant, CollaborationSession, ProjectFile,
     FileChange, CursorPosition, ChatMessage, TeamInvitation,
@@ -15,7 +16,7 @@ from ....models.gamification import UserProgress
 router = APIRouter()
 
 @router.post("/projects")
-async def create_team_project(
+def create_team_project(
     name: str,
     description: str,
     difficulty_level: str,
@@ -76,8 +77,8 @@ async def create_team_project(
         }
     }
 
-@router.get("/projects")
-async def get_team_projects(
+@router.get("/projects", dependencies=[Depends(query_budget(3))])
+def get_team_projects(
     user_id: str = "user-123",  # Mock user ID
     status: str = "active",
     difficulty: Optional[str] = None,
@@ -105,6 +106,15 @@ async def get_team_projects(
     
     projects = query.all()
     
+    # Team sizes for every project in one grouped query instead of loading each participant list
+    team_sizes = {}
+    if projects:
+        team_sizes = dict(
+            db.query(ProjectParticipant.project_id, func.count(ProjectParticipant.id)).filter(
+                ProjectParticipant.project_id.in_([project.id for project in projects])
+            ).group_by(ProjectParticipant.project_id).all()
+        )
+    
     return {
         "success": True,
         "projects": [
@@ -114,7 +124,7 @@ async def get_team_projects(
                 "description": project.description,
                 "difficulty_level": project.difficulty_level,
                 "max_team_size": project.max_team_size,
-                "current_team_size": len(project.participants),
+                "current_team_size": team_sizes.get(project.id, 0),
                 "is_public": project.is_public,
                 "created_by": project.created_by,
                 "created_at": project.created_at,
@@ -125,7 +135,7 @@ async def get_team_projects(
     }
 
 @router.get("/projects/{project_id}")
-async def get_team_project(project_id: str, db: Session = Depends(get_db)):
+def get_team_project(project_id: str, db: Session = Depends(get_db)):
     """Get specific team project details"""
     
     project = db.query(TeamProject).filter(TeamProject.id == project_id).first()
@@ -168,7 +178,7 @@ async def get_team_project(project_id: str, db: Session = Depends(get_db)):
     }
 
 @router.post("/projects/{project_id}/join")
-async def join_team_project(
+def join_team_project(
     project_id: str,
     user_id: str = "user-123",  # Mock user ID
     role: str = "contributor",
@@ -229,7 +239,7 @@ async def join_team_project(
     }
 
 @router.post("/projects/{project_id}/invite")
-async def invite_to_project(
+def invite_to_project(
     project_id: str,
     invited_user_id: str,
     role: str = "contributor",
@@ -283,7 +293,7 @@ async def invite_to_project(
     }
 
 @router.post("/invitations/{invitation_id}/respond")
-async def respond_to_invitation(
+def respond_to_invitation(
     invitation_id: str,
     response: str,  # "accept" or "decline"
     user_id: str = "user-123",  # Mock user ID
@@ -333,7 +343,7 @@ async def respond_to_invitation(
     }
 
 @router.get("/projects/{project_id}/files")
-async def get_project_files(project_id: str, db: Session = Depends(get_db)):
+def get_project_files(project_id: str, db: Session = Depends(get_db)):
     """Get files for a project"""
     
     files = db.query(ProjectFile).filter(ProjectFile.project_id == project_id).all()
@@ -358,7 +368,7 @@ async def get_project_files(project_id: str, db: Session = Depends(get_db)):
     }
 
 @router.post("/projects/{project_id}/files")
-async def create_project_file(
+def create_project_file(
     project_id: str,
     filename: str,
     file_path: str,
@@ -406,7 +416,7 @@ async def create_project_file(
     }
 
 @router.get("/projects/{project_id}/chat")
-async def get_chat_messages(
+def get_chat_messages(
     project_id: str,
     limit: int = 50,
     offset: int = 0,
@@ -439,7 +449,7 @@ async def get_chat_messages(
     }
 
 @router.get("/user/{user_id}/invitations")
-async def get_user_invitations(
+def get_user_invitations(
     user_id: str,
     status: str = "pending",
     db: Session = Depends(get_db)
@@ -4,13 +4,13 @@ Handles user progression, badges, achievements, and leaderboards
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, func, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, desc, func, and_, or_
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 import uuid
 
-from ....core.database import get_db
+from ....core.database import get_async_db
 from ....models.user import User
 from ....models.gamification import (
     UserProgress, Badge, UserBadge, XPTransaction, StreakHistory,
@@ -24,12 +24,12 @@ router = APIRouter()
 @router.get("/progress/{user_id}")
 async def get_user_progress(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[User] = Depends(get_optional_user)
 ):
     """Get user's gamification progress"""
     try:
-        user_progress = db.query(UserProgress).filter(UserProgress.user_id == user_id).first()
+        user_progress = await db.scalar(select(UserProgress).where(UserProgress.user_id == user_id))
         
         if not user_progress:
             # Create initial progress for new user
@@ -43,8 +43,8 @@ async def get_user_progress(
                 unlocked_features=[]
             )
             db.add(user_progress)
-            db.commit()
-            db.refresh(user_progress)
+            await db.commit()
+            await db.refresh(user_progress)
         
         # Calculate level progress
         current_level_xp = LEVEL_REQUIREMENTS.get(user_progress.level, 0)
@@ -55,14 +55,18 @@ async def get_user_progress(
         level_progress_percentage = (xp_progress / xp_for_current_level * 100) if xp_for_current_level > 0 else 100
         
         # Get recent badges
-        recent_badges = db.query(UserBadge, Badge).join(Badge).filter(
-            UserBadge.user_progress_id == user_progress.id
-        ).order_by(desc(UserBadge.earned_date)).limit(5).all()
+        recent_badges = (await db.execute(
+            select(UserBadge, Badge).join(Badge).where(
+                UserBadge.user_progress_id == user_progress.id
+            ).order_by(desc(UserBadge.earned_date)).limit(5)
+        )).all()
         
         # Get recent XP transactions
-        recent_xp = db.query(XPTransaction).filter(
-            XPTransaction.user_progress_id == user_progress.id
-        ).order_by(desc(XPTransaction.created_at)).limit(10).all()
+        recent_xp = (await db.execute(
+            select(XPTransaction).where(
+                XPTransaction.user_progress_id == user_progress.id
+            ).order_by(desc(XPTransaction.created_at)).limit(10)
+        )).scalars().all()
         
         return {
             "user_id": user_progress.user_id,
@@ -108,7 +112,7 @@ async def get_user_progress(
 @router.post("/xp/award")
 async def award_xp(
     request: Dict[str, Any],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Award XP to user for specific actions"""
@@ -123,7 +127,7 @@ async def award_xp(
             raise HTTPException(status_code=400, detail="Invalid XP award request")
         
         # Get or create user progress
-        user_progress = db.query(UserProgress).filter(UserProgress.user_id == user_id).first()
+        user_progress = await db.scalar(select(UserProgress).where(UserProgress.user_id == user_id))
         if not user_progress:
             user_progress = UserProgress(
                 user_id=user_id,
@@ -135,8 +139,8 @@ async def award_xp(
                 unlocked_features=[]
             )
             db.add(user_progress)
-            db.commit()
-            db.refresh(user_progress)
+            await db.commit()
+            await db.refresh(user_progress)
         
         # Award XP
         user_progress.total_xp += amount
@@ -180,7 +184,7 @@ async def award_xp(
         # Check for badge eligibility
         new_badges = await check_badge_eligibility(user_progress, db)
         
-        db.commit()
+        await db.commit()
         
         return {
             "success": True,
@@ -194,13 +198,13 @@ async def award_xp(
         }
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to award XP: {str(e)}")
 
 @router.post("/streak/update")
 async def update_streak(
     request: Dict[str, Any],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Update user's daily streak"""
@@ -209,7 +213,7 @@ async def update_streak(
         activity_type = request.get("activity_type", "login")
         
         # Get user progress
-        user_progress = db.query(UserProgress).filter(UserProgress.user_id == user_id).first()
+        user_progress = await db.scalar(select(UserProgress).where(UserProgress.user_id == user_id))
         if not user_progress:
             raise HTTPException(status_code=404, detail="User progress not found")
         
@@ -276,7 +280,7 @@ async def update_streak(
             )
             db.add(milestone_transaction)
         
-        db.commit()
+        await db.commit()
         
         return {
             "success": True,
@@ -287,30 +291,30 @@ async def update_streak(
         }
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to update streak: {str(e)}")
 
 @router.get("/badges/{user_id}")
 async def get_user_badges(
     user_id: str,
     category: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[User] = Depends(get_optional_user)
 ):
     """Get user's badges"""
     try:
-        user_progress = db.query(UserProgress).filter(UserProgress.user_id == user_id).first()
+        user_progress = await db.scalar(select(UserProgress).where(UserProgress.user_id == user_id))
         if not user_progress:
             return {"badges": []}
         
-        query = db.query(UserBadge, Badge).join(Badge).filter(
+        query = select(UserBadge, Badge).join(Badge).where(
             UserBadge.user_progress_id == user_progress.id
         )
         
         if category:
-            query = query.filter(Badge.category == category)
+            query = query.where(Badge.category == category)
         
-        badges = query.order_by(desc(UserBadge.earned_date)).all()
+        badges = (await db.execute(query.order_by(desc(UserBadge.earned_date)))).all()
         
         return {
             "badges": [
@@ -337,7 +341,7 @@ async def get_leaderboard(
     period: str = Query("weekly"),
     category: str = Query("xp"),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[User] = Depends(get_optional_user)
 ):
     """Get leaderboard data"""
@@ -353,27 +357,33 @@ async def get_leaderboard(
         
         # Get leaderboard data based on category
         if category == "xp":
-            leaderboard_data = db.query(
-                User.username,
-                UserProgress.total_xp,
-                UserProgress.level,
-                UserProgress.current_streak
-            ).join(UserProgress).order_by(desc(UserProgress.total_xp)).limit(limit).all()
+            leaderboard_data = (await db.execute(
+                select(
+                    User.username,
+                    UserProgress.total_xp,
+                    UserProgress.level,
+                    UserProgress.current_streak
+                ).join(UserProgress).order_by(desc(UserProgress.total_xp)).limit(limit)
+            )).all()
         elif category == "streak":
-            leaderboard_data = db.query(
-                User.username,
-                UserProgress.current_streak,
-                UserProgress.total_xp,
-                UserProgress.level
-            ).join(UserProgress).order_by(desc(UserProgress.current_streak)).limit(limit).all()
+            leaderboard_data = (await db.execute(
+                select(
+                    User.username,
+                    UserProgress.current_streak,
+                    UserProgress.total_xp,
+                    UserProgress.level
+                ).join(UserProgress).order_by(desc(UserProgress.current_streak)).limit(limit)
+            )).all()
         elif category == "projects":
             # This would require joining with projects table
-            leaderboard_data = db.query(
-                User.username,
-                UserProgress.total_xp,
-                UserProgress.level,
-                UserProgress.current_streak
-            ).join(UserProgress).order_by(desc(UserProgress.total_xp)).limit(limit).all()
+            leaderboard_data = (await db.execute(
+                select(
+                    User.username,
+                    UserProgress.total_xp,
+                    UserProgress.level,
+                    UserProgress.current_streak
+                ).join(UserProgress).order_by(desc(UserProgress.total_xp)).limit(limit)
+            )).all()
         else:
             raise HTTPException(status_code=400, detail="Invalid category")
         
@@ -402,17 +412,19 @@ async def get_leaderboard(
 @router.get("/unlocks/{user_id}")
 async def get_user_unlocks(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[User] = Depends(get_optional_user)
 ):
     """Get user's unlocked features"""
     try:
-        user_progress = db.query(UserProgress).filter(UserProgress.user_id == user_id).first()
+        user_progress = await db.scalar(select(UserProgress).where(UserProgress.user_id == user_id))
         if not user_progress:
             return {"unlocked_features": [], "available_unlocks": []}
         
         # Get all unlockable features
-        all_features = db.query(UnlockableFeature).filter(UnlockableFeature.is_active == True).all()
+        all_features = (await db.execute(
+            select(UnlockableFeature).where(UnlockableFeature.is_active == True)
+        )).scalars().all()
         
         unlocked_features = user_progress.unlocked_features or []
         available_unlocks = []
@@ -453,7 +465,7 @@ async def get_user_unlocks(
 @router.post("/badges/feature")
 async def feature_badge(
     request: Dict[str, Any],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Feature or unfeature a badge on user's profile"""
@@ -465,25 +477,27 @@ async def feature_badge(
         if not badge_id:
             raise HTTPException(status_code=400, detail="Badge ID is required")
         
-        user_progress = db.query(UserProgress).filter(UserProgress.user_id == user_id).first()
+        user_progress = await db.scalar(select(UserProgress).where(UserProgress.user_id == user_id))
         if not user_progress:
             raise HTTPException(status_code=404, detail="User progress not found")
         
-        user_badge = db.query(UserBadge).filter(
-            UserBadge.user_progress_id == user_progress.id,
-            UserBadge.badge_id == badge_id
-        ).first()
+        user_badge = await db.scalar(
+            select(UserBadge).where(
+                UserBadge.user_progress_id == user_progress.id,
+                UserBadge.badge_id == badge_id
+            )
+        )
         
         if not user_badge:
             raise HTTPException(status_code=404, detail="Badge not found")
         
         user_badge.is_featured = is_featured
-        db.commit()
+        await db.commit()
         
         return {"success": True, "is_featured": is_featured}
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to feature badge: {str(e)}")
 
 # Helper functions
@@ -517,20 +531,22 @@ def check_feature_unlocks(user_progress: UserProgress) -> List[str]:
     
     return new_unlocks
 
-async def check_badge_eligibility(user_progress: UserProgress, db: Session) -> List[Dict[str, Any]]:
+async def check_badge_eligibility(user_progress: UserProgress, db: AsyncSession) -> List[Dict[str, Any]]:
     """Check if user is eligible for any new badges"""
     new_badges = []
     
     # Get all badges user doesn't have
-    user_badge_ids = db.query(UserBadge.badge_id).filter(
-        UserBadge.user_progress_id == user_progress.id
-    ).all()
+    user_badge_ids = (await db.execute(
+        select(UserBadge.badge_id).where(UserBadge.user_progress_id == user_progress.id)
+    )).all()
     user_badge_ids = [str(badge_id[0]) for badge_id in user_badge_ids]
     
-    available_badges = db.query(Badge).filter(
-        Badge.is_active == True,
-        ~Badge.id.in_(user_badge_ids)
-    ).all()
+    available_badges = (await db.execute(
+        select(Badge).where(
+            Badge.is_active == True,
+            ~Badge.id.in_(user_badge_ids)
+        )
+    )).scalars().all()
     
     for badge in available_badges:
         requirements = badge.requirements
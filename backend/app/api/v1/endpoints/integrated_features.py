@@ -31,7 +31,7 @@ router = APIRouter()
 # ==============================================
 
 @router.get("/dashboard", response_model=UserDashboardResponse)
-async def get_user_dashboard(
+def get_user_dashboard(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -99,7 +99,7 @@ async def get_user_dashboard(
 # ==============================================
 
 @router.post("/features/unlock")
-async def unlock_feature(
+def unlock_feature(
     request: FeatureUnlockRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -177,7 +177,7 @@ async def unlock_feature(
 # ==============================================
 
 @router.post("/collaboration/join")
-async def join_collaboration(
+def join_collaboration(
     request: CollaborationJoinRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -285,7 +285,7 @@ async def join_collaboration(
 # ==============================================
 
 @router.post("/mentorship/request")
-async def request_mentorship(
+def request_mentorship(
     request: MentorshipRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -352,7 +352,7 @@ async def request_mentorship(
 # ==============================================
 
 @router.post("/challenges/register")
-async def register_for_challenge(
+def register_for_challenge(
     request: IndustryChallengeRegistration,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -446,7 +446,7 @@ async def register_for_challenge(
 # ==============================================
 
 @router.post("/portfolio/generate")
-async def generate_portfolio(
+def generate_portfolio(
     request: PortfolioGenerationRequest,
     background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
@@ -578,7 +578,7 @@ async def generate_portfolio_assets(portfolio_id: str):
 # ==============================================
 
 @router.get("/features/status")
-async def get_feature_status(
+def get_feature_status(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
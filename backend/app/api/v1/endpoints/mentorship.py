@@ -89,7 +89,7 @@ async def assess_learning_style(
     }
 
 @router.get("/learning-style/{user_id}")
-async def get_learning_style(user_id: str, db: Session = Depends(get_db)):
+def get_learning_style(user_id: str, db: Session = Depends(get_db)):
     """Get user's learning style profile"""
     profile = db.query(LearningStyleProfile).filter(
         LearningStyleProfile.user_id == user_id
@@ -203,7 +203,7 @@ async def update_learning_progress(
     return {"success": True, "message": "Progress updated successfully"}
 
 @router.get("/sessions/{user_id}")
-async def get_mentorship_sessions(
+def get_mentorship_sessions(
     user_id: str, 
     limit: int = 20,
     db: Session = Depends(get_db)
@@ -238,7 +238,7 @@ async def get_mentorship_sessions(
     }
 
 @router.post("/feedback/{session_id}")
-async def submit_session_feedback(
+def submit_session_feedback(
     session_id: str,
     satisfaction: int,
     was_helpful: bool,
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import Dict, Any
+from app.core.cache import async_cache, cache
+from app.core.config import settings
+from app.core.database import get_connection_info, query_profiler
+from app.core.replicas import replica_router
+from app.core.security import get_current_admin_user
+from app.models.user import User
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.get("/cache", response_model=Dict[str, Any])
+async def inspect_cache(
+    hot_keys: int = Query(20, ge=1, le=200),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Live cache inspector: tier totals, per-namespace counters and the hottest keys"""
+    try:
+        stats = await async_cache.get_stats()
+        stats.update(cache.inspect(hot_key_limit=hot_keys))
+        return stats
+    except Exception as e:
+        logger.error(f"Error inspecting cache: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error inspecting cache: {str(e)}"
+        )
+
+@router.get("/queries", response_model=Dict[str, Any])
+async def recent_query_profiles(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Query count, total time and slowest statements of recent requests"""
+    return {
+        "enabled": settings.query_profiling,
+        "slow_query_threshold": settings.slow_query_threshold,
+        "profiles": query_profiler.recent(limit)
+    }
+
+@router.get("/database", response_model=Dict[str, Any])
+async def database_status(current_user: User = Depends(get_current_admin_user)):
+    """Primary pool usage and read replica health"""
+    return {
+        "primary_pool": get_connection_info(),
+        **replica_router.get_stats()
+    }
@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, desc, func, and_
 from typing import List, Optional, cast
 from datetime import datetime
 import json
 
-from ....core.database import get_db
+from ....core.database import get_async_db, get_db, query_budget
 from ....models.newsletter import Newsletter, NewsletterSubscription, NewsletterLike, NewsletterComment
 from ....models.entities import Field
 from ....models.user import User
@@ -67,7 +68,7 @@ async def get_newsletter_sources(
         logger.error(f"Error fetching sources: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch sources: {str(e)}")
 
-@router.get("/", response_model=NewsletterListResponse)
+@router.get("/", response_model=NewsletterListResponse, dependencies=[Depends(query_budget(8))])
 async def get_newsletters(
     page: int = Query(1, ge=1),
     per_page: int = Query(10, ge=1, le=100),
@@ -76,53 +77,59 @@ async def get_newsletters(
     search: Optional[str] = Query(None),
     include_external: bool = Query(True, description="Include external newsletters"),
     category: Optional[str] = Query(None, description="Filter by category"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[User] = Depends(get_optional_user)
 ):
     """Get paginated list of newsletters"""
-    query = db.query(Newsletter).options(
-        joinedload(Newsletter.author),
-        joinedload(Newsletter.field)
-    )
-    
     # Filter by status
-    query = query.filter(Newsletter.status == status)
+    query = select(Newsletter).where(Newsletter.status == status)
     
     # Filter by field if specified
     if field_id:
-        query = query.filter(Newsletter.field_id == field_id)
+        query = query.where(Newsletter.field_id == field_id)
     
     # Search functionality
     if search:
-        query = query.filter(Newsletter.title.ilike(f"%{search}%"))
-    
-    # Order by creation date (newest first)
-    query = query.order_by(desc(Newsletter.created_at))
+        query = query.where(Newsletter.title.ilike(f"%{search}%"))
     
     # Get total count
-    total = query.count()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
     
-    # Apply pagination
+    # Apply pagination, newest first; author and field are loaded eagerly since
+    # lazy loads cannot run on an AsyncSession
     offset = (page - 1) * per_page
-    newsletters = query.offset(offset).limit(per_page).all()
+    newsletters = (await db.execute(
+        query.options(
+            joinedload(Newsletter.author),
+            joinedload(Newsletter.field)
+        ).order_by(desc(Newsletter.created_at)).offset(offset).limit(per_page)
+    )).scalars().all()
+    
+    # Comment counts and the current user's likes for the whole page in one query each
+    newsletter_ids = [newsletter.id for newsletter in newsletters]
+    comments_counts = {}
+    liked_ids = set()
+    if newsletter_ids:
+        comments_counts = dict((await db.execute(
+            select(NewsletterComment.newsletter_id, func.count(NewsletterComment.id)).where(
+                NewsletterComment.newsletter_id.in_(newsletter_ids)
+            ).group_by(NewsletterComment.newsletter_id)
+        )).all())
+        if current_user:
+            liked_ids = set((await db.scalars(
+                select(NewsletterLike.newsletter_id).where(
+                    and_(
+                        NewsletterLike.newsletter_id.in_(newsletter_ids),
+                        NewsletterLike.user_id == current_user.id
+                    )
+                )
+            )).all())
     
     # Prepare response data
     newsletter_responses = []
     for newsletter in newsletters:
-        # Get comments count
-        comments_count = db.query(NewsletterComment).filter(
-            NewsletterComment.newsletter_id == newsletter.id
-        ).count()
-        
-        # Check if current user liked this newsletter
-        is_liked = False
-        if current_user:
-            is_liked = db.query(NewsletterLike).filter(
-                and_(
-                    NewsletterLike.newsletter_id == newsletter.id,
-                    NewsletterLike.user_id == current_user.id
-                )
-            ).first() is not None
+        comments_count = comments_counts.get(newsletter.id, 0)
+        is_liked = newsletter.id in liked_ids
         
         newsletter_dict = {
             "id": newsletter.id,
@@ -398,7 +405,11 @@ def toggle_newsletter_like(
     
     return {"liked": liked, "total_likes": newsletter.likes}
 
-@router.get("/{newsletter_id}/comments", response_model=List[NewsletterCommentResponse])
+@router.get(
+    "/{newsletter_id}/comments",
+    response_model=List[NewsletterCommentResponse],
+    dependencies=[Depends(query_budget(4))]
+)
 def get_newsletter_comments(
     newsletter_id: int,
     db: Session = Depends(get_db)
@@ -418,17 +429,22 @@ def get_newsletter_comments(
         )
     ).order_by(NewsletterComment.created_at).all()
     
-    comment_responses = []
-    for comment in comments:
-        # Get replies
+    # Replies to every top-level comment in one query, grouped by parent
+    replies_by_parent = {}
+    if comments:
         replies = db.query(NewsletterComment).options(
             joinedload(NewsletterComment.user)
         ).filter(
-            NewsletterComment.parent_id == comment.id
+            NewsletterComment.newsletter_id == newsletter_id,
+            NewsletterComment.parent_id.in_([comment.id for comment in comments])
         ).order_by(NewsletterComment.created_at).all()
-        
-        reply_responses = []
         for reply in replies:
+            replies_by_parent.setdefault(reply.parent_id, []).append(reply)
+    
+    comment_responses = []
+    for comment in comments:
+        reply_responses = []
+        for reply in replies_by_parent.get(comment.id, []):
             reply_dict = {
                 "id": reply.id,
                 "newsletter_id": reply.newsletter_id,
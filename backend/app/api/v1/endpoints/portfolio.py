@@ -98,7 +98,7 @@ async def create_portfolio_project(
         raise HTTPException(status_code=500, detail=f"Failed to create portfolio project: {str(e)}")
 
 @router.get("/projects/{user_id}")
-async def get_user_portfolio_projects(
+def get_user_portfolio_projects(
     user_id: str,
     limit: Optional[int] = Query(10, ge=1, le=100),
     offset: Optional[int] = Query(0, ge=0),
@@ -194,7 +194,7 @@ async def get_user_portfolio_projects(
         raise HTTPException(status_code=500, detail=f"Failed to fetch portfolio projects: {str(e)}")
 
 @router.get("/projects/single/{project_id}")
-async def get_portfolio_project(
+def get_portfolio_project(
     project_id: str,
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(get_optional_user)
@@ -233,7 +233,7 @@ async def get_portfolio_project(
         raise HTTPException(status_code=500, detail=f"Failed to fetch portfolio project: {str(e)}")
 
 @router.put("/projects/{project_id}")
-async def update_portfolio_project(
+def update_portfolio_project(
     project_id: str,
     updates: Dict[str, Any],
     db: Session = Depends(get_db),
@@ -254,7 +254,7 @@ async def update_portfolio_project(
         raise HTTPException(status_code=500, detail=f"Failed to update portfolio project: {str(e)}")
 
 @router.delete("/projects/{project_id}")
-async def delete_portfolio_project(
+def delete_portfolio_project(
     project_id: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -273,7 +273,7 @@ async def delete_portfolio_project(
         raise HTTPException(status_code=500, detail=f"Failed to delete portfolio project: {str(e)}")
 
 @router.get("/users/{user_id}")
-async def get_portfolio_user(
+def get_portfolio_user(
     user_id: str,
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(get_optional_user)
@@ -311,7 +311,7 @@ async def get_portfolio_user(
         raise HTTPException(status_code=500, detail=f"Failed to fetch portfolio user: {str(e)}")
 
 @router.get("/stats/{user_id}")
-async def get_portfolio_stats(
+def get_portfolio_stats(
     user_id: str,
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(get_optional_user)
@@ -351,7 +351,7 @@ async def get_portfolio_stats(
         raise HTTPException(status_code=500, detail=f"Failed to fetch portfolio stats: {str(e)}")
 
 @router.post("/export")
-async def export_portfolio(
+def export_portfolio(
     export_data: Dict[str, Any],
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -377,7 +377,7 @@ async def export_portfolio(
         raise HTTPException(status_code=500, detail=f"Failed to export portfolio: {str(e)}")
 
 @router.get("/analytics/{user_id}")
-async def get_portfolio_analytics(
+def get_portfolio_analytics(
     user_id: str,
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(get_optional_user)
@@ -420,7 +420,7 @@ async def get_portfolio_analytics(
         raise HTTPException(status_code=500, detail=f"Failed to fetch portfolio analytics: {str(e)}")
 
 @router.post("/github/integrate")
-async def integrate_github_repository(
+def integrate_github_repository(
     integration_data: Dict[str, Any],
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -457,7 +457,7 @@ async def integrate_github_repository(
         raise HTTPException(status_code=500, detail=f"Failed to integrate GitHub repository: {str(e)}")
 
 @router.post("/demo-links")
-async def add_demo_link(
+def add_demo_link(
     demo_data: Dict[str, Any],
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -1,23 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, asc, cast, String, or_
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer_group
+from sqlalchemy import select, func, desc, cast, String, or_
 from typing import List, Dict, Any, Optional
-from app.core.database import get_db, get_connection_info
-from app.core.cache import cache, cached, invalidate_cache
-from app.models.project import Project, Track, ProjectStatus, ProjectDifficulty
+from app.core.database import AsyncSessionLocal, get_async_db, get_connection_info
+from app.core.replicas import route_session
+from app.core.domains import domain_keywords
+from app.core.facets import hours_range, read_facet_counts
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, next_cursor
+from app.core.search import apply_project_search, render_highlight, search_ready, search_terms
+from app.core.cache import cache, async_cache, invalidate_namespace, invalidate_tags
+from app.models.project import Project, ProjectDomain, ProjectFacetCount, Track, ProjectStatus, ProjectDifficulty
 from app.models.user import User
+from app.core.security import get_current_admin_user
+from app.services.catalog import PROJECT_SUMMARY_COLUMNS, catalog, project_summary
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Ad-hoc invalidation may only reach keys of the projects namespace
+PROJECT_KEY_PREFIX = "projects:"
+
 @router.get("/debug")
-async def debug_projects(db: Session = Depends(get_db)):
+async def debug_projects(db: AsyncSession = Depends(get_async_db)):
     """Debug endpoint to check database connection"""
     try:
-        total = db.query(Project).count()
-        published = db.query(Project).filter(Project.status == ProjectStatus.PUBLISHED).count()
+        total = await db.scalar(select(func.count(Project.id)))
+        published = await db.scalar(
+            select(func.count(Project.id)).where(Project.status == ProjectStatus.PUBLISHED)
+        )
         return {
             "total_projects": total,
             "published_projects": published,
@@ -26,63 +39,85 @@ async def debug_projects(db: Session = Depends(get_db)):
     except Exception as e:
         return {"error": str(e)}
 
-@router.get("/", response_model=List[Dict[str, Any]])
-async def get_projects(
-    db: Session = Depends(get_db),
-    limit: Optional[int] = Query(None, ge=1, le=1000),
-    offset: Optional[int] = Query(0, ge=0),
-    difficulty: Optional[str] = Query(None),
-    domain: Optional[str] = Query(None),
-    search: Optional[str] = Query(None)
+def _catalog_query(
+    dialect: str,
+    difficulty: Optional[str],
+    domain: Optional[str],
+    search: Optional[str],
+    tag: Optional[str] = None,
+    hours: Optional[str] = None
 ):
-    """Get all projects with optional filtering and pagination"""
-    try:
-        # Create cache key based on parameters
-        cache_key = f"projects:{limit}:{offset}:{difficulty}:{domain}:{search}"
-        
-        # Try to get from cache first
-        cached_result = cache.get(cache_key)
-        if cached_result is not None:
-            logger.info(f"Cache hit for projects query: {cache_key}")
-            return cached_result
-        
-        # Build query with optimizations
-        query = db.query(Project).filter(Project.status == ProjectStatus.PUBLISHED)
-        
-        # Apply filters
-        if difficulty and difficulty != 'all':
-            query = query.filter(Project.difficulty == ProjectDifficulty(difficulty))
-        
-        if domain and domain != 'all':
-            # Map domain to relevant technologies (SQLite compatible)
-            domain_keywords = {
-                'web-dev': ['html', 'css', 'javascript', 'react', 'node', 'vue', 'angular', 'web', 'frontend', 'backend'],
-                'ai-ml': ['python', 'tensorflow', 'machine learning', 'ai', 'ml', 'data science', 'pytorch'],
-                'mobile': ['android', 'ios', 'react native', 'flutter', 'mobile', 'app'],
-                'cybersecurity': ['security', 'cyber', 'encryption', 'auth', 'penetration'],
-                'creative-industry': ['design', 'ui', 'ux', 'graphics', 'creative', 'art']
-            }
-            
-            keywords = domain_keywords.get(domain, [domain])
-            conditions = []
-            for keyword in keywords:
-                conditions.append(func.lower(cast(Project.tags, String)).like(f'%{keyword}%'))
-                conditions.append(func.lower(Project.title).like(f'%{keyword}%'))
-                conditions.append(func.lower(Project.description).like(f'%{keyword}%'))
-            
-            if conditions:
-                query = query.filter(or_(*conditions))
-        
-        if search:
-            search_term = f'%{search.lower()}%'
-            query = query.filter(
-                func.lower(Project.title).ilike(search_term) |
-                func.lower(Project.description).ilike(search_term) |
-                func.lower(cast(Project.tags, String)).like(search_term)
+    """Filtered catalog select (unordered, unpaged) and whether it ranks by full-text relevance"""
+    # Build query with optimizations
+    query = select(*PROJECT_SUMMARY_COLUMNS).where(Project.status == ProjectStatus.PUBLISHED)
+    
+    # Apply filters
+    if difficulty and difficulty != 'all':
+        query = query.where(Project.difficulty == ProjectDifficulty(difficulty))
+    
+    if domain and domain != 'all':
+        if domain in domain_keywords():
+            # Classified at write time: an indexed equality lookup
+            query = query.join(ProjectDomain, ProjectDomain.project_id == Project.id).where(
+                ProjectDomain.domain == domain
             )
+        else:
+            # Unconfigured domain names still match as a plain keyword
+            keyword = f'%{domain.lower()}%'
+            query = query.where(or_(
+                func.lower(cast(Project.tags, String)).like(keyword),
+                func.lower(Project.title).like(keyword),
+                func.lower(Project.description).like(keyword)
+            ))
+    
+    if tag:
+        # Exact element of the JSON list, matched as the quoted string
+        query = query.where(func.lower(cast(Project.tags, String)).contains(f'"{tag.lower()}"', autoescape=True))
+    
+    if hours:
+        low, high = hours_range(hours)
+        query = query.where(Project.estimated_hours >= low)
+        if high is not None:
+            query = query.where(Project.estimated_hours < high)
+    
+    # Full-text index lookup ranked by relevance; LIKE scan only where the index is missing
+    terms = search_terms(search)
+    full_text = bool(terms) and search_ready(dialect)
+    if full_text:
+        query = apply_project_search(query, dialect, terms)
+    elif search:
+        search_term = f'%{search.lower()}%'
+        query = query.where(
+            func.lower(Project.title).ilike(search_term) |
+            func.lower(Project.description).ilike(search_term) |
+            func.lower(cast(Project.tags, String)).like(search_term)
+        )
+    
+    return query, full_text
+
+async def _load_projects(
+    limit: Optional[int],
+    offset: Optional[int],
+    difficulty: Optional[str],
+    domain: Optional[str],
+    search: Optional[str],
+    tag: Optional[str] = None,
+    hours: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Run the catalog query on a short-lived session of its own.
+
+    Owning the session lets the cache layer call this from a background
+    refresh after the request that triggered it has finished. Browsing is
+    served from the catalog snapshot; this runs for search, which pages by
+    offset only.
+    """
+    async with AsyncSessionLocal() as db:
+        route_session(db, read_only=True)
+        query, full_text = _catalog_query(db.bind.dialect.name, difficulty, domain, search, tag, hours)
         
-        # Order by creation date for consistency
-        query = query.order_by(desc(Project.created_at))
+        # Order by creation date for consistency (ties in relevance when searching);
+        # id makes the order total so offset pages never skip or repeat rows
+        query = query.order_by(desc(Project.created_at), desc(Project.id))
         
         # Apply pagination
         if limit:
@@ -91,35 +126,102 @@ async def get_projects(
             query = query.offset(offset)
         
         # Execute query
-        projects = query.all()
-        logger.info(f"Query returned {len(projects)} projects")
-        logger.info(f"First few project titles: {[p.title for p in projects[:5]]}")
+        rows = (await db.execute(query)).all()
+        logger.info(f"Query returned {len(rows)} projects")
+        logger.info(f"First few project titles: {[row.title for row in rows[:5]]}")
         
         # Transform results efficiently
         result = []
-        for project in projects:
-            tech_stack = ", ".join(project.tags) if project.tags else ""
-            
-            result.append({
-                "id": project.id,
-                "title": project.title,
-                "brief": project.brief,
-                "description": project.description,
-                "difficulty": project.difficulty.value,
-                "tags": project.tags,
-                "required_skills": project.required_skills,
-                "tech_stack": tech_stack,
-                "estimated_hours": project.estimated_hours,
-                "max_team_size": project.max_team_size,
-                "is_community": project.is_community,
-                "created_at": project.created_at.isoformat() if project.created_at else None
-            })
-        
-        # Cache the result for 5 minutes
-        cache.set(cache_key, result, ttl=300)
-        logger.info(f"Cached {len(result)} projects")
+        for row in rows:
+            item = project_summary(row)
+            if full_text:
+                item["highlight"] = render_highlight(row.highlight)
+            result.append(item)
         
         return result
+
+async def _count_projects(
+    difficulty: Optional[str],
+    domain: Optional[str],
+    search: Optional[str],
+    tag: Optional[str] = None,
+    hours: Optional[str] = None
+) -> int:
+    """How many projects the catalog query matches, ignoring pagination"""
+    async with AsyncSessionLocal() as db:
+        route_session(db, read_only=True)
+        query, _ = _catalog_query(db.bind.dialect.name, difficulty, domain, search, tag, hours)
+        return await db.scalar(select(func.count()).select_from(query.subquery()))
+
+async def _load_search_page(
+    limit: int,
+    difficulty: Optional[str],
+    domain: Optional[str],
+    search: str,
+    tag: Optional[str],
+    hours: Optional[str]
+) -> Dict[str, Any]:
+    """First page of search results and the number of matches, cached together"""
+    return {
+        "items": await _load_projects(limit, 0, difficulty, domain, search, tag, hours),
+        "total": await _count_projects(difficulty, domain, search, tag, hours),
+    }
+
+@router.get("/", response_model=List[Dict[str, Any]])
+async def get_projects(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    offset: Optional[int] = Query(0, ge=0),
+    difficulty: Optional[str] = Query(None),
+    domain: Optional[str] = Query(None),
+    search: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page")
+):
+    """Get all projects with optional filtering and pagination.
+
+    Pages of ``limit`` rows carry an X-Next-Cursor header; pass it back as
+    ``cursor`` for the next page; it stays stable while projects are added.
+    ``offset`` is kept for older clients.
+    """
+    after = None
+    if cursor:
+        if offset or search:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="cursor cannot be combined with offset or search"
+            )
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    try:
+        if search:
+            # Relevance search runs on the full-text index. Concurrent misses share one
+            # query; expired entries are served for another minute while a single
+            # background refresh runs. Project writes invalidate the "projects" tag on
+            # commit, so the TTL only bounds out-of-band changes.
+            cache_key = await async_cache.make_key(
+                "projects",
+                limit=limit, offset=offset, difficulty=difficulty, domain=domain, search=search, cursor=cursor
+            )
+            projects = await async_cache.get_or_load(
+                cache_key,
+                lambda: _load_projects(limit, offset, difficulty, domain, search),
+                ttl=3600,
+                tags=["projects"],
+                stale_ttl=60
+            )
+        else:
+            # Browsing is answered from the in-memory catalog snapshot
+            snapshot = await catalog.get(AsyncSessionLocal)
+            projects = snapshot.select(difficulty, domain, after=after, limit=limit, offset=offset)
+        
+        # Relevance order has no keyset, so search results page by offset only
+        following = None if search else next_cursor(projects, limit)
+        if following:
+            response.headers[NEXT_CURSOR_HEADER] = following
+        return projects
         
     except Exception as e:
         logger.error(f"Error in get_projects: {e}")
@@ -128,31 +230,104 @@ async def get_projects(
             detail=f"Error fetching projects: {str(e)}"
         )
 
+async def _load_facet_counts() -> Dict[str, Dict[str, int]]:
+    """Maintained facet counts (no GROUP BY); own session for the same reason as _load_projects"""
+    async with AsyncSessionLocal() as db:
+        route_session(db, read_only=True)
+        rows = (await db.execute(
+            select(ProjectFacetCount.facet, ProjectFacetCount.value, ProjectFacetCount.count)
+        )).all()
+        return read_facet_counts(rows)
+
+@router.get("/facets", response_model=Dict[str, Any])
+async def get_project_facets(
+    difficulty: Optional[str] = Query(None),
+    domain: Optional[str] = Query(None),
+    tag: Optional[str] = Query(None),
+    hours: Optional[str] = Query(None, description="Estimated-hours bucket, e.g. 10-20"),
+    search: Optional[str] = Query(None),
+    limit: int = Query(24, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+):
+    """One catalog page plus facet counts for the catalog sidebar.
+
+    Counts cover the whole published catalog and come from the maintained
+    aggregate; filters and pagination apply to the items, and ``total`` is how
+    many projects match the filters.
+    """
+    try:
+        if difficulty and difficulty != 'all':
+            ProjectDifficulty(difficulty)
+        if hours:
+            hours_range(hours)
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if after is not None and search:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="cursor cannot be combined with search"
+        )
+    
+    try:
+        if search:
+            page_key = await async_cache.make_key(
+                "projects", view="facets", limit=limit, difficulty=difficulty, domain=domain,
+                tag=tag, hours=hours, search=search
+            )
+            page = await async_cache.get_or_load(
+                page_key,
+                lambda: _load_search_page(limit, difficulty, domain, search, tag, hours),
+                ttl=3600,
+                tags=["projects"],
+                stale_ttl=60
+            )
+            items, total = page["items"], page["total"]
+        else:
+            snapshot = await catalog.get(AsyncSessionLocal)
+            items = snapshot.select(difficulty, domain, tag, hours, after=after, limit=limit)
+            total = snapshot.total(difficulty, domain, tag, hours)
+        facets = await async_cache.get_or_load(
+            await async_cache.make_key("projects", view="facet_counts"),
+            _load_facet_counts,
+            ttl=3600,
+            tags=["projects"],
+            stale_ttl=60
+        )
+        
+        return {
+            "items": items,
+            "next_cursor": None if search else next_cursor(items, limit),
+            "facets": facets,
+            "total": total
+        }
+        
+    except Exception as e:
+        logger.error(f"Error in get_project_facets: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching project facets: {str(e)}"
+        )
+
 @router.get("/stats")
-async def get_project_stats(db: Session = Depends(get_db)):
-    """Get project statistics and performance metrics"""
+async def get_project_stats(db: AsyncSession = Depends(get_async_db)):
+    """Get project statistics and performance metrics (cache metrics live under /monitoring/cache)"""
     try:
         # Get basic stats
-        total_projects = db.query(Project).count()
-        published_projects = db.query(Project).filter(Project.status == ProjectStatus.PUBLISHED).count()
+        total_projects = await db.scalar(select(func.count(Project.id)))
         
-        # Get difficulty distribution
-        difficulty_stats = db.query(
-            Project.difficulty, 
-            func.count(Project.id).label('count')
-        ).filter(Project.status == ProjectStatus.PUBLISHED).group_by(Project.difficulty).all()
-        
-        # Get cache stats
-        cache_stats = cache.get_stats()
+        # Published counts come from the maintained facet aggregate
+        difficulty_stats = (await db.execute(
+            select(ProjectFacetCount.value, ProjectFacetCount.count).where(ProjectFacetCount.facet == "difficulty")
+        )).all()
         
         # Get database connection info
         db_info = get_connection_info()
         
         return {
             "total_projects": total_projects,
-            "published_projects": published_projects,
-            "difficulty_distribution": {d.value: c for d, c in difficulty_stats},
-            "cache_stats": cache_stats,
+            "published_projects": sum(count for _, count in difficulty_stats),
+            "difficulty_distribution": dict(difficulty_stats),
             "database_info": db_info
         }
         
@@ -164,106 +339,52 @@ async def get_project_stats(db: Session = Depends(get_db)):
         )
 
 @router.post("/cache/invalidate")
-async def invalidate_project_cache():
-    """Invalidate project cache"""
+def invalidate_project_cache(
+    pattern: Optional[str] = Query(None),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Invalidate project cache by tag, or by an ad-hoc pattern over project keys when given"""
+    if pattern and not pattern.startswith(PROJECT_KEY_PREFIX):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cache pattern must start with {PROJECT_KEY_PREFIX!r}"
+        )
     try:
-        deleted_count = invalidate_cache("projects:*")
-        return {"message": f"Invalidated {deleted_count} cache entries"}
+        if pattern:
+            report = cache.invalidate_pattern(pattern)
+        else:
+            report = invalidate_tags("projects")
+            report["namespace_version"] = invalidate_namespace("projects")
+        return {
+            "message": f"Invalidated {report['deleted']} cache entries in {report['elapsed_ms']}ms",
+            **report
+        }
     except Exception as e:
         logger.error(f"Error invalidating cache: {e}")
-        return {"message": f"Cache invalidation failed: {str(e)}"}
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Cache invalidation failed: {str(e)}"
+        )
 
 @router.get("/beginner", response_model=List[Dict[str, Any]])
-async def get_beginner_projects(db: Session = Depends(get_db)):
+async def get_beginner_projects():
     """Get all beginner-level projects"""
-    projects = db.query(Project).filter(
-        Project.status == ProjectStatus.PUBLISHED,
-        Project.difficulty == ProjectDifficulty.BEGINNER
-    ).all()
-    
-    result = []
-    for project in projects:
-        tech_stack = ", ".join(project.tags) if project.tags else ""
-        
-        result.append({
-            "id": project.id,
-            "title": project.title,
-            "brief": project.brief,
-            "description": project.description,
-            "difficulty": project.difficulty.value,
-            "tags": project.tags,
-            "required_skills": project.required_skills,
-            "tech_stack": tech_stack,
-            "estimated_hours": project.estimated_hours,
-            "max_team_size": project.max_team_size,
-            "is_community": project.is_community,
-            "created_at": project.created_at.isoformat() if project.created_at else None
-        })
-    
-    return result
+    return (await catalog.get(AsyncSessionLocal)).select(difficulty=ProjectDifficulty.BEGINNER.value)
 
 @router.get("/intermediate", response_model=List[Dict[str, Any]])
-async def get_intermediate_projects(db: Session = Depends(get_db)):
+async def get_intermediate_projects():
     """Get all intermediate-level projects"""
-    projects = db.query(Project).filter(
-        Project.status == ProjectStatus.PUBLISHED,
-        Project.difficulty == ProjectDifficulty.INTERMEDIATE
-    ).all()
-    
-    result = []
-    for project in projects:
-        tech_stack = ", ".join(project.tags) if project.tags else ""
-        
-        result.append({
-            "id": project.id,
-            "title": project.title,
-            "brief": project.brief,
-            "description": project.description,
-            "difficulty": project.difficulty.value,
-            "tags": project.tags,
-            "required_skills": project.required_skills,
-            "tech_stack": tech_stack,
-            "estimated_hours": project.estimated_hours,
-            "max_team_size": project.max_team_size,
-            "is_community": project.is_community,
-            "created_at": project.created_at.isoformat() if project.created_at else None
-        })
-    
-    return result
+    return (await catalog.get(AsyncSessionLocal)).select(difficulty=ProjectDifficulty.INTERMEDIATE.value)
 
 @router.get("/advanced", response_model=List[Dict[str, Any]])
-async def get_advanced_projects(db: Session = Depends(get_db)):
+async def get_advanced_projects():
     """Get all advanced-level projects"""
-    projects = db.query(Project).filter(
-        Project.status == ProjectStatus.PUBLISHED,
-        Project.difficulty == ProjectDifficulty.ADVANCED
-    ).all()
-    
-    result = []
-    for project in projects:
-        tech_stack = ", ".join(project.tags) if project.tags else ""
-        
-        result.append({
-            "id": project.id,
-            "title": project.title,
-            "brief": project.brief,
-            "description": project.description,
-            "difficulty": project.difficulty.value,
-            "tags": project.tags,
-            "required_skills": project.required_skills,
-            "tech_stack": tech_stack,
-            "estimated_hours": project.estimated_hours,
-            "max_team_size": project.max_team_size,
-            "is_community": project.is_community,
-            "created_at": project.created_at.isoformat() if project.created_at else None
-        })
-    
-    return result
+    return (await catalog.get(AsyncSessionLocal)).select(difficulty=ProjectDifficulty.ADVANCED.value)
 
 @router.get("/tracks", response_model=List[Dict[str, Any]])
-async def get_tracks(db: Session = Depends(get_db)):
+async def get_tracks(db: AsyncSession = Depends(get_async_db)):
     """Get all learning tracks"""
-    tracks = db.query(Track).filter(Track.is_active == True).all()
+    tracks = (await db.execute(select(Track).where(Track.is_active == True))).scalars().all()
     
     result = []
     for track in tracks:
@@ -281,9 +402,11 @@ async def get_tracks(db: Session = Depends(get_db)):
     return result
 
 @router.get("/{project_id}", response_model=Dict[str, Any])
-async def get_project(project_id: int, db: Session = Depends(get_db)):
+async def get_project(project_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific project by ID"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.scalar(
+        select(Project).options(undefer_group("detail")).where(Project.id == project_id)
+    )
     
     if not project:
         raise HTTPException(
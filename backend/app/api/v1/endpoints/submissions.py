@@ -8,7 +8,7 @@ from app.models.user import User
 router = APIRouter()
 
 @router.get("/", response_model=list[dict])
-async def get_submissions(db: Session = Depends(get_db)):
+def get_submissions(db: Session = Depends(get_db)):
     """Get all submissions"""
     submissions = db.query(Submission).all()
     return [
@@ -23,7 +23,7 @@ async def get_submissions(db: Session = Depends(get_db)):
     ]
 
 @router.get("/{submission_id}", response_model=dict)
-async def get_submission(submission_id: int, db: Session = Depends(get_db)):
+def get_submission(submission_id: int, db: Session = Depends(get_db)):
     """Get submission by ID"""
     submission = db.query(Submission).filter(Submission.id == submission_id).first()
     if not submission:
@@ -41,7 +41,7 @@ async def get_submission(submission_id: int, db: Session = Depends(get_db)):
     }
 
 @router.post("/", response_model=dict)
-async def create_submission(submission_data: dict, db: Session = Depends(get_db)):
+def create_submission(submission_data: dict, db: Session = Depends(get_db)):
     """Create new submission"""
     submission = Submission(
         user_id=submission_data.get("user_id"),
@@ -56,7 +56,7 @@ async def create_submission(submission_data: dict, db: Session = Depends(get_db)
     return {"message": "Submission created successfully", "submission_id": submission.id}
 
 @router.put("/{submission_id}", response_model=dict)
-async def update_submission(submission_id: int, submission_data: dict, db: Session = Depends(get_db)):
+def update_submission(submission_id: int, submission_data: dict, db: Session = Depends(get_db)):
     """Update submission"""
     submission = db.query(Submission).filter(Submission.id == submission_id).first()
     if not submission:
@@ -74,7 +74,7 @@ async def update_submission(submission_id: int, submission_data: dict, db: Sessi
     return {"message": "Submission updated successfully"}
 
 @router.delete("/{submission_id}", response_model=dict)
-async def delete_submission(submission_id: int, db: Session = Depends(get_db)):
+def delete_submission(submission_id: int, db: Session = Depends(get_db)):
     """Delete submission"""
     submission = db.query(Submission).filter(Submission.id == submission_id).first()
     if not submission:
@@ -7,7 +7,7 @@ from app.models.entities import Field
 router = APIRouter()
 
 @router.get("/", response_model=list[dict])
-async def get_tracks(db: Session = Depends(get_db)):
+def get_tracks(db: Session = Depends(get_db)):
     """Get all tracks/fields"""
     # Return fields data since that's what we have populated
     fields = db.query(Field).filter(Field.is_active == True).all()
@@ -26,7 +26,7 @@ async def get_tracks(db: Session = Depends(get_db)):
     ]
 
 @router.get("/{track_id}", response_model=dict)
-async def get_track(track_id: int, db: Session = Depends(get_db)):
+def get_track(track_id: int, db: Session = Depends(get_db)):
     """Get track by ID"""
     # Use Field table to match the list endpoint behavior
     field = db.query(Field).filter(Field.id == track_id, Field.is_active == True).first()
@@ -48,7 +48,7 @@ async def get_track(track_id: int, db: Session = Depends(get_db)):
     }
 
 @router.post("/", response_model=dict)
-async def create_track(track_data: dict, db: Session = Depends(get_db)):
+def create_track(track_data: dict, db: Session = Depends(get_db)):
     """Create new track"""
     track = Track(
         name=track_data.get("name", "Sample Track"),
@@ -66,7 +66,7 @@ async def create_track(track_data: dict, db: Session = Depends(get_db)):
     return {"message": "Track created successfully", "track_id": track.id}
 
 @router.put("/{track_id}", response_model=dict)
-async def update_track(track_id: int, track_data: dict, db: Session = Depends(get_db)):
+def update_track(track_id: int, track_data: dict, db: Session = Depends(get_db)):
     """Update track"""
     track = db.query(Track).filter(Track.id == track_id).first()
     if not track:
@@ -93,7 +93,7 @@ async def update_track(track_id: int, track_data: dict, db: Session = Depends(ge
     return {"message": "Track updated successfully"}
 
 @router.delete("/{track_id}", response_model=dict)
-async def delete_track(track_id: int, db: Session = Depends(get_db)):
+def delete_track(track_id: int, db: Session = Depends(get_db)):
     """Delete track"""
     track = db.query(Track).filter(Track.id == track_id).first()
     if not track:
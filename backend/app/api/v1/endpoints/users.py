@@ -15,7 +15,7 @@ async def get_user_profile(current_user: User = Depends(get_current_user)):
     return current_user
 
 @router.put("/profile", response_model=UserProfile)
-async def update_user_profile(
+def update_user_profile(
     profile_update: dict,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -40,7 +40,7 @@ async def update_user_profile(
     return current_user
 
 @router.get("/", response_model=list[dict])
-async def get_users(db: Session = Depends(get_db)):
+def get_users(db: Session = Depends(get_db)):
     """Get all users"""
     users = db.query(User).all()
     return [
@@ -57,7 +57,7 @@ async def get_users(db: Session = Depends(get_db)):
     ]
 
 @router.get("/{user_id}", response_model=dict)
-async def get_user(user_id: int, db: Session = Depends(get_db)):
+def get_user(user_id: int, db: Session = Depends(get_db)):
     """Get user by ID"""
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
@@ -79,7 +79,7 @@ async def get_user(user_id: int, db: Session = Depends(get_db)):
     }
 
 @router.put("/{user_id}", response_model=dict)
-async def update_user(
+def update_user(
     user_id: int, 
     user_data: UserCreate, 
     db: Session = Depends(get_db)
@@ -103,7 +103,7 @@ async def update_user(
     return {"message": "User updated successfully", "user_id": user.id}
 
 @router.delete("/{user_id}", response_model=dict)
-async def delete_user(user_id: int, db: Session = Depends(get_db)):
+def delete_user(user_id: int, db: Session = Depends(get_db)):
     """Delete user"""
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
@@ -140,13 +140,13 @@ async def get_onboarding_status(current_user: User = Depends(get_current_user)):
     )
 
 @router.get("/onboarding/fields", response_model=List[OnboardingField])
-async def get_available_fields(db: Session = Depends(get_db)):
+def get_available_fields(db: Session = Depends(get_db)):
     """Get all available fields for onboarding"""
     fields = db.query(Field).filter(Field.is_active == True).all()
     return fields
 
 @router.get("/onboarding/fields/{field_id}/proficiency-levels", response_model=List[OnboardingProficiencyLevel])
-async def get_proficiency_levels_for_field(field_id: int, db: Session = Depends(get_db)):
+def get_proficiency_levels_for_field(field_id: int, db: Session = Depends(get_db)):
     """Get proficiency levels for a specific field"""
     levels = db.query(ProficiencyLevel).filter(ProficiencyLevel.field_id == field_id).all()
     if not levels:
@@ -154,7 +154,7 @@ async def get_proficiency_levels_for_field(field_id: int, db: Session = Depends(
     return levels
 
 @router.post("/onboarding/select-field")
-async def select_field(
+def select_field(
     request: FieldSelectionRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -172,7 +172,7 @@ async def select_field(
     return {"message": f"Field '{field.display_name}' selected successfully"}
 
 @router.post("/onboarding/select-proficiency")
-async def select_proficiency_level(
+def select_proficiency_level(
     request: ProficiencySelectionRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -198,7 +198,7 @@ async def select_proficiency_level(
     return {"message": f"Proficiency level '{level.display_name}' selected successfully. Onboarding completed!"}
 
 @router.get("/projects/recommended")
-async def get_recommended_projects(
+def get_recommended_projects(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -1,18 +1,315 @@
 import redis
+import redis.asyncio as aioredis
+import dataclasses
+import enum
+import hashlib
 import json
-import pickle
-from typing import Any, Optional, Union
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import date, datetime
+from fnmatch import fnmatchcase
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 from functools import wraps
 import logging
+from .cache_codec import CacheCodec
+from .cache_metrics import CacheMetrics
 from .config import settings
 
 logger = logging.getLogger(__name__)
 
+NAMESPACE_VERSION_PREFIX = "cache:ns-version:"
+TAG_PREFIX = "cache:tag:"
+INVALIDATION_BATCH_SIZE = 500
+LOCK_PREFIX = "cache:lock:"
+INVALIDATION_CHANNEL = "cache:invalidations"
+# Above this many keys a tag broadcast asks peers to drop their whole local tier
+INVALIDATION_BROADCAST_MAX_KEYS = 1000
+STALE_ENVELOPE_KEY = "__cache_envelope__"
+
+# Compare-and-delete so a loader never releases a lock another worker re-acquired
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+class LoaderAbandoned(Exception):
+    """Raised to single-flight followers when the leading loader was cancelled"""
+
+def _canonical(obj: Any) -> Any:
+    """JSON-ready form that encodes a value the same way in every process.
+
+    Containers carry a type tag so a tuple and a list (or a set) with the same
+    items produce different keys. Values with no stable identity (sessions,
+    requests, ORM instances, users) raise TypeError instead of collapsing onto
+    one key: the caller has to say what identifies them, e.g. via ``key=``.
+    """
+    if isinstance(obj, enum.Enum):
+        return _canonical(obj.value)
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    if isinstance(obj, list):
+        return [_canonical(item) for item in obj]
+    if isinstance(obj, tuple):
+        return {"__tuple__": [_canonical(item) for item in obj]}
+    if isinstance(obj, (set, frozenset)):
+        return {"__set__": sorted((_canonical(item) for item in obj), key=_dump)}
+    if isinstance(obj, dict):
+        if all(isinstance(name, str) for name in obj):
+            return {name: _canonical(value) for name, value in obj.items()}
+        return {"__dict__": sorted(([_canonical(name), _canonical(value)] for name, value in obj.items()), key=_dump)}
+    if isinstance(obj, datetime):
+        return {"__datetime__": obj.isoformat()}
+    if isinstance(obj, date):
+        return {"__date__": obj.isoformat()}
+    if isinstance(obj, bytes):
+        return {"__bytes__": obj.hex()}
+    if hasattr(obj, 'model_dump'):
+        return {"__model__": f"{type(obj).__module__}.{type(obj).__qualname__}", "fields": _canonical(obj.model_dump())}
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {"__model__": f"{type(obj).__module__}.{type(obj).__qualname__}", "fields": _canonical(dataclasses.asdict(obj))}
+    raise TypeError(
+        f"Cannot build a cache key from {type(obj).__module__}.{type(obj).__qualname__}; "
+        f"pass key= to choose the values that identify the call"
+    )
+
+def _dump(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(',', ':'))
+
+def build_cache_key(namespace: str, version: int, *parts: Any, **named: Any) -> str:
+    """Build a process-independent cache key: namespace, version and a digest of the arguments"""
+    payload = _dump([_canonical(list(parts)), _canonical(named)])
+    digest = hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+    return f"{namespace}:v{version}:{digest}"
+
+def _wrap_fresh(value: Any, ttl: int, stale_ttl: int) -> Any:
+    """Record when a value stops being fresh so it can be served stale afterwards"""
+    if not stale_ttl:
+        return value
+    return {STALE_ENVELOPE_KEY: 1, 'value': value, 'fresh_until': time.time() + ttl}
+
+def _unwrap_fresh(entry: Any) -> Tuple[Any, bool]:
+    """Return (value, is_stale) for an entry written by get_or_load"""
+    if isinstance(entry, dict) and entry.get(STALE_ENVELOPE_KEY) == 1:
+        return entry['value'], entry['fresh_until'] <= time.time()
+    return entry, False
+
+class LRUCache:
+    """Thread-safe in-process LRU cache bounded by entry count and payload bytes"""
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        default_ttl: int,
+        on_evict: Optional[Callable[[str], None]] = None
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.on_evict = on_evict
+        # key -> (value, expires_at, size in bytes, tags)
+        self._data: "OrderedDict[str, Tuple[Any, float, int, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[1] > time.monotonic()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a live entry and mark it most recently used"""
+        with self._lock:
+            return self._get(key, time.monotonic())
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Return the live entries among keys under a single lock acquisition"""
+        found = {}
+        with self._lock:
+            now = time.monotonic()
+            for key in keys:
+                value = self._get(key, now)
+                if value is not None:
+                    found[key] = value
+        return found
+
+    def _get(self, key: str, now: float) -> Optional[Any]:
+        # Caller must hold the lock
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at, _, _ = entry
+        if expires_at <= now:
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        size: int = 0,
+        tags: Iterable[str] = ()
+    ) -> bool:
+        """Store a value, evicting least recently used entries to stay within bounds"""
+        return self.set_many({key: (value, size)}, ttl=ttl, tags=tags) == 1
+
+    def set_many(
+        self,
+        items: Dict[str, Tuple[Any, int]],
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = ()
+    ) -> int:
+        """Store several (value, size) pairs under one lock; returns how many were kept"""
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.default_ttl)
+        tags = tuple(tags)
+        stored = 0
+        with self._lock:
+            for key, (value, size) in items.items():
+                if key in self._data:
+                    self._remove(key)
+                if size > self.max_bytes:
+                    # Never let one oversized value flush the whole tier
+                    continue
+
+                self._data[key] = (value, expires_at, size, tags)
+                self.current_bytes += size
+                for tag in tags:
+                    self._tags.setdefault(tag, set()).add(key)
+                stored += 1
+
+            while self._data and (
+                len(self._data) > self.max_entries or self.current_bytes > self.max_bytes
+            ):
+                oldest_key = next(iter(self._data))
+                self._remove(oldest_key)
+                self.evictions += 1
+                if self.on_evict is not None:
+                    self.on_evict(oldest_key)
+        return stored
+
+    def delete(self, key: str) -> bool:
+        return self.delete_many([key]) == 1
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        with self._lock:
+            deleted_count = 0
+            for key in keys:
+                if key in self._data:
+                    self._remove(key)
+                    deleted_count += 1
+            return deleted_count
+
+    def delete_matching(self, pattern: str) -> int:
+        """Delete every key matching a glob-style pattern"""
+        with self._lock:
+            matched = [k for k in self._data if fnmatchcase(k, pattern)]
+            for key in matched:
+                self._remove(key)
+            return len(matched)
+
+    def delete_tag(self, tag: str) -> int:
+        """Delete every entry registered under a tag"""
+        with self._lock:
+            keys = list(self._tags.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            self._tags.pop(tag, None)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._tags.clear()
+            self.current_bytes = 0
+
+    def _remove(self, key: str) -> None:
+        # Caller must hold the lock
+        _, _, size, tags = self._data.pop(key)
+        self.current_bytes -= size
+        for tag in tags:
+            tagged_keys = self._tags.get(tag)
+            if tagged_keys is not None:
+                tagged_keys.discard(key)
+                if not tagged_keys:
+                    del self._tags[tag]
+
+    def entry_sizes(self) -> List[Tuple[str, int]]:
+        """Snapshot of (key, size) for every entry, for per-namespace accounting"""
+        with self._lock:
+            return [(key, entry[2]) for key, entry in self._data.items()]
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._data),
+            'bytes': self.current_bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'tags': len(self._tags)
+        }
+
 class CacheService:
     def __init__(self):
         self.redis_client = None
-        self.memory_cache = {}
+        self.metrics = CacheMetrics(hot_key_sample_rate=settings.cache_hot_key_sample_rate)
+        self.memory_cache = LRUCache(
+            max_entries=settings.cache_memory_max_entries,
+            max_bytes=settings.cache_memory_max_bytes,
+            default_ttl=settings.cache_memory_ttl,
+            on_evict=self.metrics.record_eviction
+        )
         self.cache_enabled = True
+        self.codec = CacheCodec(
+            encoder=settings.cache_codec,
+            compression=settings.cache_compression,
+            compression_threshold=settings.cache_compression_threshold,
+            allow_pickle=settings.cache_allow_pickle,
+            pickle_read_until=(
+                settings.cache_pickle_read_until.timestamp() if settings.cache_pickle_read_until else None
+            )
+        )
+        # namespace -> (version, fetched_at); refreshed from Redis periodically
+        self._namespace_versions: dict = {}
+        self._namespace_lock = threading.Lock()
+        # Single-flight bookkeeping: key -> future of the in-progress load
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._refreshing: Set[str] = set()
+        self._refresh_executor = ThreadPoolExecutor(
+            max_workers=settings.cache_refresh_workers, thread_name_prefix="cache-refresh"
+        )
+        # Identifies this worker's own invalidation broadcasts
+        self.instance_id = uuid.uuid4().hex
+        # tag -> callbacks run whenever the tag is invalidated here or by another worker
+        self._tag_listeners: Dict[str, List[Callable[[], None]]] = {}
+        self._pubsub_thread = None
         
         try:
             if settings.redis_url:
@@ -35,98 +332,518 @@ class CacheService:
 
     def _serialize(self, data: Any) -> bytes:
         """Serialize data for storage"""
-        try:
-            return pickle.dumps(data)
-        except Exception as e:
-            logger.error(f"Serialization error: {e}")
-            return json.dumps(data).encode('utf-8')
+        return self.codec.dumps(data)
 
     def _deserialize(self, data: bytes) -> Any:
         """Deserialize data from storage"""
-        try:
-            return pickle.loads(data)
-        except Exception as e:
-            logger.error(f"Deserialization error: {e}")
-            return json.loads(data.decode('utf-8'))
+        return self.codec.loads(data)
+
+    def _memory_ttl(self, ttl: int) -> int:
+        """TTL for the in-process tier; capped while Redis is the shared source of truth"""
+        if self.redis_client:
+            return min(ttl, settings.cache_memory_ttl)
+        return ttl
 
     def get(self, key: str) -> Optional[Any]:
-        """Get value from cache"""
+        """Get value from cache (in-process tier first, then Redis)"""
         if not self.cache_enabled:
             return None
             
         try:
-            # Try Redis first
+            data = self.memory_cache.get(key)
+            if data is not None:
+                self.metrics.record_hit(key, 'memory')
+                return self._deserialize(data)
+            
             if self.redis_client:
                 data = self.redis_client.get(key)
                 if data:
-                    return self._deserialize(data)
+                    value = self._deserialize(data)
+                    # Promote into the local tier so the next hit skips the round trip
+                    self.memory_cache.set(
+                        key, data, ttl=settings.cache_memory_ttl, size=len(data)
+                    )
+                    self.metrics.record_hit(key, 'redis')
+                    return value
             
-            # Fallback to memory cache
-            return self.memory_cache.get(key)
+            self.metrics.record_miss(key)
+            return None
         except Exception as e:
             logger.error(f"Cache get error for key {key}: {e}")
             return None
 
-    def set(self, key: str, value: Any, ttl: int = 3600) -> bool:
-        """Set value in cache with TTL"""
-        if not self.cache_enabled:
+    def _promote(self, keys: List[str], payloads: List[Optional[bytes]]) -> Dict[str, Any]:
+        """Decode MGET results and copy the hits into the in-process tier"""
+        found = {}
+        promoted = {}
+        for key, data in zip(keys, payloads):
+            if data:
+                value = self._deserialize(data)
+                found[key] = value
+                promoted[key] = (data, len(data))
+                self.metrics.record_hit(key, 'redis')
+        if promoted:
+            self.memory_cache.set_many(promoted, ttl=settings.cache_memory_ttl)
+        return found
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Fetch several keys; local misses are resolved with a single MGET"""
+        if not self.cache_enabled or not keys:
+            return {}
+        
+        found: Dict[str, Any] = {}
+        try:
+            found = self._decode_many(self.memory_cache.get_many(keys))
+            missing = [key for key in keys if key not in found]
+            
+            if missing and self.redis_client:
+                found.update(self._promote(missing, self.redis_client.mget(missing)))
+            self._record_bulk_lookup(keys, found, missing)
+        except Exception as e:
+            logger.error(f"Cache get_many error: {e}")
+        return found
+
+    def _record_bulk_lookup(self, keys: List[str], found: Dict[str, Any], missing: List[str]) -> None:
+        """Count local hits and overall misses of a bulk lookup (Redis hits are counted in _promote)"""
+        missing_keys = set(missing)
+        for key in keys:
+            if key not in missing_keys:
+                self.metrics.record_hit(key, 'memory')
+            elif key not in found:
+                self.metrics.record_miss(key)
+
+    def set(self, key: str, value: Any, ttl: int = 3600, tags: Optional[List[str]] = None) -> bool:
+        """Set value in cache with TTL, registering the key under any invalidation tags"""
+        return self.set_many({key: value}, ttl=ttl, tags=tags)
+
+    def _decode_many(self, payloads: Dict[str, bytes]) -> Dict[str, Any]:
+        return {key: self._deserialize(data) for key, data in payloads.items()}
+
+    def _encode_many(self, mapping: Dict[str, Any], ttl: int, tags: List[str]) -> Dict[str, bytes]:
+        """Serialize values and store them in the in-process tier.
+
+        The local tier keeps the encoded bytes, not the caller's object: a hit
+        decodes a fresh copy, so callers cannot mutate cached values and both
+        tiers return the same types (a tuple comes back as a list from either).
+        """
+        encoded = {key: self._serialize(value) for key, value in mapping.items()}
+        for key, data in encoded.items():
+            self.metrics.record_write(key, len(data))
+        self.memory_cache.set_many(
+            {key: (data, len(data)) for key, data in encoded.items()},
+            ttl=self._memory_ttl(ttl),
+            tags=tags
+        )
+        return encoded
+
+    def _pipeline_set(self, pipe, encoded: Dict[str, bytes], ttl: int, tags: List[str]) -> None:
+        """Queue SETEX for every key plus tag registration on a Redis pipeline"""
+        for key, data in encoded.items():
+            pipe.setex(key, ttl, data)
+        for tag in tags:
+            tag_key = f"{TAG_PREFIX}{tag}"
+            pipe.sadd(tag_key, *encoded.keys())
+            # Tag sets must outlive their longest-lived member
+            pipe.expire(tag_key, ttl, nx=True)
+            pipe.expire(tag_key, ttl, gt=True)
+
+    def set_many(
+        self,
+        mapping: Dict[str, Any],
+        ttl: int = 3600,
+        tags: Optional[List[str]] = None
+    ) -> bool:
+        """Store several values in one pipelined round trip"""
+        if not self.cache_enabled or not mapping:
             return False
             
         try:
-            serialized_data = self._serialize(value)
+            tags = tags or []
+            encoded = self._encode_many(mapping, ttl, tags)
             
-            # Try Redis first
             if self.redis_client:
-                self.redis_client.setex(key, ttl, serialized_data)
-                return True
+                pipe = self.redis_client.pipeline(transaction=False)
+                self._pipeline_set(pipe, encoded, ttl, tags)
+                pipe.execute()
             
-            # Fallback to memory cache
-            self.memory_cache[key] = value
             return True
         except Exception as e:
-            logger.error(f"Cache set error for key {key}: {e}")
+            logger.error(f"Cache set error for keys {list(mapping)[:5]}: {e}")
             return False
 
     def delete(self, key: str) -> bool:
         """Delete key from cache"""
+        return self.delete_many([key]) >= 0
+
+    def delete_many(self, keys: List[str]) -> int:
+        """Delete several keys from both tiers; returns how many were removed"""
         try:
-            if self.redis_client:
-                self.redis_client.delete(key)
+            deleted_count = self.memory_cache.delete_many(keys)
             
-            if key in self.memory_cache:
-                del self.memory_cache[key]
+            if self.redis_client and keys:
+                deleted_count = self._unlink_batched(keys)
+                self._publish_invalidation({'kind': 'keys', 'keys': list(keys)})
             
-            return True
+            return deleted_count
         except Exception as e:
-            logger.error(f"Cache delete error for key {key}: {e}")
-            return False
+            logger.error(f"Cache delete error for keys {keys[:5]}: {e}")
+            return -1
 
-    def clear_pattern(self, pattern: str) -> int:
-        """Clear all keys matching pattern"""
+    def _unlink_batched(self, keys: Iterable[Union[str, bytes]]) -> int:
+        """UNLINK keys in fixed-size batches so no single command blocks Redis for long"""
+        deleted_count = 0
+        batch = []
+        for key in keys:
+            batch.append(key)
+            if len(batch) >= INVALIDATION_BATCH_SIZE:
+                deleted_count += self.redis_client.unlink(*batch)
+                batch = []
+        if batch:
+            deleted_count += self.redis_client.unlink(*batch)
+        return deleted_count
+
+    def invalidate_tags(self, *tags: str) -> dict:
+        """Delete exactly the keys registered under the given tags"""
+        started = time.perf_counter()
+        deleted_count = 0
         try:
-            deleted_count = 0
+            invalidated_keys: List[str] = []
+            for tag in tags:
+                local_count = self.memory_cache.delete_tag(tag)
+                
+                if self.redis_client:
+                    tag_key = f"{TAG_PREFIX}{tag}"
+                    keys = [
+                        key.decode('utf-8') if isinstance(key, bytes) else key
+                        for key in self.redis_client.sscan_iter(tag_key, count=INVALIDATION_BATCH_SIZE)
+                    ]
+                    # Entries promoted from Redis were stored locally without their tags
+                    self.memory_cache.delete_many(keys)
+                    deleted_count += self._unlink_batched(keys)
+                    self.redis_client.unlink(tag_key)
+                    invalidated_keys.extend(keys)
+                else:
+                    deleted_count += local_count
             
             if self.redis_client:
-                keys = self.redis_client.keys(pattern)
-                if keys:
-                    deleted_count = self.redis_client.delete(*keys)
-            
-            # Clear memory cache
-            memory_keys = [k for k in self.memory_cache.keys() if pattern.replace('*', '') in k]
-            for key in memory_keys:
-                del self.memory_cache[key]
-                deleted_count += 1
+                self._publish_invalidation({
+                    'kind': 'tags',
+                    'tags': list(tags),
+                    'keys': invalidated_keys if len(invalidated_keys) <= INVALIDATION_BROADCAST_MAX_KEYS else None
+                })
+        except Exception as e:
+            logger.error(f"Cache tag invalidation error for {tags}: {e}")
+        
+        self._notify_tag_listeners(tags)
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+        logger.info(f"Invalidated {deleted_count} cache keys for tags {list(tags)} in {elapsed_ms}ms")
+        return {'deleted': deleted_count, 'elapsed_ms': elapsed_ms, 'tags': list(tags)}
+
+    def invalidate_pattern(self, pattern: str) -> dict:
+        """Delete keys matching an ad-hoc glob pattern using incremental SCAN"""
+        started = time.perf_counter()
+        deleted_count = 0
+        try:
+            local_count = self.memory_cache.delete_matching(pattern)
             
-            return deleted_count
+            if self.redis_client:
+                deleted_count = self._unlink_batched(
+                    self.redis_client.scan_iter(match=pattern, count=INVALIDATION_BATCH_SIZE)
+                )
+                self._publish_invalidation({'kind': 'pattern', 'pattern': pattern})
+            else:
+                deleted_count = local_count
         except Exception as e:
             logger.error(f"Cache clear pattern error for {pattern}: {e}")
-            return 0
+        
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+        logger.info(f"Invalidated {deleted_count} cache keys matching {pattern} in {elapsed_ms}ms")
+        return {'deleted': deleted_count, 'elapsed_ms': elapsed_ms, 'pattern': pattern}
+
+    def clear_pattern(self, pattern: str) -> int:
+        """Clear all keys matching pattern"""
+        return self.invalidate_pattern(pattern)['deleted']
+
+    def add_tag_listener(self, tag: str, callback: Callable[[], None]) -> None:
+        """Call back whenever a tag is invalidated, locally or by another worker's broadcast"""
+        self._tag_listeners.setdefault(tag, []).append(callback)
+
+    def _notify_tag_listeners(self, tags) -> None:
+        for tag in tags:
+            for callback in self._tag_listeners.get(tag, ()):
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"Cache tag listener error for {tag}: {e}")
+
+    def _publish_invalidation(self, message: dict) -> None:
+        """Tell the other workers to evict the same entries from their in-process tier"""
+        try:
+            message['origin'] = self.instance_id
+            self.redis_client.publish(INVALIDATION_CHANNEL, json.dumps(message))
+        except Exception as e:
+            logger.error(f"Cache invalidation broadcast error: {e}")
+
+    def apply_invalidation(self, message: dict) -> None:
+        """Evict local entries named by an invalidation broadcast from another worker"""
+        kind = message.get('kind')
+        if kind == 'tags':
+            for tag in message.get('tags', []):
+                self.memory_cache.delete_tag(tag)
+            if message.get('keys') is None:
+                # Too many keys to list; only a full local flush is safe
+                self.memory_cache.clear()
+            else:
+                self.memory_cache.delete_many(message['keys'])
+            self._notify_tag_listeners(message.get('tags', []))
+        elif kind == 'keys':
+            self.memory_cache.delete_many(message.get('keys', []))
+        elif kind == 'pattern':
+            self.memory_cache.delete_matching(message['pattern'])
+        elif kind == 'namespace':
+            namespace = message['namespace']
+            with self._namespace_lock:
+                current = self._namespace_versions.get(namespace, (0, 0.0))[0]
+                if message['version'] > current:
+                    self._namespace_versions[namespace] = (message['version'], time.monotonic())
+            self.memory_cache.delete_matching(f"{namespace}:*")
+        else:
+            logger.warning(f"Unknown cache invalidation message: {message}")
+
+    def _handle_invalidation_message(self, message: dict) -> None:
+        try:
+            payload = json.loads(message['data'])
+            if payload.get('origin') == self.instance_id:
+                return
+            self.apply_invalidation(payload)
+        except Exception as e:
+            logger.error(f"Cache invalidation message error: {e}")
+
+    def _handle_listener_error(self, error: Exception, pubsub, thread) -> None:
+        # Keep listening through transient Redis errors; redis-py reconnects on the next read
+        logger.error(f"Cache invalidation listener error: {error}")
+        time.sleep(1)
+
+    def start_invalidation_listener(self) -> bool:
+        """Subscribe to invalidation broadcasts from other workers on a background thread"""
+        if not self.redis_client or self._pubsub_thread is not None:
+            return False
+        try:
+            pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{INVALIDATION_CHANNEL: self._handle_invalidation_message})
+            self._pubsub_thread = pubsub.run_in_thread(
+                sleep_time=1.0,
+                daemon=True,
+                exception_handler=self._handle_listener_error
+            )
+            logger.info("Cache invalidation listener started")
+            return True
+        except Exception as e:
+            logger.error(f"Cache invalidation listener failed to start: {e}")
+            return False
+
+    def stop_invalidation_listener(self) -> None:
+        if self._pubsub_thread is not None:
+            self._pubsub_thread.stop()
+            self._pubsub_thread = None
+
+    def _acquire_lock(self, key: str) -> Optional[str]:
+        """Take the cross-worker loader lock for a key; None means another worker holds it"""
+        token = uuid.uuid4().hex
+        if not self.redis_client:
+            return token
+        try:
+            acquired = self.redis_client.set(
+                f"{LOCK_PREFIX}{key}", token, nx=True, px=int(settings.cache_lock_ttl * 1000)
+            )
+            return token if acquired else None
+        except Exception as e:
+            # Fail open: a broken lock must not stop the loader from running
+            logger.error(f"Cache lock error for key {key}: {e}")
+            return token
+
+    def _release_lock(self, key: str, token: str) -> None:
+        if not self.redis_client:
+            return
+        try:
+            self.redis_client.eval(RELEASE_LOCK_SCRIPT, 1, f"{LOCK_PREFIX}{key}", token)
+        except Exception as e:
+            logger.error(f"Cache lock release error for key {key}: {e}")
+
+    def _timed_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Run a loader and record how long it took"""
+        started = time.perf_counter()
+        try:
+            value = loader()
+        except Exception:
+            self.metrics.record_load(key, time.perf_counter() - started, failed=True)
+            raise
+        self.metrics.record_load(key, time.perf_counter() - started)
+        return value
+
+    def _load_with_lock(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: int,
+        tags: Optional[List[str]],
+        stale_ttl: int
+    ) -> Any:
+        """Run the loader while holding the cross-worker lock, or wait for the holder's result"""
+        token = self._acquire_lock(key)
+        deadline = time.monotonic() + settings.cache_lock_ttl
+        while token is None and time.monotonic() < deadline:
+            time.sleep(settings.cache_lock_poll_interval)
+            entry = self.get(key)
+            if entry is not None:
+                return _unwrap_fresh(entry)[0]
+            token = self._acquire_lock(key)
+        
+        try:
+            value = self._timed_load(key, loader)
+            if value is not None:
+                self.set(key, _wrap_fresh(value, ttl, stale_ttl), ttl + stale_ttl, tags=tags)
+            return value
+        finally:
+            if token:
+                self._release_lock(key, token)
+
+    def _refresh(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: int,
+        tags: Optional[List[str]],
+        stale_ttl: int
+    ) -> None:
+        token = self._acquire_lock(key)
+        try:
+            if token is None:
+                return  # Another worker is already refreshing this key
+            value = self._timed_load(key, loader)
+            if value is not None:
+                self.set(key, _wrap_fresh(value, ttl, stale_ttl), ttl + stale_ttl, tags=tags)
+        except Exception as e:
+            logger.error(f"Cache background refresh error for key {key}: {e}")
+        finally:
+            if token:
+                self._release_lock(key, token)
+            with self._inflight_lock:
+                self._refreshing.discard(key)
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: int = 3600,
+        tags: Optional[List[str]] = None,
+        stale_ttl: int = 0
+    ) -> Any:
+        """Return the cached value or load it, coalescing concurrent misses for the same key.
+
+        With stale_ttl > 0 an expired value is served for up to stale_ttl more seconds
+        while a single background refresh runs. The loader then runs on a worker
+        thread, so it must not depend on request-scoped objects such as DB sessions.
+        """
+        entry = self.get(key)
+        if entry is not None:
+            value, is_stale = _unwrap_fresh(entry)
+            if is_stale:
+                self.metrics.record_stale(key)
+                with self._inflight_lock:
+                    start_refresh = key not in self._refreshing
+                    self._refreshing.add(key)
+                if start_refresh:
+                    self._refresh_executor.submit(self._refresh, key, loader, ttl, tags, stale_ttl)
+            return value
+        
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._inflight[key] = future
+        
+        if not is_leader:
+            try:
+                return future.result(timeout=settings.cache_lock_ttl)
+            except (FutureTimeoutError, LoaderAbandoned):
+                return self._timed_load(key, loader)
+        
+        try:
+            value = self._load_with_lock(key, loader, ttl, tags, stale_ttl)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            if not future.done():
+                future.set_exception(LoaderAbandoned())
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def get_namespace_version(self, namespace: str) -> int:
+        """Current version of a key namespace, shared across workers through Redis"""
+        now = time.monotonic()
+        cached_version = self._namespace_versions.get(namespace)
+        if cached_version and now - cached_version[1] < settings.cache_namespace_version_refresh:
+            return cached_version[0]
+        
+        version = cached_version[0] if cached_version else 1
+        if self.redis_client:
+            try:
+                stored = self.redis_client.get(f"{NAMESPACE_VERSION_PREFIX}{namespace}")
+                version = int(stored) if stored else 1
+            except Exception as e:
+                logger.error(f"Cache namespace version error for {namespace}: {e}")
+        
+        with self._namespace_lock:
+            self._namespace_versions[namespace] = (version, now)
+        return version
+
+    def bump_namespace(self, namespace: str) -> int:
+        """Invalidate every key in a namespace in O(1) by moving it to a new version"""
+        with self._namespace_lock:
+            current = self._namespace_versions.get(namespace, (1, 0.0))[0]
+            version = current + 1
+            if self.redis_client:
+                try:
+                    redis_key = f"{NAMESPACE_VERSION_PREFIX}{namespace}"
+                    # Versions start at 1, so the first INCR must land on 2
+                    self.redis_client.setnx(redis_key, 1)
+                    version = int(self.redis_client.incr(redis_key))
+                except Exception as e:
+                    logger.error(f"Cache namespace bump error for {namespace}: {e}")
+            self._namespace_versions[namespace] = (version, time.monotonic())
+        
+        # Entries under the old version are unreachable now; drop the local copies early
+        self.memory_cache.delete_matching(f"{namespace}:*")
+        if self.redis_client:
+            self._publish_invalidation({'kind': 'namespace', 'namespace': namespace, 'version': version})
+        return version
+
+    def make_key(self, namespace: str, *parts: Any, **named: Any) -> str:
+        """Build a deterministic key under the namespace's current version"""
+        return build_cache_key(namespace, self.get_namespace_version(namespace), *parts, **named)
+
+    def inspect(self, hot_key_limit: int = 20) -> dict:
+        """Per-namespace counters and a sample of the hottest keys"""
+        return {
+            'namespaces': self.metrics.snapshot(self.memory_cache.entry_sizes()),
+            'hot_keys': self.metrics.hot_keys(hot_key_limit)
+        }
+
+    def render_metrics(self) -> str:
+        """Cache metrics in the Prometheus text exposition format"""
+        return self.metrics.render_prometheus(self.memory_cache.entry_sizes())
 
     def get_stats(self) -> dict:
         """Get cache statistics"""
         try:
             stats = {
                 'memory_cache_size': len(self.memory_cache),
+                'memory_cache': self.memory_cache.get_stats(),
                 'redis_connected': self.redis_client is not None,
                 'cache_enabled': self.cache_enabled
             }
@@ -148,25 +865,444 @@ class CacheService:
 # Global cache instance
 cache = CacheService()
 
-def cached(ttl: int = 3600, key_prefix: str = ""):
-    """Decorator for caching function results"""
+class AsyncCacheService:
+    """Asyncio-native view of a CacheService for use inside async endpoints.
+
+    Shares the in-process tier, namespace versions and encoding with the sync
+    service; only the Redis round trips go through a pooled redis.asyncio client.
+    """
+
+    def __init__(self, sync_cache: CacheService):
+        self.sync_cache = sync_cache
+        self.memory_cache = sync_cache.memory_cache
+        self._redis_client = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._refreshing: Set[str] = set()
+        self._background_tasks: Set[asyncio.Task] = set()
+
+    @property
+    def redis_client(self):
+        # Only talk to Redis when the sync service managed to reach it at startup;
+        # the pool is created lazily so it binds to the running event loop.
+        if not self.sync_cache.redis_client:
+            return None
+        if self._redis_client is None:
+            pool = aioredis.ConnectionPool.from_url(
+                settings.redis_url,
+                max_connections=settings.cache_redis_max_connections,
+                socket_connect_timeout=5,
+                socket_timeout=5,
+                retry_on_timeout=True,
+                health_check_interval=30
+            )
+            self._redis_client = aioredis.Redis(connection_pool=pool)
+        return self._redis_client
+
+    async def get_namespace_version(self, namespace: str) -> int:
+        """Async counterpart of CacheService.get_namespace_version"""
+        now = time.monotonic()
+        cached_version = self.sync_cache._namespace_versions.get(namespace)
+        if cached_version and now - cached_version[1] < settings.cache_namespace_version_refresh:
+            return cached_version[0]
+        
+        version = cached_version[0] if cached_version else 1
+        if self.redis_client:
+            try:
+                stored = await self.redis_client.get(f"{NAMESPACE_VERSION_PREFIX}{namespace}")
+                version = int(stored) if stored else 1
+            except Exception as e:
+                logger.error(f"Cache namespace version error for {namespace}: {e}")
+        
+        with self.sync_cache._namespace_lock:
+            self.sync_cache._namespace_versions[namespace] = (version, now)
+        return version
+
+    async def make_key(self, namespace: str, *parts: Any, **named: Any) -> str:
+        """Build a deterministic key under the namespace's current version"""
+        return build_cache_key(namespace, await self.get_namespace_version(namespace), *parts, **named)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get value from cache (in-process tier first, then Redis)"""
+        if not self.sync_cache.cache_enabled:
+            return None
+        
+        try:
+            data = self.memory_cache.get(key)
+            if data is not None:
+                self.sync_cache.metrics.record_hit(key, 'memory')
+                return self.sync_cache._deserialize(data)
+            
+            if self.redis_client:
+                data = await self.redis_client.get(key)
+                if data:
+                    value = self.sync_cache._deserialize(data)
+                    self.memory_cache.set(
+                        key, data, ttl=settings.cache_memory_ttl, size=len(data)
+                    )
+                    self.sync_cache.metrics.record_hit(key, 'redis')
+                    return value
+            
+            self.sync_cache.metrics.record_miss(key)
+            return None
+        except Exception as e:
+            logger.error(f"Async cache get error for key {key}: {e}")
+            return None
+
+    async def set(self, key: str, value: Any, ttl: int = 3600, tags: Optional[List[str]] = None) -> bool:
+        """Set value in cache with TTL, registering the key under any invalidation tags"""
+        return await self.set_many({key: value}, ttl=ttl, tags=tags)
+
+    async def delete(self, key: str) -> bool:
+        """Delete key from cache"""
+        return await self.delete_many([key]) >= 0
+
+    async def delete_many(self, keys: List[str]) -> int:
+        """Delete several keys from both tiers; returns how many were removed"""
+        try:
+            deleted_count = self.memory_cache.delete_many(keys)
+            
+            if self.redis_client and keys:
+                deleted_count = 0
+                for start in range(0, len(keys), INVALIDATION_BATCH_SIZE):
+                    deleted_count += await self.redis_client.unlink(
+                        *keys[start:start + INVALIDATION_BATCH_SIZE]
+                    )
+                await self.redis_client.publish(
+                    INVALIDATION_CHANNEL,
+                    json.dumps({'kind': 'keys', 'keys': list(keys), 'origin': self.sync_cache.instance_id})
+                )
+            
+            return deleted_count
+        except Exception as e:
+            logger.error(f"Async cache delete error for keys {keys[:5]}: {e}")
+            return -1
+
+    async def invalidate_tags(self, *tags: str) -> dict:
+        """Async counterpart of CacheService.invalidate_tags"""
+        started = time.perf_counter()
+        deleted_count = self._invalidate_local_tags(tags)
+        if self.redis_client:
+            deleted_count = await self._invalidate_redis_tags(tags)
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+        logger.info(f"Invalidated {deleted_count} cache keys for tags {list(tags)} in {elapsed_ms}ms")
+        return {'deleted': deleted_count, 'elapsed_ms': elapsed_ms, 'tags': list(tags)}
+
+    def invalidate_tags_nowait(self, *tags: str) -> None:
+        """Drop this worker's entries now; the Redis deletes and the broadcast finish in a background task.
+
+        For code running on the event loop outside a coroutine (ORM hooks under AsyncSession).
+        """
+        self._invalidate_local_tags(tags)
+        if self.redis_client:
+            task = asyncio.get_running_loop().create_task(self._invalidate_redis_tags(tags))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+
+    def _invalidate_local_tags(self, tags) -> int:
+        deleted_count = sum(self.memory_cache.delete_tag(tag) for tag in tags)
+        self.sync_cache._notify_tag_listeners(tags)
+        return deleted_count
+
+    async def _invalidate_redis_tags(self, tags) -> int:
+        deleted_count = 0
+        try:
+            invalidated_keys: List[str] = []
+            for tag in tags:
+                tag_key = f"{TAG_PREFIX}{tag}"
+                keys = [
+                    key.decode('utf-8') if isinstance(key, bytes) else key
+                    async for key in self.redis_client.sscan_iter(tag_key, count=INVALIDATION_BATCH_SIZE)
+                ]
+                # Entries promoted from Redis were stored locally without their tags
+                self.memory_cache.delete_many(keys)
+                for start in range(0, len(keys), INVALIDATION_BATCH_SIZE):
+                    deleted_count += await self.redis_client.unlink(*keys[start:start + INVALIDATION_BATCH_SIZE])
+                await self.redis_client.unlink(tag_key)
+                invalidated_keys.extend(keys)
+            
+            await self.redis_client.publish(INVALIDATION_CHANNEL, json.dumps({
+                'kind': 'tags',
+                'tags': list(tags),
+                'keys': invalidated_keys if len(invalidated_keys) <= INVALIDATION_BROADCAST_MAX_KEYS else None,
+                'origin': self.sync_cache.instance_id
+            }))
+        except Exception as e:
+            logger.error(f"Async cache tag invalidation error for {tags}: {e}")
+        return deleted_count
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Fetch several keys; local misses are resolved with a single MGET"""
+        if not self.sync_cache.cache_enabled or not keys:
+            return {}
+        
+        found: Dict[str, Any] = {}
+        try:
+            found = self.sync_cache._decode_many(self.memory_cache.get_many(keys))
+            missing = [key for key in keys if key not in found]
+            
+            if missing and self.redis_client:
+                payloads = await self.redis_client.mget(missing)
+                found.update(self.sync_cache._promote(missing, payloads))
+            self.sync_cache._record_bulk_lookup(keys, found, missing)
+        except Exception as e:
+            logger.error(f"Async cache get_many error: {e}")
+        return found
+
+    async def set_many(
+        self,
+        mapping: Dict[str, Any],
+        ttl: int = 3600,
+        tags: Optional[List[str]] = None
+    ) -> bool:
+        """Store several values in one pipelined round trip"""
+        if not self.sync_cache.cache_enabled or not mapping:
+            return False
+        
+        try:
+            tags = tags or []
+            encoded = self.sync_cache._encode_many(mapping, ttl, tags)
+            
+            if self.redis_client:
+                pipe = self.redis_client.pipeline(transaction=False)
+                self.sync_cache._pipeline_set(pipe, encoded, ttl, tags)
+                await pipe.execute()
+            
+            return True
+        except Exception as e:
+            logger.error(f"Async cache set_many error: {e}")
+            return False
+
+    async def _acquire_lock(self, key: str) -> Optional[str]:
+        """Take the cross-worker loader lock for a key; None means another worker holds it"""
+        token = uuid.uuid4().hex
+        if not self.redis_client:
+            return token
+        try:
+            acquired = await self.redis_client.set(
+                f"{LOCK_PREFIX}{key}", token, nx=True, px=int(settings.cache_lock_ttl * 1000)
+            )
+            return token if acquired else None
+        except Exception as e:
+            logger.error(f"Async cache lock error for key {key}: {e}")
+            return token
+
+    async def _release_lock(self, key: str, token: str) -> None:
+        if not self.redis_client:
+            return
+        try:
+            await self.redis_client.eval(RELEASE_LOCK_SCRIPT, 1, f"{LOCK_PREFIX}{key}", token)
+        except Exception as e:
+            logger.error(f"Async cache lock release error for key {key}: {e}")
+
+    async def _timed_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Await a loader and record how long it took"""
+        started = time.perf_counter()
+        try:
+            value = await loader()
+        except Exception:
+            self.sync_cache.metrics.record_load(key, time.perf_counter() - started, failed=True)
+            raise
+        self.sync_cache.metrics.record_load(key, time.perf_counter() - started)
+        return value
+
+    async def _load_with_lock(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        tags: Optional[List[str]],
+        stale_ttl: int
+    ) -> Any:
+        """Run the loader while holding the cross-worker lock, or wait for the holder's result"""
+        token = await self._acquire_lock(key)
+        deadline = time.monotonic() + settings.cache_lock_ttl
+        while token is None and time.monotonic() < deadline:
+            await asyncio.sleep(settings.cache_lock_poll_interval)
+            entry = await self.get(key)
+            if entry is not None:
+                return _unwrap_fresh(entry)[0]
+            token = await self._acquire_lock(key)
+        
+        try:
+            value = await self._timed_load(key, loader)
+            if value is not None:
+                await self.set(key, _wrap_fresh(value, ttl, stale_ttl), ttl + stale_ttl, tags=tags)
+            return value
+        finally:
+            if token:
+                await self._release_lock(key, token)
+
+    async def _refresh(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        tags: Optional[List[str]],
+        stale_ttl: int
+    ) -> None:
+        token = await self._acquire_lock(key)
+        try:
+            if token is None:
+                return  # Another worker is already refreshing this key
+            value = await self._timed_load(key, loader)
+            if value is not None:
+                await self.set(key, _wrap_fresh(value, ttl, stale_ttl), ttl + stale_ttl, tags=tags)
+        except Exception as e:
+            logger.error(f"Async cache background refresh error for key {key}: {e}")
+        finally:
+            if token:
+                await self._release_lock(key, token)
+            self._refreshing.discard(key)
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int = 3600,
+        tags: Optional[List[str]] = None,
+        stale_ttl: int = 0
+    ) -> Any:
+        """Async counterpart of CacheService.get_or_load.
+
+        With stale_ttl > 0 the background refresh outlives the request, so the
+        loader must not depend on request-scoped objects such as DB sessions.
+        """
+        entry = await self.get(key)
+        if entry is not None:
+            value, is_stale = _unwrap_fresh(entry)
+            if is_stale:
+                self.sync_cache.metrics.record_stale(key)
+            if is_stale and key not in self._refreshing:
+                self._refreshing.add(key)
+                task = asyncio.create_task(self._refresh(key, loader, ttl, tags, stale_ttl))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
+            return value
+        
+        future = self._inflight.get(key)
+        if future is not None:
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), settings.cache_lock_ttl)
+            except (asyncio.TimeoutError, LoaderAbandoned):
+                return await self._timed_load(key, loader)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._load_with_lock(key, loader, ttl, tags, stale_ttl)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            if not future.done():
+                future.set_exception(LoaderAbandoned())
+            # Mark any exception as retrieved so leaders without followers don't log it
+            future.exception()
+            self._inflight.pop(key, None)
+
+    async def get_stats(self) -> dict:
+        """Get cache statistics without blocking the event loop on Redis INFO"""
+        try:
+            stats = {
+                'memory_cache_size': len(self.memory_cache),
+                'memory_cache': self.memory_cache.get_stats(),
+                'redis_connected': self.redis_client is not None,
+                'cache_enabled': self.sync_cache.cache_enabled
+            }
+            
+            if self.redis_client:
+                info = await self.redis_client.info()
+                stats.update({
+                    'redis_memory_used': info.get('used_memory_human', 'N/A'),
+                    'redis_connected_clients': info.get('connected_clients', 0),
+                    'redis_keyspace_hits': info.get('keyspace_hits', 0),
+                    'redis_keyspace_misses': info.get('keyspace_misses', 0)
+                })
+            
+            return stats
+        except Exception as e:
+            logger.error(f"Async cache stats error: {e}")
+            return {'error': str(e)}
+
+async_cache = AsyncCacheService(cache)
+
+def _key_parts(key: Optional[Callable[..., Any]], args: tuple, kwargs: dict) -> Tuple[tuple, dict]:
+    """Arguments a decorated call is keyed on: all of them, or what ``key`` picks out"""
+    if key is None:
+        return args, kwargs
+    return (key(*args, **kwargs),), {}
+
+def cached(
+    ttl: int = 3600,
+    key_prefix: str = "",
+    tags: Optional[List[str]] = None,
+    stale_ttl: int = 0,
+    key: Optional[Callable[..., Any]] = None
+):
+    """Decorator for caching function results; entries are tagged with their namespace by default.
+
+    Calls are keyed on their arguments. Pass ``key`` (same signature as the
+    function) when some arguments, like a session or the current user, cannot
+    be keyed as they are, e.g. ``key=lambda db, user: user.id``.
+    """
     def decorator(func):
+        namespace = key_prefix or "cached"
+        entry_tags = tags if tags is not None else [namespace]
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Generate cache key
-            cache_key = f"{key_prefix}:{func.__name__}:{hash(str(args) + str(sorted(kwargs.items())))}"
+            parts, named = _key_parts(key, args, kwargs)
+            cache_key = cache.make_key(
+                namespace,
+                f"{func.__module__}.{func.__qualname__}",
+                *parts,
+                **named
+            )
             
-            # Try to get from cache
-            result = cache.get(cache_key)
-            if result is not None:
-                logger.debug(f"Cache hit for {cache_key}")
-                return result
+            # Concurrent misses for the same key share a single call to func
+            return cache.get_or_load(
+                cache_key,
+                lambda: func(*args, **kwargs),
+                ttl=ttl,
+                tags=entry_tags,
+                stale_ttl=stale_ttl
+            )
+        
+        return wrapper
+    return decorator
+
+def async_cached(
+    ttl: int = 3600,
+    key_prefix: str = "",
+    tags: Optional[List[str]] = None,
+    stale_ttl: int = 0,
+    key: Optional[Callable[..., Any]] = None
+):
+    """Async variant of `cached` for coroutine functions"""
+    def decorator(func):
+        namespace = key_prefix or "cached"
+        entry_tags = tags if tags is not None else [namespace]
+        
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            parts, named = _key_parts(key, args, kwargs)
+            cache_key = await async_cache.make_key(
+                namespace,
+                f"{func.__module__}.{func.__qualname__}",
+                *parts,
+                **named
+            )
             
-            # Execute function and cache result
-            result = func(*args, **kwargs)
-            cache.set(cache_key, result, ttl)
-            logger.debug(f"Cached result for {cache_key}")
-            return result
+            return await async_cache.get_or_load(
+                cache_key,
+                lambda: func(*args, **kwargs),
+                ttl=ttl,
+                tags=entry_tags,
+                stale_ttl=stale_ttl
+            )
         
         return wrapper
     return decorator
@@ -174,3 +1310,11 @@ def cached(ttl: int = 3600, key_prefix: str = ""):
 def invalidate_cache(pattern: str):
     """Invalidate cache entries matching pattern"""
     return cache.clear_pattern(pattern)
+
+def invalidate_tags(*tags: str) -> dict:
+    """Invalidate cache entries registered under any of the given tags"""
+    return cache.invalidate_tags(*tags)
+
+def invalidate_namespace(namespace: str) -> int:
+    """Invalidate a whole key namespace by bumping its version"""
+    return cache.bump_namespace(namespace)
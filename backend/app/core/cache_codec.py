@@ -0,0 +1,210 @@
+import json
+import logging
+import pickle
+import time
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+try:
+    import msgpack  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    msgpack = None  # type: ignore
+
+try:
+    import zstandard  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore
+
+try:
+    import lz4.frame as lz4_frame  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    lz4_frame = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Every encoded value starts with one header byte: 0b11CCCEEE, where EEE is the
+# encoder and CCC the compression. The high bits keep headers apart from legacy
+# entries, which are raw pickles (0x80) or UTF-8 JSON (always ASCII first byte).
+HEADER_MARKER = 0xC0
+LEGACY_PICKLE_BYTE = 0x80
+
+ENCODER_JSON = 1
+ENCODER_MSGPACK = 2
+ENCODER_PICKLE = 3
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+COMPRESSION_LZ4 = 3
+
+ENCODER_NAMES = {'json': ENCODER_JSON, 'msgpack': ENCODER_MSGPACK, 'pickle': ENCODER_PICKLE}
+COMPRESSION_NAMES = {
+    'none': COMPRESSION_NONE,
+    'zlib': COMPRESSION_ZLIB,
+    'zstd': COMPRESSION_ZSTD,
+    'lz4': COMPRESSION_LZ4
+}
+
+
+class CodecError(Exception):
+    """Raised when a value cannot be encoded or a payload cannot be decoded"""
+
+
+def _json_dumps(value: Any) -> bytes:
+    if orjson is not None:
+        # Passthrough makes datetimes and dataclasses fail loudly instead of
+        # silently coming back as strings/dicts; they are left to pickle.
+        return orjson.dumps(
+            value,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+    return json.dumps(value, separators=(',', ':'), allow_nan=False).encode('utf-8')
+
+
+def _json_loads(payload: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload.decode('utf-8'))
+
+
+def _msgpack_dumps(value: Any) -> bytes:
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def _msgpack_loads(payload: bytes) -> Any:
+    return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
+
+def _zstd_compress(payload: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=3).compress(payload)
+
+
+def _zstd_decompress(payload: bytes) -> bytes:
+    return zstandard.ZstdDecompressor().decompress(payload)
+
+
+class CacheCodec:
+    """Compact, self-describing encoding for cached values.
+
+    JSON-shaped values (dicts, lists, strings, numbers, booleans, None) are
+    written with orjson or msgpack; anything else falls back to pickle when
+    allowed. Payloads above the threshold are compressed. The header byte lets
+    entries written by older releases or other codecs be read side by side.
+
+    Unpickling runs code chosen by whoever can write to Redis, so pickle is off
+    by default; pickle_read_until (epoch seconds) keeps reading the pickled
+    entries of an older release until they have expired, without writing new ones.
+    """
+
+    def __init__(
+        self,
+        encoder: str = 'json',
+        compression: str = 'zstd',
+        compression_threshold: int = 1024,
+        allow_pickle: bool = False,
+        pickle_read_until: Optional[float] = None
+    ):
+        self.allow_pickle = allow_pickle
+        self.pickle_read_until = pickle_read_until
+        self.encoder = self._resolve_encoder(encoder)
+        if self.encoder == ENCODER_PICKLE and not allow_pickle:
+            logger.warning("Pickle cache encoding is disabled, using JSON")
+            self.encoder = ENCODER_JSON
+        self.compression = self._resolve_compression(compression)
+        self.compression_threshold = compression_threshold
+
+        self._encoders: Dict[int, Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+            ENCODER_JSON: (_json_dumps, _json_loads),
+            ENCODER_PICKLE: (pickle.dumps, pickle.loads)
+        }
+        if msgpack is not None:
+            self._encoders[ENCODER_MSGPACK] = (_msgpack_dumps, _msgpack_loads)
+
+        self._compressors: Dict[int, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+            COMPRESSION_ZLIB: (lambda data: zlib.compress(data, 1), zlib.decompress)
+        }
+        if zstandard is not None:
+            self._compressors[COMPRESSION_ZSTD] = (_zstd_compress, _zstd_decompress)
+        if lz4_frame is not None:
+            self._compressors[COMPRESSION_LZ4] = (lz4_frame.compress, lz4_frame.decompress)
+
+    @staticmethod
+    def _resolve_encoder(name: str) -> int:
+        encoder = ENCODER_NAMES.get(name, ENCODER_JSON)
+        if encoder == ENCODER_MSGPACK and msgpack is None:
+            logger.warning("msgpack not installed, using JSON cache encoding")
+            return ENCODER_JSON
+        return encoder
+
+    @staticmethod
+    def _resolve_compression(name: str) -> int:
+        compression = COMPRESSION_NAMES.get(name, COMPRESSION_ZLIB)
+        if compression == COMPRESSION_ZSTD and zstandard is None:
+            compression = COMPRESSION_LZ4
+        if compression == COMPRESSION_LZ4 and lz4_frame is None:
+            # zlib ships with Python, so compression is always available
+            compression = COMPRESSION_ZLIB
+        return compression
+
+    def dumps(self, value: Any) -> bytes:
+        """Encode a value with a header byte describing how to read it back"""
+        encoder = self.encoder
+        try:
+            payload = self._encoders[encoder][0](value)
+        except Exception:
+            if not self.allow_pickle:
+                raise CodecError(f"Value of type {type(value).__name__} is not JSON-shaped")
+            encoder = ENCODER_PICKLE
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+        compression = COMPRESSION_NONE
+        if self.compression and len(payload) >= self.compression_threshold:
+            compressed = self._compressors[self.compression][0](payload)
+            # Incompressible payloads are kept as-is rather than grown
+            if len(compressed) < len(payload):
+                compression = self.compression
+                payload = compressed
+
+        return bytes((HEADER_MARKER | (compression << 3) | encoder,)) + payload
+
+    def reads_pickle(self) -> bool:
+        """Whether pickled entries may still be decoded"""
+        if self.allow_pickle:
+            return True
+        return self.pickle_read_until is not None and time.time() < self.pickle_read_until
+
+    def loads(self, data: bytes) -> Any:
+        """Decode a value written by dumps or by the legacy pickle/JSON serializer"""
+        if not data:
+            raise CodecError("Empty cache payload")
+
+        header = data[0]
+        if header & HEADER_MARKER != HEADER_MARKER:
+            return self._loads_legacy(data)
+
+        encoder = header & 0x07
+        compression = (header >> 3) & 0x07
+        payload = data[1:]
+
+        if compression:
+            if compression not in self._compressors:
+                raise CodecError(f"Unsupported cache compression {compression}")
+            payload = self._compressors[compression][1](payload)
+
+        if encoder == ENCODER_PICKLE and not self.reads_pickle():
+            raise CodecError("Pickled cache entries are disabled")
+        if encoder not in self._encoders:
+            raise CodecError(f"Unsupported cache encoder {encoder}")
+        return self._encoders[encoder][1](payload)
+
+    def _loads_legacy(self, data: bytes) -> Any:
+        if data[0] == LEGACY_PICKLE_BYTE:
+            if not self.reads_pickle():
+                raise CodecError("Pickled cache entries are disabled")
+            return pickle.loads(data)
+        return json.loads(data.decode('utf-8'))
@@ -0,0 +1,81 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import asyncio
+import logging
+
+from sqlalchemy import event
+
+from .cache import async_cache, invalidate_tags
+
+logger = logging.getLogger(__name__)
+
+PENDING_TAGS_KEY = "cache_invalidation_tags"
+
+# model class -> (static tags, optional per-instance tag function)
+_model_tags: Dict[type, Tuple[Tuple[str, ...], Optional[Callable[[Any], Iterable[str]]]]] = {}
+
+
+def register_cache_tags(
+    model: type,
+    *tags: str,
+    instance_tags: Optional[Callable[[Any], Iterable[str]]] = None
+) -> None:
+    """Declare which cache tags go stale when rows of a model are written"""
+    _model_tags[model] = (tuple(tags), instance_tags)
+
+
+def tags_for_instance(obj: Any) -> Set[str]:
+    """Cache tags affected by a change to one ORM instance"""
+    for model in type(obj).__mro__:
+        registration = _model_tags.get(model)
+        if registration is None:
+            continue
+        tags, instance_tags = registration
+        affected = set(tags)
+        if instance_tags is not None:
+            try:
+                affected.update(instance_tags(obj))
+            except Exception as e:
+                logger.error(f"Cache tag lookup error for {type(obj).__name__}: {e}")
+        return affected
+    return set()
+
+
+def registered_models() -> List[type]:
+    return list(_model_tags)
+
+
+def _collect_tags(session, flush_context) -> None:
+    """after_flush: remember the tags touched by this flush until the transaction ends"""
+    pending = session.info.setdefault(PENDING_TAGS_KEY, set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+            continue
+        pending.update(tags_for_instance(obj))
+
+
+def _invalidate_pending(session) -> None:
+    """after_commit: the writes are visible to other connections, so drop the cached reads"""
+    pending = session.info.pop(PENDING_TAGS_KEY, None)
+    if not pending:
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        invalidate_tags(*sorted(pending))
+        return
+    # AsyncSession commit: this runs on the event loop, which the sync Redis calls would block
+    async_cache.invalidate_tags_nowait(*sorted(pending))
+
+
+def _discard_pending(session, previous_transaction=None) -> None:
+    """after_rollback: nothing was written, nothing to invalidate"""
+    session.info.pop(PENDING_TAGS_KEY, None)
+
+
+def install_cache_invalidation(session_target: Any) -> None:
+    """Attach the flush/commit hooks to a Session class or sessionmaker"""
+    if event.contains(session_target, "after_commit", _invalidate_pending):
+        return
+    event.listen(session_target, "after_flush", _collect_tags)
+    event.listen(session_target, "after_commit", _invalidate_pending)
+    event.listen(session_target, "after_rollback", _discard_pending)
@@ -0,0 +1,151 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Tuple
+import random
+import threading
+
+# Counters kept per namespace; the namespace is the key's first ":"-separated segment
+COUNTER_FIELDS = (
+    'memory_hits', 'redis_hits', 'misses', 'stale_serves',
+    'loads', 'load_errors', 'bytes_written', 'evictions'
+)
+
+PROMETHEUS_COUNTERS = (
+    ('cache_hits_total', 'Cache hits by namespace and tier', None),
+    ('cache_misses_total', 'Cache misses by namespace', 'misses'),
+    ('cache_stale_serves_total', 'Expired values served while a refresh ran', 'stale_serves'),
+    ('cache_loads_total', 'Loader executions after a miss or refresh', 'loads'),
+    ('cache_load_errors_total', 'Loader executions that raised', 'load_errors'),
+    ('cache_load_seconds_total', 'Total time spent in loaders', 'load_seconds'),
+    ('cache_bytes_written_total', 'Encoded bytes written to the cache', 'bytes_written'),
+    ('cache_evictions_total', 'In-process entries evicted to stay within bounds', 'evictions'),
+)
+
+
+def namespace_of(key: str) -> str:
+    return key.split(':', 1)[0]
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class CacheMetrics:
+    """Per-namespace cache counters plus a sampled hot-key tracker"""
+
+    def __init__(self, hot_key_sample_rate: float = 0.05, hot_key_capacity: int = 512):
+        self.hot_key_sample_rate = hot_key_sample_rate
+        self.hot_key_capacity = hot_key_capacity
+        self._namespaces: Dict[str, Dict[str, float]] = {}
+        self._hot_keys: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def _counters(self, key: str) -> Dict[str, float]:
+        # Caller must hold the lock
+        namespace = namespace_of(key)
+        counters = self._namespaces.get(namespace)
+        if counters is None:
+            counters = dict.fromkeys(COUNTER_FIELDS, 0)
+            counters.update(load_seconds=0.0, load_seconds_max=0.0)
+            self._namespaces[namespace] = counters
+        return counters
+
+    def _increment(self, key: str, field: str, amount: float = 1) -> None:
+        with self._lock:
+            self._counters(key)[field] += amount
+
+    def _sample_access(self, key: str) -> None:
+        if random.random() >= self.hot_key_sample_rate:
+            return
+        with self._lock:
+            self._hot_keys[key] += 1
+            if len(self._hot_keys) > self.hot_key_capacity * 2:
+                # Keep the heaviest half so the tracker stays bounded
+                self._hot_keys = Counter(dict(self._hot_keys.most_common(self.hot_key_capacity)))
+
+    def record_hit(self, key: str, tier: str) -> None:
+        self._increment(key, f'{tier}_hits')
+        self._sample_access(key)
+
+    def record_miss(self, key: str) -> None:
+        self._increment(key, 'misses')
+        self._sample_access(key)
+
+    def record_stale(self, key: str) -> None:
+        self._increment(key, 'stale_serves')
+
+    def record_write(self, key: str, size: int) -> None:
+        self._increment(key, 'bytes_written', size)
+
+    def record_eviction(self, key: str) -> None:
+        self._increment(key, 'evictions')
+
+    def record_load(self, key: str, seconds: float, failed: bool = False) -> None:
+        with self._lock:
+            counters = self._counters(key)
+            counters['loads'] += 1
+            counters['load_seconds'] += seconds
+            counters['load_seconds_max'] = max(counters['load_seconds_max'], seconds)
+            if failed:
+                counters['load_errors'] += 1
+
+    def hot_keys(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most frequently accessed keys among the sampled lookups"""
+        with self._lock:
+            top = self._hot_keys.most_common(limit)
+        return [
+            {'key': key, 'sampled_hits': count, 'estimated_hits': round(count / self.hot_key_sample_rate)}
+            for key, count in top
+        ]
+
+    def memory_usage(self, entries: Iterable[Tuple[str, int]]) -> Dict[str, Dict[str, int]]:
+        """Current in-process entries and bytes per namespace from (key, size) pairs"""
+        usage: Dict[str, Dict[str, int]] = {}
+        for key, size in entries:
+            namespace_usage = usage.setdefault(namespace_of(key), {'entries': 0, 'bytes': 0})
+            namespace_usage['entries'] += 1
+            namespace_usage['bytes'] += size
+        return usage
+
+    def snapshot(self, entries: Iterable[Tuple[str, int]] = ()) -> Dict[str, Dict[str, Any]]:
+        """Counters per namespace, with hit rate, average load time and local memory usage"""
+        with self._lock:
+            namespaces = {name: dict(counters) for name, counters in self._namespaces.items()}
+
+        for name, usage in self.memory_usage(entries).items():
+            namespaces.setdefault(name, {}).update(memory_entries=usage['entries'], memory_bytes=usage['bytes'])
+
+        for counters in namespaces.values():
+            hits = counters.get('memory_hits', 0) + counters.get('redis_hits', 0)
+            lookups = hits + counters.get('misses', 0)
+            counters['hit_rate'] = round(hits / lookups, 4) if lookups else 0.0
+            loads = counters.get('loads', 0)
+            counters['load_seconds_avg'] = round(counters.get('load_seconds', 0.0) / loads, 6) if loads else 0.0
+        return namespaces
+
+    def render_prometheus(self, entries: Iterable[Tuple[str, int]] = ()) -> str:
+        """Render the namespace counters in the Prometheus text exposition format"""
+        namespaces = self.snapshot(entries)
+        lines: List[str] = []
+
+        for metric, help_text, field in PROMETHEUS_COUNTERS:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for name, counters in sorted(namespaces.items()):
+                label = f'namespace="{_escape_label(name)}"'
+                if field is None:
+                    for tier in ('memory', 'redis'):
+                        lines.append(f'{metric}{{{label},tier="{tier}"}} {counters.get(f"{tier}_hits", 0)}')
+                else:
+                    lines.append(f"{metric}{{{label}}} {counters.get(field, 0)}")
+
+        for metric, help_text, field in (
+            ('cache_memory_entries', 'Entries held in the in-process tier', 'memory_entries'),
+            ('cache_memory_bytes', 'Encoded bytes held in the in-process tier', 'memory_bytes'),
+            ('cache_load_seconds_max', 'Slowest loader execution', 'load_seconds_max'),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            for name, counters in sorted(namespaces.items()):
+                lines.append(f'{metric}{{namespace="{_escape_label(name)}"}} {counters.get(field, 0)}')
+
+        return "\n".join(lines) + "\n"
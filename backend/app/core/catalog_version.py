@@ -0,0 +1,62 @@
+"""
+Catalog version: a counter committed with every project write
+
+Each flush that writes projects increments the single row of
+``project_catalog_version`` in the same transaction, so whoever reads a version
+also sees every row written up to it. Catalog snapshots (in memory or in the
+shared snapshot file) record the version they were read at; a worker that reads
+a newer one knows its copy is stale, whichever process made the write.
+"""
+
+from typing import Any
+import logging
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+VERSION_ROW = 1
+
+
+def catalog_version_query():
+    from ..models.project import ProjectCatalogVersion
+
+    return select(ProjectCatalogVersion.version).where(ProjectCatalogVersion.id == VERSION_ROW)
+
+
+def read_catalog_version(connection) -> int:
+    """Current version; 0 before the first write"""
+    return connection.scalar(catalog_version_query()) or 0
+
+
+def bump_catalog_version(connection) -> None:
+    """INSERT ... ON CONFLICT DO UPDATE SET version = version + 1, in the caller's transaction"""
+    from ..models.project import ProjectCatalogVersion
+
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    upsert = dialect.insert(ProjectCatalogVersion).values(id=VERSION_ROW, version=1)
+    connection.execute(upsert.on_conflict_do_update(
+        index_elements=[ProjectCatalogVersion.id],
+        set_={"version": ProjectCatalogVersion.version + 1},
+    ))
+
+
+def _bump_after_flush(session: Session, flush_context: Any) -> None:
+    from ..models.project import Project
+
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if not isinstance(obj, Project):
+            continue
+        if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+            continue
+        bump_catalog_version(session.connection())
+        return
+
+
+def install_catalog_versioning(session_target: Any) -> None:
+    """Attach the flush hook to a Session class or sessionmaker"""
+    if event.contains(session_target, "after_flush", _bump_after_flush):
+        return
+    event.listen(session_target, "after_flush", _bump_after_flush)
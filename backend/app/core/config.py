@@ -1,7 +1,10 @@
 from pydantic_settings import BaseSettings
+from datetime import datetime
 from typing import Optional
 import os
 
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 
 class Settings(BaseSettings):
     # Application
@@ -11,6 +14,16 @@ class Settings(BaseSettings):
     
     # Database - Use SQLite for local development without Docker
     database_url: str = "sqlite:///./local_dev.db"
+    database_replica_urls: str = ""  # Comma-separated read replica URLs (PostgreSQL)
+    replica_sticky_seconds: float = 5.0  # After a write, that caller reads from the primary this long
+    replica_health_check_interval: float = 10.0
+    
+    # SQLite (file-backed): WAL journal, pooled readers and one writer connection per process
+    sqlite_pool_size: int = 10
+    sqlite_busy_timeout_ms: int = 5000  # Wait this long for another process's write lock
+    sqlite_synchronous: str = "NORMAL"  # NORMAL is durable across app crashes in WAL mode
+    sqlite_cache_size_kb: int = 65536  # Page cache per connection
+    sqlite_mmap_size: int = 256 * 1024 * 1024
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -20,6 +33,9 @@ class Settings(BaseSettings):
             db_file = self.database_url.replace("sqlite:///./", "")
             abs_path = os.path.abspath(db_file)
             self.database_url = f"sqlite:///{abs_path}"
+        # Relative to the backend directory rather than wherever the server was started
+        if self.catalog_snapshot_file and not os.path.isabs(self.catalog_snapshot_file):
+            self.catalog_snapshot_file = os.path.join(BACKEND_DIR, self.catalog_snapshot_file)
     
     # Security
     secret_key: str = "your-secret-key-change-in-production"
@@ -37,6 +53,39 @@ class Settings(BaseSettings):
     redis_url: str = "redis://localhost:6379"
     use_redis: bool = False
     
+    # Cache - bounded in-process tier kept in front of Redis
+    cache_memory_max_entries: int = 10000
+    cache_memory_max_bytes: int = 64 * 1024 * 1024
+    cache_memory_ttl: int = 60  # Upper bound on how long a worker trusts its local copy
+    cache_namespace_version_refresh: int = 5  # Seconds between namespace version reads
+    cache_redis_max_connections: int = 50  # Pool size for the asyncio Redis client
+    cache_lock_ttl: float = 10.0  # Cross-worker loader lock lifetime (seconds)
+    cache_lock_poll_interval: float = 0.05
+    cache_refresh_workers: int = 4  # Threads for stale-while-revalidate refreshes
+    cache_codec: str = "json"  # json | msgpack | pickle
+    cache_compression: str = "zstd"  # zstd | lz4 | zlib | none
+    cache_compression_threshold: int = 1024  # Bytes; smaller payloads are stored raw
+    cache_allow_pickle: bool = False  # Pickle non-JSON values; unpickling trusts whoever can write to Redis
+    cache_pickle_read_until: Optional[datetime] = None  # Migration window: still read pickled entries until then
+    cache_hot_key_sample_rate: float = 0.05  # Fraction of lookups fed to the hot-key tracker
+    metrics_enabled: bool = True  # False removes /metrics
+    metrics_token: Optional[str] = None  # Bearer token /metrics requires; without one it refuses every scrape
+    
+    # Query profiling
+    slow_query_threshold: float = 0.1  # Seconds; 0 turns the slow query log off
+    db_metrics: bool = True  # Pool wait/checkout/timeout and per-route query latency on /metrics
+    query_profiling: bool = False  # Record per-request query count, time and slowest statements
+    query_profile_slowest: int = 5  # Slowest statements kept per request
+    query_profile_history: int = 100  # Recent request profiles kept for /monitoring/queries
+    query_repeat_threshold: int = 0  # Flag statement shapes repeated this often in one request (N+1); 0 = off
+    query_budget_strict: bool = False  # Raise on budget/N+1 violations instead of logging (dev/test)
+    
+    # Project catalog
+    project_domains_file: Optional[str] = None  # JSON {domain: [keywords]} replacing the built-in domain map
+    catalog_snapshot_file: Optional[str] = "catalog.snapshot"  # mmap'd by every worker; relative paths are under the backend directory; empty disables
+    catalog_snapshot_check_interval: float = 1.0  # Seconds between checks for a replaced snapshot file
+    catalog_snapshot_max_age: int = 300  # Seconds; rebuild the catalog snapshot at least this often
+    
     # External Services
     openai_api_key: Optional[str] = None
     gemini_api_key: Optional[str] = None
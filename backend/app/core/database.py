@@ -1,40 +1,97 @@
+from fastapi import Request
 from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool, QueuePool
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from .cache_invalidation import install_cache_invalidation
+from .catalog_version import install_catalog_versioning
 from .config import settings
+from .db_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, db_metrics
+from .facets import install_facet_maintenance
+from .query_profiler import QueryProfiler
+from .replicas import RoutingSession, replica_router, route_session
+from typing import Optional
 import logging
-import time
 
 logger = logging.getLogger(__name__)
 
-# Performance monitoring
-def log_query_time(conn, cursor, statement, parameters, context, executemany):
-    start = time.time()
-    result = cursor.execute(statement, parameters)
-    end = time.time()
-    if end - start > 0.1:  # Log slow queries (>100ms)
-        logger.warning(f"Slow query ({end - start:.3f}s): {statement[:100]}...")
-    return result
+# Performance monitoring: slow query log plus per-request profiles (see QueryProfilingMiddleware)
+query_profiler = QueryProfiler(
+    slow_query_threshold=settings.slow_query_threshold,
+    keep_slowest=settings.query_profile_slowest,
+    history=settings.query_profile_history,
+    repeat_threshold=settings.query_repeat_threshold,
+)
+
+def is_memory_sqlite(database_url: str) -> bool:
+    return database_url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in database_url
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Per-connection SQLite tuning; WAL lets readers and the writer proceed concurrently"""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kb)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+def writer_pool_timeout() -> float:
+    """Seconds a write waits for the single writer connection: as long as SQLite waits for the file lock"""
+    return settings.sqlite_busy_timeout_ms / 1000
+
+if settings.db_metrics:
+    query_profiler.listeners.append(db_metrics.record_query)
+
+def _instrument(engine, name: str) -> None:
+    """Attach the profiler / metrics listeners to a sync engine (or an async engine's sync_engine)"""
+    # With profiling, the slow query log and metrics all off no listener runs at all
+    if settings.query_profiling or settings.slow_query_threshold > 0 or settings.db_metrics:
+        query_profiler.attach(engine)
+    if settings.db_metrics:
+        db_metrics.register_engine(name, engine)
 
 # Create engine lazily to ensure it uses the updated configuration
-def get_engine():
-    if settings.database_url.startswith("sqlite"):
+def get_engine(database_url: Optional[str] = None, writer: bool = False, name: Optional[str] = None):
+    database_url = database_url or settings.database_url
+    name = name or ("writer" if writer else "primary")
+    if database_url.startswith("sqlite") and is_memory_sqlite(database_url):
+        # One shared connection keeps an in-memory database alive
         engine = create_engine(
-            settings.database_url,
+            database_url,
             connect_args={"check_same_thread": False},
             echo=settings.debug,
             poolclass=StaticPool,
-            pool_pre_ping=True,
+        )
+        logger.info("Using in-memory SQLite database")
+    elif database_url.startswith("sqlite"):
+        engine = create_engine(
+            database_url,
+            connect_args={"check_same_thread": False},
+            echo=settings.debug,
+            poolclass=InstrumentedQueuePool,
+            pool_logging_name=name,
+            # SQLite allows one writer at a time; queue writers in-process rather
+            # than letting them fail with "database is locked", but give up as soon
+            # as SQLite itself would (busy_timeout) instead of after 30s
+            pool_size=1 if writer else settings.sqlite_pool_size,
+            max_overflow=0 if writer else settings.sqlite_pool_size,
+            pool_timeout=writer_pool_timeout() if writer else 30,
             pool_recycle=3600,  # Recycle connections every hour
         )
-        logger.info(f"Using SQLite database: {settings.database_url}")
+        event.listen(engine, "connect", set_sqlite_pragmas)
+        logger.info(f"Using SQLite database{' writer' if writer else ''}: {database_url}")
     else:
         # Use psycopg3 for PostgreSQL with optimized settings
         engine = create_engine(
-            settings.database_url.replace("postgresql://", "postgresql+psycopg://"),
+            database_url.replace("postgresql://", "postgresql+psycopg://"),
             echo=settings.debug,
-            poolclass=QueuePool,
+            poolclass=InstrumentedQueuePool,
+            pool_logging_name=name,
             pool_size=20,  # Increased pool size
             max_overflow=30,  # Allow overflow connections
             pool_pre_ping=True,  # Verify connections before use
@@ -43,24 +100,101 @@ def get_engine():
         )
         logger.info("Using PostgreSQL database with psycopg3")
     
-    # Add query performance monitoring
-    event.listen(engine, "before_cursor_execute", log_query_time)
+    # Add query performance monitoring and pool metrics
+    _instrument(engine, name)
     
     return engine
 
-# Create engine instance
+def get_async_engine(database_url: Optional[str] = None, writer: bool = False, name: Optional[str] = None):
+    """Engine for AsyncSession: aiosqlite for SQLite, psycopg3's async driver for PostgreSQL"""
+    database_url = database_url or settings.database_url
+    name = name or ("writer-async" if writer else "primary-async")
+    if database_url.startswith("sqlite") and is_memory_sqlite(database_url):
+        async_engine = create_async_engine(
+            database_url.replace("sqlite://", "sqlite+aiosqlite://", 1),
+            echo=settings.debug,
+            poolclass=StaticPool,
+        )
+    elif database_url.startswith("sqlite"):
+        async_engine = create_async_engine(
+            database_url.replace("sqlite://", "sqlite+aiosqlite://", 1),
+            echo=settings.debug,
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_logging_name=name,
+            pool_size=1 if writer else settings.sqlite_pool_size,
+            max_overflow=0 if writer else settings.sqlite_pool_size,
+            pool_timeout=writer_pool_timeout() if writer else 30,
+            pool_recycle=3600,
+        )
+        event.listen(async_engine.sync_engine, "connect", set_sqlite_pragmas)
+    else:
+        async_engine = create_async_engine(
+            database_url.replace("postgresql://", "postgresql+psycopg://"),
+            echo=settings.debug,
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_logging_name=name,
+            pool_size=20,
+            max_overflow=30,
+            pool_pre_ping=True,
+            pool_recycle=3600,
+            pool_timeout=30,
+        )
+    
+    # Cursor and pool events fire on the sync engine the async one wraps
+    _instrument(async_engine.sync_engine, name)
+    
+    return async_engine
+
+# Create engine instances
 engine = get_engine()
+async_engine = get_async_engine()
+
+# File-backed SQLite: flushes, and any read after a write in the same session,
+# go through a single writer connection; everything else uses the reader pool
+if settings.database_url.startswith("sqlite") and not is_memory_sqlite(settings.database_url):
+    replica_router.set_writer(engine, get_engine(writer=True))
+    replica_router.set_writer(async_engine, get_async_engine(writer=True))
+
+# Read replicas: GET requests and read-only callers send their SELECTs here
+replica_router.sticky_seconds = settings.replica_sticky_seconds
+replica_router.health_check_interval = settings.replica_health_check_interval
+for index, replica_url in enumerate(url.strip() for url in settings.database_replica_urls.split(",")):
+    if replica_url:
+        replica_router.add_replica(
+            f"replica-{index}",
+            get_engine(replica_url, name=f"replica-{index}"),
+            get_async_engine(replica_url, name=f"replica-{index}-async"),
+        )
 
 # Optimized session configuration
 SessionLocal = sessionmaker(
+    class_=RoutingSession,
     autocommit=False, 
     autoflush=False, 
     bind=engine,
     expire_on_commit=False  # Prevent unnecessary queries on commit
 )
 
+# Async routes use this so DB round trips never block the event loop
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False  # Attributes stay loaded; lazy refreshes are not possible under asyncio
+)
+
 Base = declarative_base()
 
+# Drop cached reads for registered models whenever a transaction that wrote them commits
+# (AsyncSession drives a plain Session underneath, so this covers both)
+install_cache_invalidation(Session)
+
+# Keep the catalog's facet counts current in the same transaction as project writes
+install_facet_maintenance(Session)
+
+# Tell every worker's catalog snapshot that it is stale, whichever process wrote
+install_catalog_versioning(Session)
+
 # Connection pool monitoring
 def get_connection_info():
     if hasattr(engine.pool, 'size'):
@@ -72,8 +206,66 @@ def get_connection_info():
         }
     return None
 
-def get_db():
-    db = SessionLocal()
+def query_budget(max_queries: int):
+    """Route dependency declaring how many queries a request may run (checked when profiling is on)"""
+    async def set_query_budget() -> None:
+        query_profiler.set_budget(max_queries)
+    return set_query_budget
+
+class LazySession:
+    """Stands in for a Session until the handler first touches it.
+
+    Cache hits and early returns never build a session, route it or check out
+    a connection.
+    """
+
+    def __init__(self, factory, request: Optional[Request] = None, read_only: bool = False):
+        self._factory = factory
+        self._request = request
+        self._read_only = read_only
+        self._session = None
+
+    @property
+    def created(self) -> bool:
+        return self._session is not None
+
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = self._factory()
+            route_session(self._session, self._request, read_only=self._read_only)
+        return self._session
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+    def __contains__(self, instance) -> bool:
+        return self._session is not None and instance in self._session
+
+    def __iter__(self):
+        return iter(self._session) if self._session is not None else iter(())
+
+    def rollback(self) -> None:
+        if self._session is not None:
+            self._session.rollback()
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+
+class LazyAsyncSession(LazySession):
+    """LazySession for AsyncSession dependencies"""
+
+    async def rollback(self) -> None:
+        if self._session is not None:
+            await self._session.rollback()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+
+def get_db(request: Request):
+    db = LazySession(SessionLocal, request)
     try:
         yield db
     except Exception as e:
@@ -82,3 +274,29 @@ def get_db():
         raise
     finally:
         db.close()
+
+def get_read_db(request: Request):
+    """get_db for read-only dependencies: replica reads whatever the HTTP method"""
+    db = LazySession(SessionLocal, request, read_only=True)
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db(request: Request):
+    db = LazyAsyncSession(AsyncSessionLocal, request)
+    try:
+        yield db
+    except Exception as e:
+        logger.error(f"Database error: {e}")
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
+
+async def get_async_read_db(request: Request):
+    db = LazyAsyncSession(AsyncSessionLocal, request, read_only=True)
+    try:
+        yield db
+    finally:
+        await db.close()
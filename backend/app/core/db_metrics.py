@@ -0,0 +1,211 @@
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import logging
+import re
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CHECKOUT_START_KEY = "db_metrics_checkout_at"
+
+_TABLE = re.compile(r'\b(?:FROM|INTO|UPDATE|JOIN)\s+"?(\w+)"?', re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
+def table_of(statement: str) -> str:
+    """First table a statement touches; compiled statements repeat, so this is cached"""
+    match = _TABLE.search(statement)
+    return match.group(1) if match else "other"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values"""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # one slot per bucket, then +Inf, sum
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+                    break
+            else:
+                series[len(self.buckets)] += 1
+            series[-1] += value
+
+    def snapshot(self) -> Dict[Tuple[str, ...], Dict[str, float]]:
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        result = {}
+        for labels, series in items:
+            count = sum(series[:-1])
+            result[labels] = {'count': count, 'sum': round(series[-1], 6)}
+        return result
+
+    def render(self, name: str, help_text: str, label_names: Sequence[str]) -> List[str]:
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        for labels, series in items:
+            label_text = ",".join(f'{key}="{_escape_label(value)}"' for key, value in zip(label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{name}_bucket{{{label_text},le="{le}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{label_text}}} {series[-1]}")
+            lines.append(f"{name}_count{{{label_text}}} {cumulative}")
+        return lines
+
+
+class DatabaseMetrics:
+    """Pool wait/hold times, timeouts and overflow, plus query latency by route and table"""
+
+    def __init__(self):
+        self.pool_wait = Histogram()
+        self.pool_checkout = Histogram()
+        self.query_latency = Histogram()
+        self.timeouts: Dict[str, int] = {}
+        self.overflow_peak: Dict[str, int] = {}
+        self._engines: Dict[str, Any] = {}
+        self._queries: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("db_queries", default=None)
+        self._lock = threading.Lock()
+
+    # Pools
+
+    def register_engine(self, name: str, engine) -> None:
+        """Track a (sync) engine's pool under a name; idempotent"""
+        if self._engines.get(name) is engine:
+            return
+        self._engines[name] = engine
+        event.listen(engine, "checkout", lambda dbapi_connection, record, proxy: self._on_checkout(name, engine, record))
+        event.listen(engine, "checkin", lambda dbapi_connection, record: self._on_checkin(name, record))
+
+    def record_wait(self, pool, seconds: float, timed_out: bool = False) -> None:
+        name = getattr(pool, "logging_name", None) or "default"
+        self.pool_wait.observe((name,), seconds)
+        if timed_out:
+            with self._lock:
+                self.timeouts[name] = self.timeouts.get(name, 0) + 1
+
+    def _on_checkout(self, name: str, engine, connection_record) -> None:
+        connection_record.info[CHECKOUT_START_KEY] = time.perf_counter()
+        overflow = engine.pool.overflow() if hasattr(engine.pool, "overflow") else 0
+        if overflow > 0:
+            with self._lock:
+                if overflow > self.overflow_peak.get(name, 0):
+                    self.overflow_peak[name] = overflow
+
+    def _on_checkin(self, name: str, connection_record) -> None:
+        start = connection_record.info.pop(CHECKOUT_START_KEY, None)
+        if start is not None:
+            self.pool_checkout.observe((name,), time.perf_counter() - start)
+
+    def pool_status(self) -> Dict[str, Dict[str, Any]]:
+        status = {}
+        for name, engine in self._engines.items():
+            pool = engine.pool
+            if not hasattr(pool, "size"):
+                continue
+            status[name] = {
+                'pool_size': pool.size(),
+                'checked_in': pool.checkedin(),
+                'checked_out': pool.checkedout(),
+                'overflow': pool.overflow(),
+                'max_overflow': getattr(pool, "_max_overflow", 0),
+                'overflow_peak': self.overflow_peak.get(name, 0),
+                'timeouts': self.timeouts.get(name, 0),
+            }
+        return status
+
+    # Queries
+
+    def start_request(self):
+        """Collect this request's query timings until finish_request() attributes them to its route"""
+        return self._queries.set([])
+
+    def finish_request(self, token, route: str) -> None:
+        queries = self._queries.get()
+        self._queries.reset(token)
+        for table, seconds in queries or ():
+            self.query_latency.observe((route, table), seconds)
+
+    def record_query(self, statement: str, seconds: float) -> None:
+        queries = self._queries.get()
+        if queries is not None:
+            queries.append((table_of(statement), seconds))
+        else:
+            self.query_latency.observe(("background", table_of(statement)), seconds)
+
+    # Export
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        lines += self.pool_wait.render(
+            "db_pool_wait_seconds", "Time spent waiting for a pooled connection", ("pool",)
+        )
+        lines += self.pool_checkout.render(
+            "db_pool_checkout_seconds", "How long connections stay checked out", ("pool",)
+        )
+        lines += self.query_latency.render(
+            "db_query_seconds", "Statement latency by route template and table", ("route", "table")
+        )
+
+        status = self.pool_status()
+        for metric, metric_type, help_text, field in (
+            ('db_pool_timeouts_total', 'counter', 'Checkouts that gave up waiting for a connection', 'timeouts'),
+            ('db_pool_size', 'gauge', 'Configured persistent connections', 'pool_size'),
+            ('db_pool_checked_out', 'gauge', 'Connections currently in use', 'checked_out'),
+            ('db_pool_overflow', 'gauge', 'Overflow connections currently open', 'overflow'),
+            ('db_pool_max_overflow', 'gauge', 'Configured overflow limit', 'max_overflow'),
+            ('db_pool_overflow_peak', 'gauge', 'Most overflow connections open at once', 'overflow_peak'),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {metric_type}")
+            for name, values in sorted(status.items()):
+                lines.append(f'{metric}{{pool="{_escape_label(name)}"}} {values[field]}')
+
+        return "\n".join(lines) + "\n"
+
+
+db_metrics = DatabaseMetrics()
+
+
+class _WaitTimingMixin:
+    """Times how long _do_get blocks for a connection and counts checkout timeouts"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            db_metrics.record_wait(self, time.perf_counter() - start, timed_out=True)
+            raise
+        db_metrics.record_wait(self, time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(_WaitTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    pass
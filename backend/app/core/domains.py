@@ -0,0 +1,122 @@
+"""
+Domain classification for the project catalog
+
+Projects are tagged with domains ("web-dev", "ai-ml", ...) once, when they are
+written, and the rows in ``project_domains`` back the catalog's ``domain`` filter
+with an indexed equality lookup. A project belongs to every domain whose keywords
+appear in its title, description or tags.
+
+Changing the keyword map (PROJECT_DOMAINS_FILE) only affects new writes; re-tag
+the existing catalog with the backfill:
+
+    python -m app.core.domains
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+import json
+import logging
+
+from sqlalchemy import delete, func, insert, select
+
+from .cache import invalidate_tags
+from .catalog_version import bump_catalog_version
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DOMAIN_KEYWORDS: Dict[str, List[str]] = {
+    'web-dev': ['html', 'css', 'javascript', 'react', 'node', 'vue', 'angular', 'web', 'frontend', 'backend'],
+    'ai-ml': ['python', 'tensorflow', 'machine learning', 'ai', 'ml', 'data science', 'pytorch'],
+    'mobile': ['android', 'ios', 'react native', 'flutter', 'mobile', 'app'],
+    'cybersecurity': ['security', 'cyber', 'encryption', 'auth', 'penetration'],
+    'creative-industry': ['design', 'ui', 'ux', 'graphics', 'creative', 'art'],
+}
+
+BACKFILL_BATCH_SIZE = 500
+
+
+@lru_cache(maxsize=1)
+def domain_keywords() -> Dict[str, List[str]]:
+    """Configured keyword map; the JSON file named by PROJECT_DOMAINS_FILE replaces the default"""
+    if not settings.project_domains_file:
+        return DEFAULT_DOMAIN_KEYWORDS
+    with open(settings.project_domains_file, encoding="utf-8") as handle:
+        keywords = json.load(handle)
+    return {domain: [keyword.lower() for keyword in words] for domain, words in keywords.items()}
+
+
+def classify_project(title: Optional[str], description: Optional[str], tags: Any) -> List[str]:
+    """Domains whose keywords occur in the project; substring matching, like the old LIKE filter"""
+    haystacks = [
+        (title or "").lower(),
+        (description or "").lower(),
+        json.dumps(tags or []).lower(),
+    ]
+    return [
+        domain
+        for domain, keywords in domain_keywords().items()
+        if any(keyword in haystack for keyword in keywords for haystack in haystacks)
+    ]
+
+
+def sync_project_domains(connection, project_id: int, domains: List[str]) -> None:
+    """Replace one project's domain rows (runs on the flushing connection)"""
+    from ..models.project import ProjectDomain
+
+    connection.execute(delete(ProjectDomain).where(ProjectDomain.project_id == project_id))
+    if domains:
+        connection.execute(
+            insert(ProjectDomain),
+            [{"project_id": project_id, "domain": domain} for domain in domains],
+        )
+
+
+def backfill_project_domains(engine) -> int:
+    """Re-tag every project with the current keyword map; returns how many projects were seen"""
+    from ..models.project import Project
+
+    seen = 0
+    last_id = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(Project.id, Project.title, Project.description, Project.tags)
+                .where(Project.id > last_id)
+                .order_by(Project.id)
+                .limit(BACKFILL_BATCH_SIZE)
+            ).all()
+            for row in rows:
+                sync_project_domains(conn, row.id, classify_project(row.title, row.description, row.tags))
+        if not rows:
+            break
+        seen += len(rows)
+        last_id = rows[-1].id
+    # The rows above bypass the flush hooks, so the maintained domain counts are
+    # recounted here; cached catalog pages and snapshots used the old tags
+    from .facets import refresh_facet_counts
+
+    with engine.begin() as conn:
+        refresh_facet_counts(conn)
+        bump_catalog_version(conn)
+    invalidate_tags("projects")
+    logger.info(f"Project domains: classified {seen} projects")
+    return seen
+
+
+def ensure_project_domains(engine) -> None:
+    """Dev convenience: classify an existing catalog that predates project_domains"""
+    from ..models.project import Project, ProjectDomain
+
+    with engine.connect() as conn:
+        classified = conn.scalar(select(func.count()).select_from(ProjectDomain))
+        projects = conn.scalar(select(func.count(Project.id)))
+    if projects and not classified:
+        backfill_project_domains(engine)
+
+
+if __name__ == "__main__":
+    from .database import engine
+    from .replicas import replica_router
+
+    print(f"Classified {backfill_project_domains(replica_router.writers.get(engine, engine))} projects")
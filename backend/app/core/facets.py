@@ -0,0 +1,275 @@
+"""
+Maintained facet counts for the project catalog
+
+``project_facet_counts`` holds how many published projects fall under each
+difficulty, domain, tag and estimated-hours bucket, so catalog reads fetch a few
+dozen precomputed rows instead of running GROUP BY queries on every request.
+Each flush that writes projects adds or subtracts one per affected value with an
+upsert, so a write costs the same whatever the catalog size and concurrent
+writers only lock the rows they touch. Rows written behind the ORM (bulk SQL,
+imports) need the full rebuild:
+
+    python -m app.core.facets
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+from sqlalchemy import delete, event, func, insert, inspect, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from .cache import invalidate_tags
+from .domains import classify_project
+
+logger = logging.getLogger(__name__)
+
+FACETS = ("difficulty", "domain", "tag", "hours")
+
+# (label, lower bound inclusive, upper bound exclusive or None)
+HOURS_BUCKETS: Tuple[Tuple[str, int, Optional[int]], ...] = (
+    ("under-10", 0, 10),
+    ("10-20", 10, 20),
+    ("20-40", 20, 40),
+    ("40-plus", 40, None),
+)
+
+DELTA_KEY = "facet_count_deltas"
+
+# Project attributes the facets (and the domain classification) are derived from
+FACET_ATTRIBUTES = ("status", "difficulty", "tags", "estimated_hours", "title", "description")
+TEXT_ATTRIBUTES = ("title", "description", "tags")
+
+_UNKNOWN = object()
+
+
+def hours_bucket(hours: Optional[int]) -> Optional[str]:
+    if hours is None:
+        return None
+    for label, low, high in HOURS_BUCKETS:
+        if hours >= low and (high is None or hours < high):
+            return label
+    return None
+
+
+def hours_range(label: str) -> Tuple[int, Optional[int]]:
+    """Bounds of an hours bucket; ValueError for unknown labels"""
+    for name, low, high in HOURS_BUCKETS:
+        if name == label:
+            return low, high
+    raise ValueError(f"Unknown hours bucket: {label}")
+
+
+def project_facet_values(status: Any, difficulty: Any, tags: Any, hours: Optional[int], domains: Iterable[str]) -> Counter:
+    """(facet, value) pairs one project counts towards; nothing unless it is published"""
+    from ..models.project import ProjectStatus
+
+    values: Counter = Counter()
+    if status != ProjectStatus.PUBLISHED:
+        return values
+    values[("difficulty", getattr(difficulty, "value", difficulty))] += 1
+    # A tag listed twice on one project still counts that project once
+    values.update(("tag", tag) for tag in {tag.lower() for tag in tags or [] if isinstance(tag, str)})
+    bucket = hours_bucket(hours)
+    if bucket:
+        values[("hours", bucket)] += 1
+    values.update(("domain", domain) for domain in set(domains))
+    return values
+
+
+def compute_facet_counts(connection) -> Dict[str, Counter]:
+    """Facet counts over the published catalog, straight from the project tables"""
+    from ..models.project import Project, ProjectDomain, ProjectStatus
+
+    counts: Dict[str, Counter] = {facet: Counter() for facet in FACETS}
+    published = Project.status == ProjectStatus.PUBLISHED
+
+    for difficulty, tags, hours in connection.execute(
+        select(Project.difficulty, Project.tags, Project.estimated_hours).where(published)
+    ):
+        for facet, value in project_facet_values(ProjectStatus.PUBLISHED, difficulty, tags, hours, ()):
+            counts[facet][value] += 1
+
+    for domain, count in connection.execute(
+        select(ProjectDomain.domain, func.count())
+        .join(Project, Project.id == ProjectDomain.project_id)
+        .where(published)
+        .group_by(ProjectDomain.domain)
+    ):
+        counts["domain"][domain] = count
+
+    return counts
+
+
+def refresh_facet_counts(connection) -> None:
+    """Replace the aggregate rows with a full recount (rebuild and migrations only)"""
+    from ..models.project import ProjectFacetCount
+
+    counts = compute_facet_counts(connection)
+    connection.execute(delete(ProjectFacetCount))
+    rows = [
+        {"facet": facet, "value": value, "count": count}
+        for facet, counter in counts.items()
+        for value, count in counter.items()
+    ]
+    if rows:
+        connection.execute(insert(ProjectFacetCount), rows)
+
+
+def apply_facet_deltas(connection, deltas: Counter) -> None:
+    """Add each (facet, value) delta in place: INSERT ... ON CONFLICT DO UPDATE SET count = count + delta"""
+    from ..models.project import ProjectFacetCount
+
+    # Sorted so concurrent writers lock shared rows in the same order
+    rows = [
+        {"facet": facet, "value": value, "count": delta}
+        for (facet, value), delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    upsert = dialect.insert(ProjectFacetCount).values(rows)
+    connection.execute(upsert.on_conflict_do_update(
+        index_elements=[ProjectFacetCount.facet, ProjectFacetCount.value],
+        set_={"count": ProjectFacetCount.count + upsert.excluded["count"]},
+    ))
+    # Values no published project carries any more
+    keys = [(row["facet"], row["value"]) for row in rows if row["count"] < 0]
+    if keys:
+        connection.execute(delete(ProjectFacetCount).where(
+            tuple_(ProjectFacetCount.facet, ProjectFacetCount.value).in_(keys),
+            ProjectFacetCount.count <= 0,
+        ))
+
+
+def read_facet_counts(rows) -> Dict[str, Dict[str, int]]:
+    """{facet: {value: count}} from (facet, value, count) rows, largest first"""
+    facets: Dict[str, Dict[str, int]] = {facet: {} for facet in FACETS}
+    for facet, value, count in sorted(rows, key=lambda row: (row[0], -row[2], row[1])):
+        if count > 0:
+            facets.setdefault(facet, {})[value] = count
+    return facets
+
+
+# Flush hooks: work out each project's before/after facet values ahead of the
+# flush (attribute history is reset by it), apply the difference once it succeeds
+
+def _previous_value(state, name: str) -> Any:
+    """Value as of the last load or flush; _UNKNOWN when it was overwritten while expired"""
+    history = state.attrs[name].load_history()
+    if history.deleted:
+        return history.deleted[0]
+    if history.added:
+        return _UNKNOWN
+    return history.unchanged[0] if history.unchanged else None
+
+
+def _stored_rows(connection, ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    from ..models.project import Project
+
+    if not ids:
+        return {}
+    columns = [getattr(Project, name) for name in FACET_ATTRIBUTES]
+    rows = connection.execute(select(Project.id, *columns).where(Project.id.in_(ids)))
+    return {row.id: dict(zip(FACET_ATTRIBUTES, row[1:])) for row in rows}
+
+
+def _stored_domains(connection, ids: List[int]) -> Dict[int, List[str]]:
+    from ..models.project import ProjectDomain
+
+    domains: Dict[int, List[str]] = {}
+    if ids:
+        for project_id, domain in connection.execute(
+            select(ProjectDomain.project_id, ProjectDomain.domain).where(ProjectDomain.project_id.in_(ids))
+        ):
+            domains.setdefault(project_id, []).append(domain)
+    return domains
+
+
+def _facet_values_of(values: Dict[str, Any], domains: Iterable[str]) -> Counter:
+    return project_facet_values(
+        values["status"], values["difficulty"], values["tags"], values["estimated_hours"], domains
+    )
+
+
+def _collect_facet_deltas(session: Session, flush_context: Any, instances: Any) -> None:
+    from ..models.project import Project
+
+    session.info.pop(DELTA_KEY, None)
+    new = [obj for obj in session.new if isinstance(obj, Project)]
+    deleted = [obj for obj in session.deleted if isinstance(obj, Project)]
+    changed = [
+        obj for obj in session.dirty
+        if isinstance(obj, Project) and obj not in session.deleted
+        and any(inspect(obj).attrs[name].history.has_changes() for name in FACET_ATTRIBUTES)
+    ]
+    if not (new or deleted or changed):
+        return
+
+    connection = session.connection()
+    persistent = [obj for obj in (*changed, *deleted) if obj.id is not None]
+    previous = {
+        obj.id: {name: _previous_value(inspect(obj), name) for name in FACET_ATTRIBUTES}
+        for obj in persistent
+    }
+    # Only attributes assigned while expired lack their old value in the history
+    stored = _stored_rows(connection, [
+        id for id, values in previous.items() if any(value is _UNKNOWN for value in values.values())
+    ])
+    domains = _stored_domains(connection, list(previous))
+
+    deltas: Counter = Counter()
+    for id, values in previous.items():
+        values.update(stored.get(id, {}))
+        deltas.subtract(_facet_values_of(values, domains.get(id, [])))
+    for obj in (*new, *changed):
+        values = {name: getattr(obj, name) for name in FACET_ATTRIBUTES}
+        # Mirrors the domain listeners in app.models.project: reclassify on text changes only
+        state = inspect(obj)
+        if obj in new or any(state.attrs[name].history.has_changes() for name in TEXT_ATTRIBUTES):
+            new_domains = classify_project(values["title"], values["description"], values["tags"])
+        else:
+            new_domains = domains.get(obj.id, [])
+        deltas.update(_facet_values_of(values, new_domains))
+    session.info[DELTA_KEY] = deltas
+
+
+def _apply_after_flush(session: Session, flush_context: Any) -> None:
+    deltas = session.info.pop(DELTA_KEY, None)
+    if deltas:
+        apply_facet_deltas(session.connection(), deltas)
+
+
+def install_facet_maintenance(session_target: Any) -> None:
+    """Attach the flush hooks to a Session class or sessionmaker"""
+    if event.contains(session_target, "after_flush", _apply_after_flush):
+        return
+    event.listen(session_target, "before_flush", _collect_facet_deltas)
+    event.listen(session_target, "after_flush", _apply_after_flush)
+
+
+def rebuild_facet_counts(engine) -> None:
+    with engine.begin() as conn:
+        refresh_facet_counts(conn)
+    invalidate_tags("projects")
+    logger.info("Project facets: counts rebuilt")
+
+
+def ensure_facet_counts(engine) -> None:
+    """Dev convenience: build the aggregate for a catalog seeded before it existed"""
+    from ..models.project import Project, ProjectFacetCount
+
+    with engine.connect() as conn:
+        maintained = conn.scalar(select(func.count()).select_from(ProjectFacetCount))
+        projects = conn.scalar(select(func.count(Project.id)))
+    if projects and not maintained:
+        rebuild_facet_counts(engine)
+
+
+if __name__ == "__main__":
+    from .database import engine
+    from .replicas import replica_router
+
+    rebuild_facet_counts(replica_router.writers.get(engine, engine))
@@ -0,0 +1,46 @@
+"""
+Opaque keyset cursors
+
+A cursor names the last row of a page by its (created_at, id) sort key; the
+next page starts right after that key in the catalog snapshot (a binary search,
+see app.services.catalog) instead of skipping OFFSET rows, and rows inserted
+meanwhile never shift page boundaries. Timestamps are compared in UTC; naive
+ones (SQLite, hand-built cursors) are taken to be UTC already.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import base64
+import json
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def as_utc(value: datetime) -> datetime:
+    """Aware UTC datetime, so naive and aware timestamps compare instead of raising"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """(created_at, id) named by a cursor; ValueError when it was not produced by encode_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return as_utc(datetime.fromisoformat(created_at)), int(row_id)
+    except (TypeError, ValueError, OverflowError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def next_cursor(items: List[Dict[str, Any]], limit: Optional[int]) -> Optional[str]:
+    """Cursor after the last item of a full page of serialized rows; None on the last page"""
+    if not limit or len(items) < limit or not items[-1].get("created_at"):
+        return None
+    last = items[-1]
+    return encode_cursor(datetime.fromisoformat(last["created_at"]), last["id"])
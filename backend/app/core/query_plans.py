@@ -0,0 +1,176 @@
+"""
+Plan checks for the hot query shapes
+
+Each entry mirrors a query an endpoint runs on every request. The check EXPLAINs
+them and reports any that would read their table with a sequential scan, which
+means a supporting index (see migrations/003_hot_query_indexes.sql) is missing.
+
+    python -m app.core.query_plans   # exits 1 when a hot query seq-scans
+"""
+
+from typing import Callable, Dict, List, Tuple
+import json
+import logging
+import re
+import sys
+
+from sqlalchemy import desc, func, select, text
+
+logger = logging.getLogger(__name__)
+
+
+def _catalog():
+    from ..models.project import Project, ProjectDifficulty, ProjectStatus
+    return "projects", select(Project).where(
+        Project.status == ProjectStatus.PUBLISHED,
+        Project.difficulty == ProjectDifficulty.BEGINNER
+    ).order_by(desc(Project.created_at)).limit(20)
+
+
+def _catalog_snapshot():
+    from ..services.catalog import catalog_queries
+    return "projects", catalog_queries()[0]
+
+
+def _catalog_by_domain():
+    from ..models.project import Project, ProjectDomain, ProjectStatus
+    return "project_domains", select(Project).join(
+        ProjectDomain, ProjectDomain.project_id == Project.id
+    ).where(
+        ProjectDomain.domain == "web-dev",
+        Project.status == ProjectStatus.PUBLISHED
+    ).order_by(desc(Project.created_at)).limit(20)
+
+
+def _recent_xp():
+    from ..models.gamification import XPTransaction
+    return "xp_transactions", select(XPTransaction).where(
+        XPTransaction.user_progress_id == "progress-id"
+    ).order_by(desc(XPTransaction.created_at)).limit(10)
+
+
+def _recent_badges():
+    from ..models.gamification import UserBadge
+    return "user_badges", select(UserBadge).where(
+        UserBadge.user_progress_id == "progress-id"
+    ).order_by(desc(UserBadge.earned_date)).limit(5)
+
+
+def _newsletter_comments():
+    from ..models.newsletter import NewsletterComment
+    return "newsletter_comments", select(NewsletterComment).where(
+        NewsletterComment.newsletter_id == 1,
+        NewsletterComment.parent_id.is_(None)
+    )
+
+
+def _newsletter_replies():
+    from ..models.newsletter import NewsletterComment
+    return "newsletter_comments", select(NewsletterComment).where(
+        NewsletterComment.newsletter_id == 1,
+        NewsletterComment.parent_id.in_([1, 2, 3])
+    )
+
+
+def _newsletter_comment_counts():
+    from ..models.newsletter import NewsletterComment
+    return "newsletter_comments", select(
+        NewsletterComment.newsletter_id, func.count(NewsletterComment.id)
+    ).where(NewsletterComment.newsletter_id.in_([1, 2, 3])).group_by(NewsletterComment.newsletter_id)
+
+
+def _newsletter_likes():
+    from ..models.newsletter import NewsletterLike
+    return "newsletter_likes", select(NewsletterLike.newsletter_id).where(
+        NewsletterLike.newsletter_id.in_([1, 2, 3]),
+        NewsletterLike.user_id == 1
+    )
+
+
+def _chat_history():
+    from ..models.collaboration import ChatMessage
+    return "chat_messages", select(ChatMessage).where(
+        ChatMessage.session_id == "session-id"
+    ).order_by(desc(ChatMessage.created_at)).limit(50)
+
+
+def _leaderboard_xp():
+    from ..models.gamification import UserProgress
+    return "user_progress", select(UserProgress).order_by(desc(UserProgress.total_xp)).limit(50)
+
+
+def _leaderboard_streak():
+    from ..models.gamification import UserProgress
+    return "user_progress", select(UserProgress).order_by(desc(UserProgress.current_streak)).limit(50)
+
+
+# name -> builder returning (table that must not be seq-scanned, statement)
+HOT_QUERIES: Dict[str, Callable[[], Tuple[str, object]]] = {
+    'project_catalog': _catalog,
+    'catalog_snapshot': _catalog_snapshot,
+    'catalog_by_domain': _catalog_by_domain,
+    'recent_xp': _recent_xp,
+    'recent_badges': _recent_badges,
+    'newsletter_comments': _newsletter_comments,
+    'newsletter_replies': _newsletter_replies,
+    'newsletter_comment_counts': _newsletter_comment_counts,
+    'newsletter_likes': _newsletter_likes,
+    'chat_history': _chat_history,
+    'leaderboard_xp': _leaderboard_xp,
+    'leaderboard_streak': _leaderboard_streak,
+}
+
+
+def _postgres_seq_scans(plan: dict) -> List[str]:
+    tables = []
+    if plan.get("Node Type") == "Seq Scan":
+        tables.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        tables.extend(_postgres_seq_scans(child))
+    return tables
+
+
+def explain_seq_scans(conn, statement) -> List[str]:
+    """Tables the database would read with a full sequential scan for this statement"""
+    sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+
+    if conn.dialect.name == "postgresql":
+        # Tiny dev tables make seq scans cheapest; with them discouraged a
+        # Seq Scan node only survives when no usable index exists
+        conn.execute(text("SET LOCAL enable_seqscan = off"))
+        raw = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        plans = raw if isinstance(raw, list) else json.loads(raw)
+        return _postgres_seq_scans(plans[0]["Plan"])
+
+    if conn.dialect.name == "sqlite":
+        tables = []
+        for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")):
+            match = re.match(r"SCAN (?:TABLE )?(\w+)(.*)", row[-1])
+            if match and "USING" not in match.group(2):
+                tables.append(match.group(1))
+        return tables
+
+    raise ValueError(f"No plan check for dialect {conn.dialect.name}")
+
+
+def find_sequential_scans(engine) -> Dict[str, str]:
+    """Hot queries that sequentially scan their table: {query name: table}"""
+    offenders = {}
+    for name, build in HOT_QUERIES.items():
+        table, statement = build()
+        with engine.connect() as conn:
+            with conn.begin():
+                if table in explain_seq_scans(conn, statement):
+                    offenders[name] = table
+    return offenders
+
+
+if __name__ == "__main__":
+    from .database import engine
+
+    offenders = find_sequential_scans(engine)
+    for name, table in offenders.items():
+        print(f"{name}: sequential scan on {table}")
+    if offenders:
+        sys.exit(1)
+    print(f"All {len(HOT_QUERIES)} hot queries use an index")
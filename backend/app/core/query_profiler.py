@@ -0,0 +1,204 @@
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+import heapq
+import logging
+import re
+import threading
+import time
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Attribute stamped on the per-execution context between before/after cursor events
+START_ATTR = "_query_profiler_start"
+MAX_STATEMENT_LENGTH = 500
+MAX_PARAMETERS_LENGTH = 300
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|:\w+|\$\d+|\?")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(Exception):
+    """A request ran more queries than its route allows, or repeated one statement shape too often"""
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a statement to its shape: literals and placeholders become ?, IN lists collapse"""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryProfile:
+    """Queries issued while handling one request: count, total time and the slowest statements"""
+
+    def __init__(self, label: str = "", keep_slowest: int = 5, repeat_threshold: int = 0):
+        self.label = label
+        self.keep_slowest = keep_slowest
+        self.repeat_threshold = repeat_threshold
+        self.budget: Optional[int] = None
+        self.count = 0
+        self.total_seconds = 0.0
+        self.started_at = time.time()
+        self._slowest: List[Tuple[float, int, str, Any]] = []
+        # Only filled when N+1 detection is on; normalizing every statement is not free
+        self._shapes: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, parameters: Any, seconds: float) -> None:
+        shape = normalize_statement(statement) if self.repeat_threshold else None
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            if shape is not None:
+                self._shapes[shape] += 1
+            if self.keep_slowest <= 0:
+                return
+            # Min-heap of the N slowest; the counter breaks ties without comparing statements
+            entry = (seconds, self.count, statement, parameters)
+            if len(self._slowest) < self.keep_slowest:
+                heapq.heappush(self._slowest, entry)
+            elif seconds > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def slowest(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            entries = sorted(self._slowest, reverse=True)
+        return [
+            {
+                'duration_ms': round(seconds * 1000, 3),
+                'statement': statement[:MAX_STATEMENT_LENGTH],
+                'parameters': repr(parameters)[:MAX_PARAMETERS_LENGTH],
+            }
+            for seconds, _, statement, parameters in entries
+        ]
+
+    def repeated(self) -> List[Dict[str, Any]]:
+        """Statement shapes run at least repeat_threshold times - the usual N+1 signature"""
+        if not self.repeat_threshold:
+            return []
+        with self._lock:
+            shapes = self._shapes.most_common()
+        return [
+            {'count': count, 'statement': shape[:MAX_STATEMENT_LENGTH]}
+            for shape, count in shapes
+            if count >= self.repeat_threshold
+        ]
+
+    def violations(self) -> List[str]:
+        problems = []
+        if self.budget is not None and self.count > self.budget:
+            problems.append(f"{self.label} ran {self.count} queries, budget is {self.budget}")
+        for repeated in self.repeated():
+            problems.append(
+                f"Possible N+1 in {self.label}: {repeated['count']}x {repeated['statement'][:200]}"
+            )
+        return problems
+
+    def check(self) -> None:
+        """Raise QueryBudgetExceeded if the budget or repeat threshold was exceeded"""
+        problems = self.violations()
+        if problems:
+            raise QueryBudgetExceeded("; ".join(problems))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'label': self.label,
+            'started_at': self.started_at,
+            'query_count': self.count,
+            'budget': self.budget,
+            'total_ms': round(self.total_seconds * 1000, 3),
+            'slowest': self.slowest(),
+            'repeated': self.repeated(),
+        }
+
+
+class QueryProfiler:
+    """Times every cursor execution on the engines it is attached to"""
+
+    def __init__(
+        self,
+        slow_query_threshold: float = 0.1,
+        keep_slowest: int = 5,
+        history: int = 100,
+        repeat_threshold: int = 0
+    ):
+        self.slow_query_threshold = slow_query_threshold
+        self.keep_slowest = keep_slowest
+        self.repeat_threshold = repeat_threshold
+        self._current: ContextVar[Optional[QueryProfile]] = ContextVar("query_profile", default=None)
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self._recent_lock = threading.Lock()
+        # Extra consumers of each (statement, seconds) timing, e.g. the DB metrics exporter
+        self.listeners: List[Callable[[str, float], None]] = []
+
+    def attach(self, engine) -> None:
+        """Listen on an engine; idempotent"""
+        if event.contains(engine, "after_cursor_execute", self._after_cursor_execute):
+            return
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            setattr(context, START_ATTR, time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, START_ATTR, None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+
+        if self.slow_query_threshold and elapsed > self.slow_query_threshold:
+            logger.warning(f"Slow query ({elapsed:.3f}s): {statement[:100]}...")
+
+        profile = self._current.get()
+        if profile is not None:
+            profile.record(statement, parameters, elapsed)
+
+        for listener in self.listeners:
+            listener(statement, elapsed)
+
+    def current(self) -> Optional[QueryProfile]:
+        return self._current.get()
+
+    def start(self, label: str = ""):
+        """Begin collecting queries for the current request; returns (profile, token) for finish()"""
+        profile = QueryProfile(label, keep_slowest=self.keep_slowest, repeat_threshold=self.repeat_threshold)
+        return profile, self._current.set(profile)
+
+    def finish(self, profile: QueryProfile, token) -> QueryProfile:
+        self._current.reset(token)
+        if profile.count:
+            with self._recent_lock:
+                self._recent.append(profile.to_dict())
+        return profile
+
+    @contextmanager
+    def profile(self, label: str = "", budget: Optional[int] = None) -> Iterator[QueryProfile]:
+        profile, token = self.start(label)
+        profile.budget = budget
+        try:
+            yield profile
+        finally:
+            self.finish(profile, token)
+
+    def set_budget(self, budget: int) -> None:
+        """Cap the queries the current request may run; no-op when it is not being profiled"""
+        profile = self._current.get()
+        if profile is not None:
+            profile.budget = budget
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent request profiles, newest first"""
+        with self._recent_lock:
+            recent = list(self._recent)
+        return recent[::-1][:limit]
@@ -0,0 +1,252 @@
+from typing import Any, Dict, List, Optional
+import hashlib
+import itertools
+import logging
+import re
+import threading
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+logger = logging.getLogger(__name__)
+
+# Session.info keys
+REPLICA_READS_KEY = "replica_reads"  # Selects may go to a replica
+STICKY_KEY = "replica_sticky_key"  # Who to pin to the primary after this session writes
+STICKY_REQUEST_KEY = "replica_sticky_request"  # Request whose response carries the sticky cookie
+WROTE_KEY = "replica_wrote"
+
+# Epoch seconds until which the client reads from the primary; set by ReplicaStickyMiddleware
+STICKY_COOKIE = "db_primary_until"
+STICKY_STATE = "replica_sticky_until"
+READ_METHODS = frozenset({"GET", "HEAD"})
+# Raw SQL is only trusted to be a read when it is a plain SELECT
+READ_ONLY_TEXT = re.compile(r"\s*select\b", re.IGNORECASE)
+
+
+class Replica:
+    """One read replica: a sync engine, its async twin and its last known health"""
+
+    def __init__(self, name: str, engine, async_engine=None):
+        self.name = name
+        self.engine = engine
+        self.async_engine = async_engine
+        self.healthy = True
+        self.last_error: Optional[str] = None
+        self.checked_at = 0.0
+
+
+class ReplicaRouter:
+    """Picks a healthy replica for reads and remembers who must read from the primary"""
+
+    def __init__(self, sticky_seconds: float = 5.0, health_check_interval: float = 10.0):
+        self.sticky_seconds = sticky_seconds
+        self.health_check_interval = health_check_interval
+        self.replicas: List[Replica] = []
+        # primary sync engine -> dedicated write engine (SQLite's single writer connection)
+        self.writers: Dict[Any, Any] = {}
+        self._round_robin = itertools.count()
+        self._sticky: Dict[str, float] = {}
+        self._sticky_lock = threading.Lock()
+        self._health_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def add_replica(self, name: str, engine, async_engine=None) -> Replica:
+        replica = Replica(name, engine, async_engine)
+        event.listen(engine, "handle_error", lambda context: self._on_error(replica, context))
+        if async_engine is not None:
+            event.listen(async_engine.sync_engine, "handle_error", lambda context: self._on_error(replica, context))
+        self.replicas.append(replica)
+        return replica
+
+    def set_writer(self, primary, writer) -> None:
+        """Send writes for sessions bound to primary through writer (async engines accepted)"""
+        self.writers[getattr(primary, "sync_engine", primary)] = getattr(writer, "sync_engine", writer)
+
+    def choose(self, use_async: bool = False) -> Optional[Any]:
+        """Sync (or async-wrapped) engine of the next healthy replica; None means use the primary"""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        replica = healthy[next(self._round_robin) % len(healthy)]
+        if use_async:
+            return replica.async_engine.sync_engine if replica.async_engine is not None else None
+        return replica.engine
+
+    # Sticky primary: a user who just wrote reads their own writes. This worker
+    # remembers the caller; other workers learn it from the response cookie, so
+    # routing never waits on a network round trip.
+
+    def mark_write(self, key: Optional[str], request=None) -> None:
+        if self.sticky_seconds <= 0:
+            return
+        if request is not None:
+            setattr(request.state, STICKY_STATE, time.time() + self.sticky_seconds)
+        if not key:
+            return
+        with self._sticky_lock:
+            self._sticky[key] = time.monotonic() + self.sticky_seconds
+            if len(self._sticky) > 10000:
+                now = time.monotonic()
+                self._sticky = {k: until for k, until in self._sticky.items() if until > now}
+
+    def is_sticky(self, key: Optional[str], request=None) -> bool:
+        if self.sticky_seconds <= 0:
+            return False
+        if request is not None:
+            try:
+                if float(request.cookies.get(STICKY_COOKIE, 0)) > time.time():
+                    return True
+            except ValueError:
+                pass
+        if not key:
+            return False
+        until = self._sticky.get(key)
+        if until is not None:
+            if until > time.monotonic():
+                return True
+            with self._sticky_lock:
+                self._sticky.pop(key, None)
+        return False
+
+    # Health checks
+
+    def _on_error(self, replica: Replica, context) -> None:
+        if context.is_disconnect or context.connection is None:
+            self._mark(replica, False, str(context.original_exception))
+
+    def _mark(self, replica: Replica, healthy: bool, error: Optional[str] = None) -> None:
+        if replica.healthy and not healthy:
+            logger.warning(f"Replica {replica.name} unhealthy, reads fall back to the primary: {error}")
+        elif healthy and not replica.healthy:
+            logger.info(f"Replica {replica.name} healthy again")
+        replica.healthy = healthy
+        replica.last_error = error
+        replica.checked_at = time.time()
+
+    def check_health(self) -> None:
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                self._mark(replica, True)
+            except Exception as e:
+                self._mark(replica, False, str(e))
+
+    def start_health_checks(self) -> None:
+        """Ping every replica in a daemon thread so routing never waits on a dead host"""
+        if not self.replicas or (self._health_thread is not None and self._health_thread.is_alive()):
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.is_set():
+                self.check_health()
+                self._stop.wait(self.health_check_interval)
+
+        self._health_thread = threading.Thread(target=run, name="replica-health", daemon=True)
+        self._health_thread.start()
+
+    def stop_health_checks(self) -> None:
+        self._stop.set()
+        if self._health_thread is not None:
+            self._health_thread.join(timeout=1)
+            self._health_thread = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'replicas': [
+                {
+                    'name': replica.name,
+                    'healthy': replica.healthy,
+                    'last_error': replica.last_error,
+                    'checked_at': replica.checked_at,
+                }
+                for replica in self.replicas
+            ],
+            'sticky_seconds': self.sticky_seconds,
+            'sticky_users': len(self._sticky),
+        }
+
+
+replica_router = ReplicaRouter()
+
+
+class RoutingSession(Session):
+    """Session that sends writes to the writer engine and plain SELECTs to a replica when allowed"""
+
+    def _writing(self, clause) -> bool:
+        return bool(
+            self._flushing
+            or self.info.get(WROTE_KEY)
+            or (clause is not None and (
+                getattr(clause, "is_dml", False)
+                or getattr(clause, "_for_update_arg", None) is not None
+                or (isinstance(clause, TextClause) and not READ_ONLY_TEXT.match(clause.text))
+            ))
+        )
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if replica_router.writers and self._writing(clause):
+            primary = super().get_bind(mapper=mapper, clause=clause, **kw)
+            return replica_router.writers.get(primary, primary)
+        if (
+            self.info.get(REPLICA_READS_KEY)
+            and not self._flushing
+            and not self.info.get(WROTE_KEY)
+            and clause is not None
+            and getattr(clause, "is_select", False)
+            and getattr(clause, "_for_update_arg", None) is None
+        ):
+            primary = super().get_bind(mapper=mapper, clause=clause, **kw)
+            # Async sessions are bound to an AsyncEngine's sync_engine; pick the matching replica
+            replica = replica_router.choose(use_async=getattr(primary.dialect, "is_async", False))
+            if replica is not None:
+                return replica
+            return primary
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _remember_write(session, flush_context) -> None:
+    # Later reads in this session must see the rows it just wrote
+    session.info[WROTE_KEY] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _pin_writer_to_primary(session) -> None:
+    if session.info.pop(WROTE_KEY, False):
+        session.info.pop(REPLICA_READS_KEY, None)
+        replica_router.mark_write(session.info.get(STICKY_KEY), session.info.get(STICKY_REQUEST_KEY))
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_write(session) -> None:
+    session.info.pop(WROTE_KEY, None)
+
+
+def sticky_key_for(request) -> str:
+    """Identify the caller: bearer token when authenticated, client address otherwise"""
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return hashlib.blake2b(authorization.encode("utf-8"), digest_size=12).hexdigest()
+    return request.client.host if request.client else "unknown"
+
+
+def route_session(db, request=None, read_only: bool = False) -> None:
+    """Tag a sync or async session: reads go to replicas for GETs and read-only callers,
+    unless the caller wrote within the sticky window"""
+    if not replica_router.enabled:
+        return
+    sticky_key = sticky_key_for(request) if request is not None else None
+    db.info[STICKY_KEY] = sticky_key
+    db.info[STICKY_REQUEST_KEY] = request
+    wants_replica = read_only or (request is not None and request.method in READ_METHODS)
+    if wants_replica and not replica_router.is_sticky(sticky_key, request):
+        db.info[REPLICA_READS_KEY] = True
@@ -0,0 +1,166 @@
+"""
+Full-text search over the project catalog
+
+PostgreSQL keeps a weighted ``tsvector`` in a generated ``projects.search_vector``
+column behind a GIN index (migrations/004_project_search.sql). SQLite uses an FTS5
+table, ``projects_fts``, that mirrors ``projects`` through triggers. Either way a
+search is an index lookup ranked by relevance, with a highlighted snippet, instead
+of LIKE '%term%' over every row.
+
+Snippets are project text, which users write: the database wraps matches in
+placeholders and render_highlight() escapes the text before turning those into
+<mark> tags, so the highlight is safe to insert as HTML.
+"""
+
+from typing import Dict, List, Optional
+import html
+import logging
+import re
+import secrets
+
+from sqlalchemy import desc, func, literal_column, text
+from sqlalchemy.sql import column, table
+
+logger = logging.getLogger(__name__)
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+# What the database wraps matches in; random per process so stored text cannot forge one
+MATCH_START = f"hl{secrets.token_hex(8)}s"
+MATCH_END = f"hl{secrets.token_hex(8)}e"
+MAX_TERMS = 8
+
+# Relevance weights: title, brief, description, tags
+SQLITE_BM25_WEIGHTS = (10.0, 4.0, 1.0, 5.0)
+
+POSTGRES_SEARCH_DDL = (
+    """
+    ALTER TABLE projects ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(brief, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(tags::text, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'C')
+        ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_projects_search_vector ON projects USING GIN (search_vector)",
+)
+
+SQLITE_SEARCH_DDL = (
+    """
+    CREATE VIRTUAL TABLE projects_fts USING fts5(
+        title, brief, description, tags,
+        content='projects', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_insert AFTER INSERT ON projects BEGIN
+        INSERT INTO projects_fts(rowid, title, brief, description, tags)
+        VALUES (new.id, new.title, new.brief, new.description, new.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_delete AFTER DELETE ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, title, brief, description, tags)
+        VALUES ('delete', old.id, old.title, old.brief, old.description, old.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_update AFTER UPDATE OF title, brief, description, tags ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, title, brief, description, tags)
+        VALUES ('delete', old.id, old.title, old.brief, old.description, old.tags);
+        INSERT INTO projects_fts(rowid, title, brief, description, tags)
+        VALUES (new.id, new.title, new.brief, new.description, new.tags);
+    END
+    """,
+    # Index whatever rows already exist
+    "INSERT INTO projects_fts(projects_fts) VALUES ('rebuild')",
+)
+
+# Dialect name -> whether its search objects exist; filled by install_project_search()
+_ready: Dict[str, bool] = {}
+
+projects_fts = table("projects_fts", column("rowid"))
+
+
+def search_terms(search: Optional[str]) -> List[str]:
+    """Words of a user query, lowercased; punctuation never reaches the MATCH syntax"""
+    if not search:
+        return []
+    return re.findall(r"\w+", search.lower())[:MAX_TERMS]
+
+
+def install_project_search(engine) -> bool:
+    """Create the dialect's search objects if missing (dev convenience; prod runs migration 004)"""
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as conn:
+            if dialect == "postgresql":
+                for statement in POSTGRES_SEARCH_DDL:
+                    conn.execute(text(statement))
+            elif dialect == "sqlite":
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'projects_fts'")
+                ).first()
+                if not exists:
+                    for statement in SQLITE_SEARCH_DDL:
+                        conn.execute(text(statement))
+            else:
+                raise ValueError(f"No full-text search for dialect {dialect}")
+        _ready[dialect] = True
+    except Exception as e:
+        logger.error(f"Project search unavailable, falling back to LIKE matching: {e}")
+        _ready[dialect] = False
+    return _ready[dialect]
+
+
+def search_ready(dialect: str) -> bool:
+    # PostgreSQL deployments get the column from the migration even if install never ran here
+    return _ready.get(dialect, dialect == "postgresql")
+
+
+def render_highlight(snippet: Optional[str]) -> Optional[str]:
+    """HTML for a "highlight" column: the text escaped, then the matches wrapped in <mark>"""
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(MATCH_START, HIGHLIGHT_START).replace(MATCH_END, HIGHLIGHT_END)
+
+
+def apply_project_search(query, dialect: str, terms: List[str]):
+    """Restrict a catalog select over projects to matches, best first, adding a "highlight" snippet column.
+
+    The snippet is raw text with placeholder markers; pass it through render_highlight().
+
+    Every term must match; the last one also matches as a prefix so partial
+    words ("java" -> "javascript") still find results while typing.
+    """
+    from ..models.project import Project
+
+    if dialect == "postgresql":
+        search_vector = literal_column("projects.search_vector")
+        config = literal_column("'english'::regconfig")
+        tsquery = func.to_tsquery(config, " & ".join(terms[:-1] + [f"{terms[-1]}:*"]))
+        rank = func.ts_rank_cd(search_vector, tsquery)
+        # Expensive output expression: PostgreSQL evaluates it after the LIMIT
+        snippet = func.ts_headline(
+            config,
+            func.coalesce(Project.description, Project.brief),
+            tsquery,
+            f"StartSel={MATCH_START}, StopSel={MATCH_END}, MaxWords=30, MinWords=12",
+        )
+        query = query.where(search_vector.op("@@")(tsquery)).order_by(desc(rank))
+    elif dialect == "sqlite":
+        match = " AND ".join([f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*'])
+        fts = literal_column("projects_fts")
+        # bm25() is lower-is-better
+        rank = func.bm25(fts, *SQLITE_BM25_WEIGHTS)
+        snippet = func.snippet(fts, -1, MATCH_START, MATCH_END, "…", 16)
+        query = (
+            query.join(projects_fts, projects_fts.c.rowid == Project.id)
+            .where(fts.op("MATCH")(match))
+            .order_by(rank)
+        )
+    else:
+        raise ValueError(f"No full-text search for dialect {dialect}")
+
+    return query.add_columns(snippet.label("highlight"))
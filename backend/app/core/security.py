@@ -268,7 +268,7 @@ def validate_csrf_token(token: str, session_token: str) -> bool:
 # JWT Token functions (for compatibility with existing auth)
 from app.core.config import settings
 from app.core.database import get_db
-from app.models.user import User
+from app.models.user import User, UserRole
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
@@ -306,6 +306,15 @@ def get_current_user(token: str = Depends(HTTPBearer()), db: Session = Depends(g
         raise credentials_exception
     return user
 
+def get_current_admin_user(current_user: User = Depends(get_current_user)):
+    """Require an authenticated user with the admin role"""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required"
+        )
+    return current_user
+
 def get_optional_user(token: Optional[str] = Depends(HTTPBearer(auto_error=False)), db: Session = Depends(get_db)):
     """Get current user from JWT token (optional, returns None if not authenticated)"""
     if not token:
@@ -339,5 +348,6 @@ __all__ = [
     'create_access_token',
     'get_password_hash',
     'get_current_user',
+    'get_current_admin_user',
     'get_optional_user'
 ]
\ No newline at end of file
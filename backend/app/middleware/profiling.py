@@ -0,0 +1,48 @@
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+import logging
+from app.core.config import settings
+from app.core.database import query_profiler
+from app.core.db_metrics import db_metrics
+from app.core.query_profiler import QueryBudgetExceeded
+
+logger = logging.getLogger(__name__)
+
+class QueryProfilingMiddleware(BaseHTTPMiddleware):
+    """Per-request database query profile, query budgets and N+1 detection"""
+
+    async def dispatch(self, request: Request, call_next):
+        profile, token = query_profiler.start(f"{request.method} {request.url.path}")
+        try:
+            response = await call_next(request)
+        finally:
+            query_profiler.finish(profile, token)
+
+        response.headers['X-DB-Query-Count'] = str(profile.count)
+        response.headers['X-DB-Query-Time'] = f"{profile.total_seconds * 1000:.1f}ms"
+
+        if profile.count:
+            logger.info(
+                f"Queries: {profile.label} ran {profile.count} queries in {profile.total_seconds:.3f}s"
+            )
+
+        violations = profile.violations()
+        if violations:
+            if settings.query_budget_strict:
+                raise QueryBudgetExceeded("; ".join(violations))
+            for violation in violations:
+                logger.warning(violation)
+
+        return response
+
+class DatabaseMetricsMiddleware(BaseHTTPMiddleware):
+    """Attributes each request's query latencies to its route template for /metrics"""
+
+    async def dispatch(self, request: Request, call_next):
+        token = db_metrics.start_request()
+        try:
+            return await call_next(request)
+        finally:
+            # Templates ("/api/v1/projects/{project_id}") keep the label set bounded
+            route = request.scope.get("route")
+            db_metrics.finish_request(token, getattr(route, "path", "unmatched"))
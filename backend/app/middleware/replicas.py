@@ -0,0 +1,20 @@
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+import math
+from app.core.replicas import STICKY_COOKIE, STICKY_STATE, replica_router
+
+class ReplicaStickyMiddleware(BaseHTTPMiddleware):
+    """Hands a client that just wrote a cookie pinning its reads to the primary, whichever worker serves them"""
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        until = getattr(request.state, STICKY_STATE, None)
+        if until is not None:
+            response.set_cookie(
+                STICKY_COOKIE,
+                f"{until:.3f}",
+                max_age=math.ceil(replica_router.sticky_seconds),
+                httponly=True,
+                samesite="lax",
+            )
+        return response
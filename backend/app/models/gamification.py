@@ -3,16 +3,22 @@ Gamification Models
 Database models for user progression, badges, achievements, and unlocks
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, Text, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
 
 from ..core.database import Base
+from ..core.cache_invalidation import register_cache_tags
 
 class UserProgress(Base):
     __tablename__ = "user_progress"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Leaderboards
+        Index("idx_user_progress_total_xp", "total_xp"),
+        Index("idx_user_progress_current_streak", "current_streak"),
+        {'extend_existing': True}
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id"), unique=True, nullable=False)
@@ -52,7 +58,10 @@ class Badge(Base):
 
 class UserBadge(Base):
     __tablename__ = "user_badges"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("idx_user_badges_progress_earned_date", "user_progress_id", "earned_date"),
+        {'extend_existing': True}
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_progress_id = Column(String, ForeignKey("user_progress.id"), nullable=False)
@@ -66,6 +75,9 @@ class UserBadge(Base):
 
 class XPTransaction(Base):
     __tablename__ = "xp_transactions"
+    __table_args__ = (
+        Index("idx_xp_transactions_progress_created_at", "user_progress_id", "created_at"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_progress_id = Column(String, ForeignKey("user_progress.id"), nullable=False)
@@ -284,3 +296,14 @@ FEATURE_UNLOCKS = {
     "custom_projects": {"level": 12, "projects_completed": 20},
     "ai_assistant_advanced": {"level": 18, "projects_completed": 30}
 }
+
+
+# Cache tags invalidated when these rows are written
+register_cache_tags(
+    UserProgress, "leaderboard", "user-progress",
+    instance_tags=lambda progress: [f"user-progress:{progress.user_id}"]
+)
+register_cache_tags(UserBadge, "user-progress")
+register_cache_tags(XPTransaction, "user-progress")
+register_cache_tags(Badge, "badges")
+register_cache_tags(Leaderboard, "leaderboard")
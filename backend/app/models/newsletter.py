@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..core.database import Base
+from ..core.cache_invalidation import register_cache_tags
 
 class Newsletter(Base):
     __tablename__ = "newsletters"
@@ -39,6 +40,9 @@ class NewsletterSubscription(Base):
 
 class NewsletterLike(Base):
     __tablename__ = "newsletter_likes"
+    __table_args__ = (
+        Index("idx_newsletter_likes_newsletter_user", "newsletter_id", "user_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -51,6 +55,9 @@ class NewsletterLike(Base):
 
 class NewsletterComment(Base):
     __tablename__ = "newsletter_comments"
+    __table_args__ = (
+        Index("idx_newsletter_comments_newsletter_parent", "newsletter_id", "parent_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     newsletter_id = Column(Integer, ForeignKey("newsletters.id"), nullable=False)
@@ -64,3 +71,9 @@ class NewsletterComment(Base):
     newsletter = relationship("Newsletter", backref="comments")
     user = relationship("User", back_populates="newsletter_comments") 
     parent = relationship("NewsletterComment", remote_side=[id], backref="replies")
+
+
+# Cache tags invalidated when these rows are written
+register_cache_tags(Newsletter, "newsletters")
+register_cache_tags(NewsletterLike, "newsletters")
+register_cache_tags(NewsletterComment, "newsletters")
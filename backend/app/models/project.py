@@ -1,8 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Enum, JSON, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Enum, JSON, ForeignKey, Index, event, inspect
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 import enum
 from ..core.database import Base
+from ..core.cache_invalidation import register_cache_tags
+from ..core.domains import classify_project, sync_project_domains
 
 
 class ProjectDifficulty(str, enum.Enum):
@@ -27,8 +29,9 @@ class Project(Base):
     difficulty = Column(Enum(ProjectDifficulty), nullable=False)
     tags = Column(JSON, default=list)  # List of skill tags
     required_skills = Column(JSON, default=list)  # List of skill IDs
-    milestones = Column(JSON, default=list)  # List of milestone objects
-    test_spec = Column(JSON, nullable=True)  # Test specifications
+    # Heavy JSON only the detail view needs; loaded together on first access or via undefer_group("detail")
+    milestones = deferred(Column(JSON, default=list), group="detail")  # List of milestone objects
+    test_spec = deferred(Column(JSON, nullable=True), group="detail")  # Test specifications
     is_community = Column(Boolean, default=False)
     status = Column(Enum(ProjectStatus), default=ProjectStatus.DRAFT)
     estimated_hours = Column(Integer, nullable=True)
@@ -37,12 +40,49 @@ class Project(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        # Catalog: published projects (by difficulty) in (created_at, id) order, newest
+        # first, for the snapshot load and search pages
+        Index("idx_projects_status_difficulty_created_at_id", "status", "difficulty", "created_at", "id"),
+        Index("idx_projects_status_created_at_id", "status", "created_at", "id"),
+    )
+
     # Relationships
     submissions = relationship("Submission", back_populates="project")
     hints = relationship("Hint", back_populates="project")
     teams = relationship("Team", back_populates="project")
 
 
+class ProjectDomain(Base):
+    """Domains a project belongs to, classified at write time (see app.core.domains)"""
+    __tablename__ = "project_domains"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    domain = Column(String, primary_key=True)
+
+    __table_args__ = (
+        # Catalog domain filter: equality on domain, then join to projects
+        Index("idx_project_domains_domain_project", "domain", "project_id"),
+    )
+
+
+class ProjectFacetCount(Base):
+    """Published projects per facet value, maintained on write (see app.core.facets)"""
+    __tablename__ = "project_facet_counts"
+
+    facet = Column(String, primary_key=True)  # difficulty | domain | tag | hours
+    value = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class ProjectCatalogVersion(Base):
+    """One row counting catalog writes, bumped in the writing transaction (see app.core.catalog_version)"""
+    __tablename__ = "project_catalog_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
 class Track(Base):
     __tablename__ = "tracks"
 
@@ -54,3 +94,21 @@ class Track(Base):
     ordering = Column(JSON, default=list)  # List of project IDs in order
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+# Cache tags invalidated when these rows are written
+register_cache_tags(Project, "projects")
+register_cache_tags(Track, "tracks")
+
+
+# Classify on write so the domain filter never has to scan text
+@event.listens_for(Project, "after_insert")
+def _classify_new_project(mapper, connection, target) -> None:
+    sync_project_domains(connection, target.id, classify_project(target.title, target.description, target.tags))
+
+
+@event.listens_for(Project, "after_update")
+def _reclassify_project(mapper, connection, target) -> None:
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in ("title", "description", "tags")):
+        sync_project_domains(connection, target.id, classify_project(target.title, target.description, target.tags))
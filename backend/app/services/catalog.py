@@ -0,0 +1,380 @@
+"""
+In-process snapshot of the published project catalog
+
+The catalog is small, read-heavy and rarely written, so each worker keeps it in
+memory: summary rows in catalog order (newest first) plus inverted indexes from
+difficulty, domain, tag and estimated-hours bucket to row positions. Filtering
+is a posting-list intersection and paging a slice, with no database round trip.
+
+A snapshot is never modified. It records the catalog version (see
+app.core.catalog_version) it was read at; the store re-reads the version every
+``catalog_snapshot_check_interval`` seconds, and at once when the "projects"
+cache tag is invalidated, and builds a replacement in the background when the
+snapshot is behind it or older than ``catalog_snapshot_max_age``.
+
+With ``catalog_snapshot_file`` (see app.services.catalog_file) workers serve the
+memory-mapped file; the one holding the file's lock rebuilds and republishes it,
+the others map the new file at their next check.
+"""
+
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+import asyncio
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import desc, select
+
+from ..core.cache import cache
+from ..core.catalog_version import catalog_version_query
+from ..core.config import settings
+from ..core.domains import domain_keywords
+from ..core.facets import hours_bucket
+from ..core.pagination import as_utc
+from ..core.replicas import route_session
+from ..models.project import Project, ProjectDomain, ProjectStatus
+
+logger = logging.getLogger(__name__)
+
+# List views select only these columns as plain rows: no milestones/test_spec JSON,
+# no ORM instances or identity-map bookkeeping
+PROJECT_SUMMARY_COLUMNS = (
+    Project.id,
+    Project.title,
+    Project.brief,
+    Project.description,
+    Project.difficulty,
+    Project.tags,
+    Project.required_skills,
+    Project.estimated_hours,
+    Project.max_team_size,
+    Project.is_community,
+    Project.created_at,
+)
+
+INDEXED_FIELDS = ("difficulty", "domain", "tag", "hours")
+
+
+def project_summary(row) -> Dict[str, Any]:
+    """List-view dict for a PROJECT_SUMMARY_COLUMNS row"""
+    return {
+        "id": row.id,
+        "title": row.title,
+        "brief": row.brief,
+        "description": row.description,
+        "difficulty": row.difficulty.value,
+        "tags": row.tags,
+        "required_skills": row.required_skills,
+        "tech_stack": ", ".join(row.tags) if row.tags else "",
+        "estimated_hours": row.estimated_hours,
+        "max_team_size": row.max_team_size,
+        "is_community": row.is_community,
+        "created_at": row.created_at.isoformat() if row.created_at else None
+    }
+
+
+def catalog_queries():
+    """(published summary rows in catalog order, (project_id, domain) rows)"""
+    published = Project.status == ProjectStatus.PUBLISHED
+    rows = select(*PROJECT_SUMMARY_COLUMNS).where(published).order_by(
+        desc(Project.created_at), desc(Project.id)
+    )
+    domains = select(ProjectDomain.project_id, ProjectDomain.domain).join(
+        Project, Project.id == ProjectDomain.project_id
+    ).where(published)
+    return rows, domains
+
+
+def catalog_sort_key(item: Dict[str, Any]) -> Tuple[bool, datetime, int]:
+    # Rows without created_at sort last, after every dated row
+    created_at = item["created_at"]
+    if not created_at:
+        return (False, datetime.min.replace(tzinfo=timezone.utc), item["id"])
+    return (True, as_utc(datetime.fromisoformat(created_at)), item["id"])
+
+
+class CatalogSnapshot:
+    """Immutable catalog: items in order plus {field: {value: positions}} postings"""
+
+    def __init__(self, items: Iterable[Dict[str, Any]], domains: Iterable[Tuple[int, str]], version: int = 0):
+        # Newest first, whatever order the database returned
+        self.items: Tuple[Dict[str, Any], ...] = tuple(sorted(items, key=catalog_sort_key, reverse=True))
+        self.version = version
+        self.built_at = time.time()
+        self._keys = [catalog_sort_key(item) for item in self.items]
+        position_of = {item["id"]: position for position, item in enumerate(self.items)}
+
+        postings: Dict[str, Dict[str, set]] = {field: {} for field in INDEXED_FIELDS}
+        for position, item in enumerate(self.items):
+            postings["difficulty"].setdefault(item["difficulty"], set()).add(position)
+            for tag in {tag.lower() for tag in item["tags"] or [] if isinstance(tag, str)}:
+                postings["tag"].setdefault(tag, set()).add(position)
+            bucket = hours_bucket(item["estimated_hours"])
+            if bucket:
+                postings["hours"].setdefault(bucket, set()).add(position)
+        for project_id, domain in domains:
+            if project_id in position_of:
+                postings["domain"].setdefault(domain, set()).add(position_of[project_id])
+
+        self.postings: Dict[str, Dict[str, FrozenSet[int]]] = {
+            field: {value: frozenset(positions) for value, positions in values.items()}
+            for field, values in postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _start_after(self, after: Tuple[datetime, int]) -> int:
+        """First position whose (created_at, id) sorts after the cursor in catalog order"""
+        created_at, row_id = after
+        cursor = (True, as_utc(created_at), row_id)
+        low, high = 0, len(self._keys)
+        while low < high:
+            middle = (low + high) // 2
+            # Descending order: a row comes later when its key is smaller
+            if self._keys[middle] < cursor:
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def _keyword_positions(self, keyword: str) -> FrozenSet[int]:
+        # Domain names outside the configured map match as a plain keyword, like the SQL fallback
+        keyword = keyword.lower()
+        return frozenset(
+            position for position, item in enumerate(self.items)
+            if keyword in (item["title"] or "").lower()
+            or keyword in (item["description"] or "").lower()
+            or keyword in ", ".join(item["tags"] or []).lower()
+        )
+
+    def _positions(
+        self,
+        difficulty: Optional[str],
+        domain: Optional[str],
+        tag: Optional[str],
+        hours: Optional[str]
+    ) -> Sequence[int]:
+        """Positions matching every filter, in catalog order; "all" or None leaves a filter off"""
+        filters: List[FrozenSet[int]] = []
+        for field, value in (("difficulty", difficulty), ("tag", tag), ("hours", hours)):
+            if value and value != 'all':
+                filters.append(self.postings[field].get(value.lower() if field == "tag" else value, frozenset()))
+        if domain and domain != 'all':
+            if domain in domain_keywords():
+                filters.append(self.postings["domain"].get(domain, frozenset()))
+            else:
+                filters.append(self._keyword_positions(domain))
+
+        if not filters:
+            return range(len(self.items))
+        filters.sort(key=len)
+        smallest, rest = filters[0], filters[1:]
+        return sorted(position for position in smallest if all(position in other for other in rest))
+
+    def total(
+        self,
+        difficulty: Optional[str] = None,
+        domain: Optional[str] = None,
+        tag: Optional[str] = None,
+        hours: Optional[str] = None
+    ) -> int:
+        """How many projects match the filters"""
+        return len(self._positions(difficulty, domain, tag, hours))
+
+    def select(
+        self,
+        difficulty: Optional[str] = None,
+        domain: Optional[str] = None,
+        tag: Optional[str] = None,
+        hours: Optional[str] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Filtered page in catalog order"""
+        positions = self._positions(difficulty, domain, tag, hours)
+        start = 0
+        if after is not None:
+            start = bisect_left(positions, self._start_after(after))
+        start += offset or 0
+        end = start + limit if limit else None
+        return [self.items[position] for position in positions[start:end]]
+
+
+def newer(snapshot: CatalogSnapshot, than: Optional[CatalogSnapshot]) -> bool:
+    """Whether snapshot reflects at least as much of the catalog as than"""
+    return than is None or (snapshot.version, snapshot.built_at) >= (than.version, than.built_at)
+
+
+async def read_version(session_factory) -> int:
+    async with session_factory() as db:
+        # Same routing as load_snapshot, so a lagging replica does not look permanently ahead of it
+        route_session(db, read_only=True)
+        return await db.scalar(catalog_version_query()) or 0
+
+
+async def load_snapshot(session_factory) -> CatalogSnapshot:
+    rows_query, domains_query = catalog_queries()
+    async with session_factory() as db:
+        route_session(db, read_only=True)
+        # Read first: a write committed after it only makes the snapshot look older than it is
+        version = await db.scalar(catalog_version_query()) or 0
+        rows = (await db.execute(rows_query)).all()
+        domains = (await db.execute(domains_query)).all()
+    return CatalogSnapshot((project_summary(row) for row in rows), domains, version)
+
+
+class CatalogStore:
+    """Holds the current snapshot; rebuilds it once it falls behind the catalog version and swaps the reference"""
+
+    def __init__(self, path: Optional[str] = None, check_interval: float = 1.0, max_age: float = 300.0):
+        self._snapshot: Optional[CatalogSnapshot] = None
+        # Backstop for writes that bypass the ORM and so the version (bulk SQL)
+        self.max_age = max_age
+        self._building: Optional[asyncio.Task] = None
+        # Latest catalog version read, when, and invalidations since
+        self.check_interval = check_interval
+        self._version = 0
+        self._checked_at = float("-inf")
+        self._generation = 0
+        self._checked_generation = 0
+        self._generation_lock = threading.Lock()
+        # Shared snapshot file and the identity of the version last mapped
+        self.path = path
+        self._file_key = None
+
+    def invalidate(self) -> None:
+        """A write was committed somewhere: re-read the version on the next get()"""
+        # Runs on request threads and the cache listener thread
+        with self._generation_lock:
+            self._generation += 1
+
+    @property
+    def snapshot(self) -> Optional[CatalogSnapshot]:
+        return self._snapshot
+
+    def _outdated(self, snapshot: CatalogSnapshot) -> bool:
+        return snapshot.version < self._version or time.time() - snapshot.built_at > self.max_age
+
+    def _swap(self, snapshot: CatalogSnapshot) -> None:
+        # A build that started earlier can finish later; keep whichever saw more writes
+        if newer(snapshot, self._snapshot):
+            self._snapshot = snapshot
+
+    async def get(self, session_factory) -> CatalogSnapshot:
+        """Current snapshot.
+
+        Once it is outdated a single rebuild starts in the background and callers
+        keep getting the previous snapshot until the replacement is swapped in
+        (or, with a shared file, published by whichever worker holds its lock);
+        only the first call of a worker waits.
+        """
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval or self._checked_generation != self._generation:
+            self._checked_at = now
+            self._checked_generation = self._generation
+            await self._check(session_factory)
+        snapshot = self._snapshot
+        if snapshot is None:
+            return await self.refresh(session_factory)
+        return snapshot
+
+    async def _check(self, session_factory) -> None:
+        self._version = max(self._version, await read_version(session_factory))
+        if self.path:
+            self._remap()
+        if self._snapshot is not None and self._outdated(self._snapshot):
+            self._rebuilding(session_factory)
+
+    async def refresh(self, session_factory) -> CatalogSnapshot:
+        """Wait for a rebuild (the running one, or a new one) and return the result"""
+        # Shielded: a caller giving up must not cancel the rebuild the others are waiting on
+        await asyncio.shield(self._rebuilding(session_factory))
+        return self._snapshot
+
+    def _remap(self) -> None:
+        """Map the shared file when it was replaced by a build at least as new as the current snapshot"""
+        from .catalog_file import MappedCatalogSnapshot, file_key
+
+        try:
+            key = file_key(os.stat(self.path))
+        except FileNotFoundError:
+            return
+        if key == self._file_key:
+            return
+        self._file_key = key
+        try:
+            # Requests holding the previous mapping keep it until they finish
+            mapped = MappedCatalogSnapshot(self.path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Catalog snapshot file {self.path} unusable: {e}")
+            return
+        # A worker with nothing to serve yet waits for a current build rather than start on an old file
+        if newer(mapped, self._snapshot) and (self._snapshot is not None or not self._outdated(mapped)):
+            self._snapshot = mapped
+            logger.info(f"Catalog snapshot: mapped {len(mapped)} projects (version {mapped.version}) from {self.path}")
+
+    def _rebuilding(self, session_factory) -> asyncio.Task:
+        """The running rebuild; starts one when none is running, so there is at most one at a time"""
+        building = self._building
+        if building is None or building.done() or building.get_loop() is not asyncio.get_running_loop():
+            building = self._building = asyncio.ensure_future(self._rebuild(session_factory))
+            building.add_done_callback(_log_rebuild_failure)
+        return building
+
+    async def _rebuild(self, session_factory) -> None:
+        if not self.path:
+            await self._build(session_factory)
+            return
+
+        from .catalog_file import acquire_publisher_lock, write_catalog_file
+
+        if self._snapshot is None:
+            # Nothing to serve meanwhile: wait for the worker publishing now, then use its file
+            lock = await asyncio.to_thread(acquire_publisher_lock, self.path)
+        else:
+            lock = acquire_publisher_lock(self.path, wait=False)
+            if lock is None:
+                # Another worker is publishing; the next check maps its file
+                return
+        try:
+            self._remap()
+            if self._snapshot is not None and not self._outdated(self._snapshot):
+                return
+            snapshot = await self._build(session_factory)
+            try:
+                await asyncio.to_thread(write_catalog_file, self.path, snapshot)
+            except OSError as e:
+                logger.error(f"Catalog snapshot file {self.path} not written: {e}")
+                return
+            # Serve the shared pages rather than this worker's private copy
+            self._remap()
+        finally:
+            os.close(lock)
+
+    async def _build(self, session_factory) -> CatalogSnapshot:
+        started = time.perf_counter()
+        snapshot = await load_snapshot(session_factory)
+        self._swap(snapshot)
+        logger.info(
+            f"Catalog snapshot: {len(snapshot)} projects (version {snapshot.version}) "
+            f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+        return snapshot
+
+
+def _log_rebuild_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Catalog snapshot rebuild failed: {task.exception()}")
+
+
+catalog = CatalogStore(
+    settings.catalog_snapshot_file,
+    settings.catalog_snapshot_check_interval,
+    settings.catalog_snapshot_max_age
+)
+cache.add_tag_listener("projects", catalog.invalidate)
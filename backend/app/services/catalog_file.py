@@ -0,0 +1,339 @@
+"""
+Memory-mapped catalog snapshot file shared by all workers
+
+The seed scripts and the rebuild job serialize the catalog once:
+
+    python -m app.services.catalog_file
+
+Workers mmap the file read-only, so the pages are shared through the OS page
+cache instead of every worker building its own copy. Rows are fixed-width
+column arrays read in place; text (titles, tags, difficulty names...) lives
+once in an interned string table and is decoded only for the rows a request
+returns. Posting lists are sorted row positions, probed by binary search.
+
+Layout (native byte order, every section 8-byte aligned):
+
+    header      magic, byte order, row count, catalog version, build time
+    sections    (offset, byte length) per entry of SECTIONS
+    columns     id (q); title, brief, description, difficulty, created_at (I,
+                string refs); tags, required_skills ((start, length) pairs into
+                lists); estimated_hours, max_team_size (q); is_community (b)
+    lists       string refs of tag / skill lists
+    strings     string_offsets (Q, one per string plus the end) and UTF-8 bytes
+    postings    posting_index (field, value ref, start, length) into postings
+
+Replacing the file (write to a temporary file, then rename) is the only way it
+changes; readers notice the new inode and map it, while requests still holding
+the old snapshot keep reading the old pages. Only the process holding the lock
+file next to it (``<path>.lock``) replaces it, so a write makes one worker
+rebuild and publish while the others keep serving their current snapshot.
+"""
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+
+try:
+    import fcntl
+except Exception:  # pragma: no cover - not on Windows
+    fcntl = None  # type: ignore
+
+from ..core.catalog_version import read_catalog_version
+from ..core.config import settings
+from .catalog import INDEXED_FIELDS, CatalogSnapshot, catalog_sort_key, catalog_queries, project_summary
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"WBCATLG2"
+BYTE_ORDER = b"LE" if sys.byteorder == "little" else b"BE"
+HEADER = struct.Struct("=8s2s2xIqd")
+SECTION = struct.Struct("=QQ")
+
+SNAPSHOT_FILE_MODE = 0o644
+
+NULL_REF = 0xFFFFFFFF
+NULL_INT = -(2 ** 63)
+
+# section -> array typecode (also the memoryview cast format)
+SECTIONS: Dict[str, str] = {
+    "id": "q",
+    "title": "I",
+    "brief": "I",
+    "description": "I",
+    "difficulty": "I",
+    "created_at": "I",
+    "tags": "I",
+    "required_skills": "I",
+    "estimated_hours": "q",
+    "max_team_size": "q",
+    "is_community": "b",
+    "lists": "I",
+    "string_offsets": "Q",
+    "strings": "B",
+    "posting_index": "I",
+    "postings": "I",
+}
+STRING_COLUMNS = ("title", "brief", "description", "difficulty", "created_at")
+LIST_COLUMNS = ("tags", "required_skills")
+INT_COLUMNS = ("estimated_hours", "max_team_size")
+
+
+def file_key(stat: os.stat_result) -> Tuple[int, int, int, int]:
+    """Identity of one version of the file; changes whenever it is replaced"""
+    return (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def encode_catalog(snapshot: CatalogSnapshot) -> bytes:
+    """Serialize a snapshot; rows keep its catalog order"""
+    strings: Dict[str, int] = {}
+
+    def ref(value: Any) -> int:
+        if value is None:
+            return NULL_REF
+        return strings.setdefault(str(value), len(strings))
+
+    columns = {name: array(typecode) for name, typecode in SECTIONS.items()}
+    for item in snapshot.items:
+        columns["id"].append(item["id"])
+        for name in STRING_COLUMNS:
+            columns[name].append(ref(item[name]))
+        for name in LIST_COLUMNS:
+            values = item[name]
+            if values is None:
+                columns[name].extend((NULL_REF, 0))
+            else:
+                columns[name].extend((len(columns["lists"]), len(values)))
+                columns["lists"].extend(ref(value) for value in values)
+        for name in INT_COLUMNS:
+            columns[name].append(NULL_INT if item[name] is None else item[name])
+        columns["is_community"].append(-1 if item["is_community"] is None else int(item["is_community"]))
+
+    for code, field in enumerate(INDEXED_FIELDS):
+        for value, positions in sorted(snapshot.postings[field].items()):
+            columns["posting_index"].extend((code, ref(value), len(columns["postings"]), len(positions)))
+            columns["postings"].extend(sorted(positions))
+
+    encoded = [value.encode("utf-8") for value in strings]
+    offset = 0
+    for value in encoded:
+        columns["string_offsets"].append(offset)
+        offset += len(value)
+    columns["string_offsets"].append(offset)
+    columns["strings"].frombytes(b"".join(encoded))
+
+    position = HEADER.size + SECTION.size * len(SECTIONS)
+    table, chunks = [], []
+    for name in SECTIONS:
+        padding = -position % 8
+        data = columns[name].tobytes()
+        chunks.append(b"\0" * padding + data)
+        position += padding
+        table.append(SECTION.pack(position, len(data)))
+        position += len(data)
+
+    header = HEADER.pack(MAGIC, BYTE_ORDER, len(snapshot), snapshot.version, snapshot.built_at)
+    return header + b"".join(table) + b"".join(chunks)
+
+
+def write_catalog_file(path: str, snapshot: CatalogSnapshot) -> None:
+    """Atomically replace the snapshot file: readers see the old or the new version, never a partial one"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temporary = tempfile.mkstemp(dir=directory, prefix=".catalog-", suffix=".tmp")
+    try:
+        # mkstemp creates 0600; readers under another UID must be able to map it
+        os.fchmod(fd, SNAPSHOT_FILE_MODE)
+        with os.fdopen(fd, "wb") as f:
+            f.write(encode_catalog(snapshot))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.unlink(temporary)
+        raise
+
+
+def acquire_publisher_lock(path: str, wait: bool = True) -> Optional[int]:
+    """Exclusive lock on <path>.lock; its holder is the one process replacing the file.
+
+    Returns the descriptor (os.close() releases it, as does the process exiting),
+    or None without waiting when another process holds the lock.
+    """
+    fd = os.open(path + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+    if fcntl is None:
+        return fd
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    except BaseException:
+        os.close(fd)
+        raise
+    return fd
+
+
+class _Positions:
+    """Sorted row positions read in place; membership by binary search"""
+
+    __slots__ = ("_view",)
+
+    def __init__(self, view: memoryview):
+        self._view = view
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def __iter__(self):
+        return iter(self._view)
+
+    def __contains__(self, position: int) -> bool:
+        index = bisect_left(self._view, position)
+        return index < len(self._view) and self._view[index] == position
+
+
+class _Rows(Sequence):
+    """Rows of a mapped snapshot as list-view dicts, decoded on access"""
+
+    def __init__(self, snapshot: "MappedCatalogSnapshot"):
+        self._snapshot = snapshot
+
+    def __len__(self) -> int:
+        return self._snapshot.count
+
+    def __getitem__(self, position: int) -> Dict[str, Any]:
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return self._snapshot.row(position)
+
+
+class _Keys(Sequence):
+    """Catalog sort keys of a mapped snapshot, for cursor bisection"""
+
+    def __init__(self, snapshot: "MappedCatalogSnapshot"):
+        self._snapshot = snapshot
+
+    def __len__(self) -> int:
+        return self._snapshot.count
+
+    def __getitem__(self, position: int) -> Tuple[bool, Any, int]:
+        columns = self._snapshot.columns
+        return catalog_sort_key({
+            "id": columns["id"][position],
+            "created_at": self._snapshot.string(columns["created_at"][position]),
+        })
+
+
+class MappedCatalogSnapshot(CatalogSnapshot):
+    """CatalogSnapshot over a mapped file: same select(), no per-worker copy of the rows"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.file_key = file_key(os.fstat(f.fileno()))
+            # The mapping outlives the descriptor; a replaced file stays readable until unmapped
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(self._map)
+        magic, byte_order, self.count, self.version, self.built_at = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError(f"Not a catalog snapshot: {path}")
+        if byte_order != BYTE_ORDER:
+            raise ValueError(f"Catalog snapshot {path} was written with the other byte order")
+
+        self.columns: Dict[str, memoryview] = {}
+        for index, (name, typecode) in enumerate(SECTIONS.items()):
+            offset, length = SECTION.unpack_from(view, HEADER.size + SECTION.size * index)
+            if offset + length > len(view):
+                raise ValueError(f"Catalog snapshot {path} is truncated")
+            self.columns[name] = view[offset:offset + length].cast(typecode)
+
+        self.items = _Rows(self)
+        self._keys = _Keys(self)
+
+        postings: Dict[str, Dict[str, _Positions]] = {field: {} for field in INDEXED_FIELDS}
+        posting_index = self.columns["posting_index"]
+        for entry in range(0, len(posting_index), 4):
+            code, value, start, length = posting_index[entry:entry + 4]
+            postings[INDEXED_FIELDS[code]][self.string(value)] = _Positions(
+                self.columns["postings"][start:start + length]
+            )
+        self.postings = postings
+
+    def __len__(self) -> int:
+        return self.count
+
+    def string(self, ref: int) -> Optional[str]:
+        if ref == NULL_REF:
+            return None
+        offsets = self.columns["string_offsets"]
+        return str(self.columns["strings"][offsets[ref]:offsets[ref + 1]], "utf-8")
+
+    def _list(self, name: str, position: int) -> Optional[List[str]]:
+        start, length = self.columns[name][2 * position:2 * position + 2]
+        if start == NULL_REF:
+            return None
+        return [self.string(ref) for ref in self.columns["lists"][start:start + length]]
+
+    def row(self, position: int) -> Dict[str, Any]:
+        columns = self.columns
+        tags = self._list("tags", position)
+        estimated_hours, max_team_size = (
+            None if columns[name][position] == NULL_INT else columns[name][position]
+            for name in INT_COLUMNS
+        )
+        is_community = columns["is_community"][position]
+        return {
+            "id": columns["id"][position],
+            "title": self.string(columns["title"][position]),
+            "brief": self.string(columns["brief"][position]),
+            "description": self.string(columns["description"][position]),
+            "difficulty": self.string(columns["difficulty"][position]),
+            "tags": tags,
+            "required_skills": self._list("required_skills", position),
+            "tech_stack": ", ".join(tags) if tags else "",
+            "estimated_hours": estimated_hours,
+            "max_team_size": max_team_size,
+            "is_community": None if is_community < 0 else bool(is_community),
+            "created_at": self.string(columns["created_at"][position]),
+        }
+
+
+def rebuild_catalog_file(engine, path: Optional[str] = None) -> int:
+    """Write the catalog snapshot file from the database; returns the row count (0 when disabled)"""
+    path = path or settings.catalog_snapshot_file
+    if not path:
+        return 0
+    started = time.perf_counter()
+    rows_query, domains_query = catalog_queries()
+    lock = acquire_publisher_lock(path)
+    try:
+        with engine.connect() as conn:
+            # Read first: a write committed after it only makes the file look older than it is
+            version = read_catalog_version(conn)
+            rows = conn.execute(rows_query).all()
+            domains = conn.execute(domains_query).all()
+        snapshot = CatalogSnapshot((project_summary(row) for row in rows), domains, version)
+        write_catalog_file(path, snapshot)
+    finally:
+        os.close(lock)
+    logger.info(
+        f"Catalog snapshot file {path}: {len(snapshot)} projects in {(time.perf_counter() - started) * 1000:.1f}ms"
+    )
+    return len(snapshot)
+
+
+if __name__ == "__main__":
+    from ..core.database import engine
+    from ..core.replicas import replica_router
+
+    print(f"Wrote {rebuild_catalog_file(replica_router.writers.get(engine, engine))} projects to {settings.catalog_snapshot_file}")
@@ -9,6 +9,7 @@ from app.core.database import SessionLocal, engine, Base
 from app.models.project import Project, ProjectDifficulty, ProjectStatus
 from app.models.entities import Field
 from app.models import *  # Import all models to ensure tables are created
+from app.services.catalog_file import rebuild_catalog_file
 
 # Industry problem categories with real-world applications
 INDUSTRY_PROBLEMS = {
@@ -344,6 +345,9 @@ def generate_750_projects():
         db.commit()
         print(f"✅ Successfully created {projects_created} innovative projects!")
         
+        # Workers map this file instead of each loading the catalog
+        rebuild_catalog_file(engine)
+        
         # Show distribution
         beginner_count = db.query(Project).filter(Project.difficulty == ProjectDifficulty.BEGINNER).count()
         intermediate_count = db.query(Project).filter(Project.difficulty == ProjectDifficulty.INTERMEDIATE).count()
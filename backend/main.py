@@ -1,10 +1,20 @@
-from fastapi import FastAPI
+import secrets
+from fastapi import FastAPI, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.core.cache import cache
 from app.core.database import Base, engine
+from app.core.db_metrics import db_metrics
+from app.core.replicas import replica_router
+from app.core.domains import ensure_project_domains
+from app.core.facets import ensure_facet_counts
+from app.core.search import install_project_search
 from app.middleware.security import SecurityMiddleware, InputValidationMiddleware, CSRFMiddleware, LoggingMiddleware
+from app.middleware.profiling import DatabaseMetricsMiddleware, QueryProfilingMiddleware
+from app.middleware.replicas import ReplicaStickyMiddleware
 # Import all models so they get created in the database
 from app.models import *
 
@@ -21,8 +31,38 @@ app = FastAPI(
 @app.on_event("startup")
 def create_database_tables() -> None:
     Base.metadata.create_all(bind=engine)
+    writer = replica_router.writers.get(engine, engine)
+    # Full-text search objects for the project catalog (FTS5 table or tsvector column)
+    install_project_search(writer)
+    # Tag a catalog seeded before project_domains existed, then count its facets
+    ensure_project_domains(writer)
+    ensure_facet_counts(writer)
+
+@app.on_event("startup")
+def start_cache_invalidation_listener() -> None:
+    # Evict this worker's in-process cache entries when another worker invalidates them
+    cache.start_invalidation_listener()
+
+@app.on_event("shutdown")
+def stop_cache_invalidation_listener() -> None:
+    cache.stop_invalidation_listener()
+
+@app.on_event("startup")
+def start_replica_health_checks() -> None:
+    # Reads fall back to the primary while a replica fails its ping
+    replica_router.start_health_checks()
+
+@app.on_event("shutdown")
+def stop_replica_health_checks() -> None:
+    replica_router.stop_health_checks()
 
 # Security middleware (order matters - add in reverse order)
+if settings.query_profiling:
+    app.add_middleware(QueryProfilingMiddleware)
+if settings.db_metrics:
+    app.add_middleware(DatabaseMetricsMiddleware)
+if replica_router.enabled:
+    app.add_middleware(ReplicaStickyMiddleware)
 app.add_middleware(LoggingMiddleware)
 app.add_middleware(CSRFMiddleware)
 app.add_middleware(InputValidationMiddleware)
@@ -51,7 +91,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
-    expose_headers=["X-CSRF-Token"]
+    expose_headers=["X-CSRF-Token", "X-Next-Cursor"]
 )
 
 # Include API router
@@ -77,6 +117,23 @@ async def test_endpoint():
 async def simple_endpoint():
     return {"message": "Simple endpoint working", "data": [1, 2, 3]}
 
+async def metrics(request: Request):
+    """Prometheus scrape endpoint"""
+    # Cache keys, routes and pool sizes are not public: no token configured means no access
+    if not settings.metrics_token:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Metrics token not configured")
+    # Bytes: compare_digest raises TypeError on non-ASCII str, which a junk header can carry
+    supplied = request.headers.get("authorization", "").encode("utf-8")
+    if not secrets.compare_digest(supplied, f"Bearer {settings.metrics_token}".encode("utf-8")):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    body = cache.render_metrics()
+    if settings.db_metrics:
+        body += db_metrics.render_prometheus()
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+if settings.metrics_enabled:
+    app.add_api_route("/metrics", metrics, response_class=PlainTextResponse)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
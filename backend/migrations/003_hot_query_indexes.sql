@@ -0,0 +1,64 @@
+-- WAY BIGGER Database Migration: Indexes for the hot query shapes
+-- Matches the Index(...) declarations on the models; `python -m app.core.query_plans`
+-- verifies afterwards that none of the hot queries falls back to a sequential scan.
+--
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so apply this file
+-- without --single-transaction (and without BEGIN/COMMIT):
+--   psql "$DATABASE_URL" -f migrations/003_hot_query_indexes.sql
+-- A failed concurrent build leaves an INVALID index behind; drop it and re-run.
+
+-- ==============================================
+-- 1. PROJECT CATALOG
+-- ==============================================
+
+-- Published projects filtered by difficulty, newest first
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_projects_status_difficulty_created_at
+    ON projects(status, difficulty, created_at);
+
+-- ==============================================
+-- 2. PROGRESS PAGES
+-- ==============================================
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_xp_transactions_progress_created_at
+    ON xp_transactions(user_progress_id, created_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_badges_progress_earned_date
+    ON user_badges(user_progress_id, earned_date);
+
+-- The composites above lead with user_progress_id, so the single-column indexes
+-- from 001 only cost writes now
+DROP INDEX CONCURRENTLY IF EXISTS idx_xp_transactions_user_progress_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_user_badges_user_progress_id;
+
+-- ==============================================
+-- 3. NEWSLETTERS
+-- ==============================================
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_newsletter_comments_newsletter_parent
+    ON newsletter_comments(newsletter_id, parent_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_newsletter_likes_newsletter_user
+    ON newsletter_likes(newsletter_id, user_id);
+
+-- ==============================================
+-- 4. COLLABORATION CHAT
+-- ==============================================
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chat_messages_session_created_at
+    ON chat_messages(session_id, created_at);
+
+-- ==============================================
+-- 5. LEADERBOARDS
+-- ==============================================
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_progress_total_xp
+    ON user_progress(total_xp);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_progress_current_streak
+    ON user_progress(current_streak);
+
+-- Refresh planner statistics so the new indexes are considered straight away
+ANALYZE projects;
+ANALYZE xp_transactions;
+ANALYZE user_badges;
+ANALYZE newsletter_comments;
+ANALYZE newsletter_likes;
+ANALYZE chat_messages;
+ANALYZE user_progress;
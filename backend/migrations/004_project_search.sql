@@ -0,0 +1,30 @@
+-- WAY BIGGER Database Migration: Full-text search for the project catalog
+-- GET /projects?search= matches against a weighted tsvector (title > brief/tags > description)
+-- through a GIN index instead of LIKE '%term%' over every row; see app/core/search.py.
+-- SQLite development databases get an FTS5 table instead, created on startup.
+--
+-- Requires PostgreSQL 12+ (generated columns). Adding a STORED generated column rewrites
+-- the table once; the index build below does not block writes.
+--   psql "$DATABASE_URL" -f migrations/004_project_search.sql
+
+-- ==============================================
+-- 1. SEARCH VECTOR
+-- ==============================================
+
+-- Kept in sync by PostgreSQL on every insert/update of the source columns
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(brief, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(tags::text, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    ) STORED;
+
+-- ==============================================
+-- 2. GIN INDEX
+-- ==============================================
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_projects_search_vector
+    ON projects USING GIN (search_vector);
+
+ANALYZE projects;
@@ -0,0 +1,21 @@
+-- WAY BIGGER Database Migration: Precomputed project domains
+-- The catalog's ?domain= filter becomes an indexed equality lookup on project_domains
+-- instead of ~30 LIKE '%keyword%' clauses over title, description and tags.
+-- Rows are written by the application whenever a project is inserted or its text changes;
+-- after applying this file, classify the existing catalog once:
+--   psql "$DATABASE_URL" -f migrations/005_project_domains.sql
+--   python -m app.core.domains
+
+-- ==============================================
+-- 1. PROJECT DOMAINS
+-- ==============================================
+
+CREATE TABLE IF NOT EXISTS project_domains (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    domain VARCHAR NOT NULL,
+    PRIMARY KEY (project_id, domain)
+);
+
+-- Domain filter: all projects in a domain, then join to projects
+CREATE INDEX IF NOT EXISTS idx_project_domains_domain_project
+    ON project_domains(domain, project_id);
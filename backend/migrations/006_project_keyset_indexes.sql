@@ -0,0 +1,21 @@
+-- WAY BIGGER Database Migration: Keyset order for the project catalog
+-- Catalog pages are ordered by (created_at, id), newest first: the snapshot that serves
+-- GET /projects?cursor= loads published projects in that order, and search pages by it.
+-- These indexes end in that key so both read it straight from the index instead of sorting.
+-- Apply without --single-transaction (CONCURRENTLY):
+--   psql "$DATABASE_URL" -f migrations/006_project_keyset_indexes.sql
+
+-- ==============================================
+-- 1. CATALOG PAGES
+-- ==============================================
+
+-- All published projects, newest first (snapshot load)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_projects_status_created_at_id
+    ON projects(status, created_at, id);
+
+-- Filtered by difficulty; supersedes the three-column index from 003
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_projects_status_difficulty_created_at_id
+    ON projects(status, difficulty, created_at, id);
+DROP INDEX CONCURRENTLY IF EXISTS idx_projects_status_difficulty_created_at;
+
+ANALYZE projects;
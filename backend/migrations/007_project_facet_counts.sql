@@ -0,0 +1,18 @@
+-- WAY BIGGER Database Migration: Maintained facet counts for the project catalog
+-- GET /projects/facets and /projects/stats read these rows instead of running GROUP BY
+-- queries per request. The application adjusts them in the same transaction as any
+-- project write; after applying this file (and 005), build them once:
+--   psql "$DATABASE_URL" -f migrations/007_project_facet_counts.sql
+--   python -m app.core.facets
+
+-- ==============================================
+-- 1. FACET COUNTS
+-- ==============================================
+
+-- facet: difficulty | domain | tag | hours; counts cover published projects only
+CREATE TABLE IF NOT EXISTS project_facet_counts (
+    facet VARCHAR NOT NULL,
+    value VARCHAR NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (facet, value)
+);
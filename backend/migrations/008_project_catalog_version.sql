@@ -0,0 +1,15 @@
+-- WAY BIGGER Database Migration: Catalog version for the shared catalog snapshot
+-- Every transaction that writes projects increments this counter; workers compare
+-- it with the version their in-memory snapshot or the shared snapshot file was
+-- read at, so a write from any process makes them rebuild or remap.
+--   psql "$DATABASE_URL" -f migrations/008_project_catalog_version.sql
+
+-- ==============================================
+-- 1. CATALOG VERSION
+-- ==============================================
+
+-- A single row (id = 1), created by the first write
+CREATE TABLE IF NOT EXISTS project_catalog_version (
+    id INTEGER PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
@@ -8,6 +8,7 @@ from app.core.database import SessionLocal, engine, Base
 from app.models.project import Project, ProjectDifficulty, ProjectStatus
 from app.models.entities import Field
 from app.models import *  # Import all models to ensure tables are created
+from app.services.catalog_file import rebuild_catalog_file
 
 def seed_projects():
     db = SessionLocal()
@@ -438,6 +439,9 @@ def seed_projects():
         db.commit()
         print(f"✅ Successfully seeded {len(projects_data)} projects across all difficulty levels!")
         
+        # Workers map this file instead of each loading the catalog
+        rebuild_catalog_file(engine)
+        
     except Exception as e:
         print(f"❌ Error seeding projects: {e}")
         db.rollback()
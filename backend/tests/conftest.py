@@ -0,0 +1,103 @@
+"""
+Shared fixtures for the backend tests
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.v1.endpoints import projects as projects_endpoint
+from app.core.cache import AsyncCacheService, CacheService
+from app.models.project import (
+    Project, ProjectCatalogVersion, ProjectDifficulty, ProjectDomain, ProjectFacetCount, ProjectStatus
+)
+from app.services.catalog import CatalogStore
+
+CATALOG_TABLES = (
+    Project.__table__, ProjectDomain.__table__, ProjectFacetCount.__table__, ProjectCatalogVersion.__table__
+)
+START = datetime(2024, 1, 1)
+
+def make_project(id, title=None, tags=(), difficulty=ProjectDifficulty.BEGINNER, **columns):
+    """A published catalog project; any other column can be passed by name"""
+    columns.setdefault("brief", "brief")
+    return Project(
+        id=id, title=title or f"Project {id}", tags=list(tags), difficulty=difficulty,
+        status=ProjectStatus.PUBLISHED, **columns,
+    )
+
+def summary(id, difficulty="beginner", tags=(), hours=None, title="Project"):
+    """A catalog row shaped like project_summary(), created `id` days after START"""
+    return {
+        "id": id, "title": title, "brief": "brief", "description": None, "difficulty": difficulty,
+        "tags": None if tags is None else list(tags), "required_skills": ["js"],
+        "tech_stack": ", ".join(tags) if tags else "", "estimated_hours": hours, "max_team_size": 1,
+        "is_community": id % 2 == 0, "created_at": (START + timedelta(days=id)).isoformat(),
+    }
+
+def async_sessions(url):
+    """aiosqlite session factory over the same file as a sync sqlite:/// url"""
+    return async_sessionmaker(bind=create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://", 1)))
+
+def redis_backed_cache(server):
+    """One worker's CacheService and its async view, both talking to a fake Redis server"""
+    service = CacheService()
+    service.redis_client = fakeredis.FakeRedis(server=server)
+    service.memory_cache.clear()
+    async_service = AsyncCacheService(service)
+    async_service._redis_client = fakeredis.aioredis.FakeRedis(server=server)
+    return service, async_service
+
+# ==============================================
+# FIXTURES
+# ==============================================
+
+@pytest.fixture
+def memory_only_cache():
+    """CacheService with Redis detached so only the in-process tier is exercised"""
+    service = CacheService()
+    service.redis_client = None
+    service.memory_cache.clear()
+    return service
+
+@pytest.fixture
+def redis_server():
+    """In-memory fake Redis; caches built on the same server behave like separate workers"""
+    return fakeredis.FakeServer()
+
+@pytest.fixture
+def redis_cache(redis_server):
+    """(CacheService, AsyncCacheService) over redis_server"""
+    return redis_backed_cache(redis_server)
+
+@pytest.fixture
+def catalog_db(tmp_path):
+    """File-backed SQLite database holding the catalog tables; yields (url, engine)"""
+    url = f"sqlite:///{tmp_path / 'catalog.db'}"
+    engine = create_engine(url)
+    for table in CATALOG_TABLES:
+        table.create(engine)
+    yield url, engine
+    engine.dispose()
+
+@pytest.fixture
+def catalog_api(catalog_db, memory_only_cache, monkeypatch):
+    """The /projects router over catalog_db, with a memory-only cache and its own snapshot store"""
+    url, engine = catalog_db
+    sessions = async_sessions(url)
+    monkeypatch.setattr(projects_endpoint, "async_cache", AsyncCacheService(memory_only_cache))
+    monkeypatch.setattr(projects_endpoint, "catalog", CatalogStore())
+    monkeypatch.setattr(projects_endpoint, "AsyncSessionLocal", sessions)
+
+    app = FastAPI()
+    app.include_router(projects_endpoint.router, prefix="/projects")
+    yield SimpleNamespace(app=app, client=TestClient(app), engine=engine, sessions=sessions)
+    asyncio.run(sessions.kw["bind"].dispose())
@@ -0,0 +1,433 @@
+"""
+Tests for the caching layer in app.core.cache
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import (
+    NAMESPACE_VERSION_PREFIX, TAG_PREFIX, AsyncCacheService, LRUCache, async_cached, build_cache_key, cached
+)
+
+from conftest import redis_backed_cache
+
+# ==============================================
+# IN-PROCESS LRU TESTS
+# ==============================================
+
+def test_lru_evicts_least_recently_used():
+    lru = LRUCache(max_entries=2, max_bytes=1024, default_ttl=60)
+    lru.set("a", 1, size=1)
+    lru.set("b", 2, size=1)
+    assert lru.get("a") == 1  # "a" becomes most recently used
+    lru.set("c", 3, size=1)
+
+    assert lru.get("b") is None
+    assert lru.get("a") == 1
+    assert lru.get("c") == 3
+    assert lru.evictions == 1
+
+def test_lru_respects_byte_budget():
+    lru = LRUCache(max_entries=100, max_bytes=10, default_ttl=60)
+    lru.set("a", "x", size=6)
+    lru.set("b", "y", size=6)
+
+    assert "a" not in lru
+    assert lru.current_bytes == 6
+    # A single value larger than the whole budget is refused outright
+    assert lru.set("huge", "z", size=11) is False
+    assert "b" in lru
+
+def test_lru_entries_expire():
+    lru = LRUCache(max_entries=10, max_bytes=1024, default_ttl=60)
+    lru.set("short", "v", ttl=0, size=1)
+    time.sleep(0.001)
+
+    assert lru.get("short") is None
+    assert lru.expirations == 1
+    assert lru.current_bytes == 0
+
+def test_lru_delete_matching_uses_glob():
+    lru = LRUCache(max_entries=10, max_bytes=1024, default_ttl=60)
+    lru.set("projects:1", 1)
+    lru.set("projects:2", 2)
+    lru.set("tracks:1", 3)
+
+    assert lru.delete_matching("projects:*") == 2
+    assert len(lru) == 1
+
+# ==============================================
+# CACHE SERVICE TESTS
+# ==============================================
+
+def test_service_round_trip_without_redis(memory_only_cache):
+    assert memory_only_cache.set("projects:key", [{"id": 1}], ttl=300)
+    assert memory_only_cache.get("projects:key") == [{"id": 1}]
+
+    stats = memory_only_cache.get_stats()
+    assert stats["memory_cache"]["hits"] == 1
+    assert stats["memory_cache"]["bytes"] > 0
+
+def test_memory_hits_return_decoded_copies(memory_only_cache):
+    value = {"items": (1, 2)}
+    memory_only_cache.set("projects:key", value)
+    value["items"] = "changed"
+
+    first = memory_only_cache.get("projects:key")
+    # Same shape a Redis hit decodes to, and never the caller's live object
+    assert first == {"items": [1, 2]}
+    first["items"].append(3)
+    assert memory_only_cache.get("projects:key") == {"items": [1, 2]}
+
+def test_service_delete_and_clear_pattern(memory_only_cache):
+    memory_only_cache.set("projects:a", 1)
+    memory_only_cache.set("projects:b", 2)
+    memory_only_cache.delete("projects:a")
+
+    assert memory_only_cache.get("projects:a") is None
+    assert memory_only_cache.clear_pattern("projects:*") == 1
+    assert memory_only_cache.get("projects:b") is None
+
+# ==============================================
+# CACHE KEY TESTS
+# ==============================================
+
+def test_cache_key_is_stable_and_order_independent():
+    first = build_cache_key("projects", 1, limit=10, difficulty="beginner")
+    second = build_cache_key("projects", 1, difficulty="beginner", limit=10)
+
+    assert first == second
+    assert first.startswith("projects:v1:")
+    assert first != build_cache_key("projects", 2, limit=10, difficulty="beginner")
+
+def test_cache_key_canonicalizes_values():
+    assert build_cache_key("ns", 1, {"b", "a"}) == build_cache_key("ns", 1, {"a", "b"})
+    assert build_cache_key("ns", 1, (1, 2)) != build_cache_key("ns", 1, [1, 2])
+    assert build_cache_key("ns", 1, {1: "a"}) != build_cache_key("ns", 1, {"1": "a"})
+
+def test_cache_key_rejects_values_without_identity():
+    class Handle:
+        pass
+
+    # Two sessions or ORM instances must never share a key (and a cached value)
+    with pytest.raises(TypeError):
+        build_cache_key("ns", 1, Handle())
+
+def test_cached_decorator_keys_on_the_key_callable(memory_only_cache, monkeypatch):
+    monkeypatch.setattr(cache_module, "cache", memory_only_cache)
+
+    class User:
+        def __init__(self, id):
+            self.id = id
+
+    @cached(ttl=60, key_prefix="test", key=lambda user: user.id)
+    def greeting(user):
+        return f"hello {user.id}"
+
+    assert greeting(User(1)) == "hello 1"
+    assert greeting(User(2)) == "hello 2"
+
+def test_bump_namespace_changes_keys(memory_only_cache):
+    key = memory_only_cache.make_key("projects", limit=10)
+    memory_only_cache.set(key, ["cached"])
+
+    memory_only_cache.bump_namespace("projects")
+    new_key = memory_only_cache.make_key("projects", limit=10)
+
+    assert new_key != key
+    assert memory_only_cache.get(new_key) is None
+    assert memory_only_cache.get(key) is None
+
+def test_cached_decorator_hits_across_calls(memory_only_cache, monkeypatch):
+    monkeypatch.setattr(cache_module, "cache", memory_only_cache)
+    calls = []
+
+    # The session is not part of what identifies the call
+    @cached(ttl=60, key_prefix="test", key=lambda value, db=None: value)
+    def load(value, db=None):
+        calls.append(value)
+        return {"value": value}
+
+    assert load(1, db=object()) == {"value": 1}
+    assert load(1, db=object()) == {"value": 1}
+    assert calls == [1]
+
+# ==============================================
+# INVALIDATION TESTS
+# ==============================================
+
+def test_invalidate_tags_removes_only_tagged_keys(memory_only_cache):
+    memory_only_cache.set("projects:a", 1, tags=["projects"])
+    memory_only_cache.set("projects:b", 2, tags=["projects", "beginner"])
+    memory_only_cache.set("tracks:a", 3, tags=["tracks"])
+
+    report = memory_only_cache.invalidate_tags("projects")
+
+    assert report["deleted"] == 2
+    assert report["elapsed_ms"] >= 0
+    assert memory_only_cache.get("tracks:a") == 3
+    assert memory_only_cache.memory_cache.get_stats()["tags"] == 1
+
+def test_invalidate_pattern_reports_removed_keys(memory_only_cache):
+    memory_only_cache.set("projects:a", 1)
+    memory_only_cache.set("tracks:a", 2)
+
+    report = memory_only_cache.invalidate_pattern("projects:*")
+
+    assert report == {"deleted": 1, "elapsed_ms": report["elapsed_ms"], "pattern": "projects:*"}
+    assert memory_only_cache.get("tracks:a") == 2
+
+# ==============================================
+# ASYNC CACHE TESTS
+# ==============================================
+
+def test_async_cache_shares_memory_tier(memory_only_cache):
+    async_service = AsyncCacheService(memory_only_cache)
+
+    async def scenario():
+        await async_service.set_many({"a": 1, "b": 2}, ttl=60, tags=["letters"])
+        assert await async_service.get("a") == 1
+        assert await async_service.get_many(["a", "b", "c"]) == {"a": 1, "b": 2}
+        await async_service.delete("a")
+        assert await async_service.get("a") is None
+
+    asyncio.run(scenario())
+    # Writes made through the async path are visible to the sync service
+    assert memory_only_cache.get("b") == 2
+    assert memory_only_cache.invalidate_tags("letters")["deleted"] == 1
+
+def test_async_cached_decorator(memory_only_cache, monkeypatch):
+    monkeypatch.setattr(cache_module, "async_cache", AsyncCacheService(memory_only_cache))
+    calls = []
+
+    @async_cached(ttl=60, key_prefix="test")
+    async def load(value):
+        calls.append(value)
+        return [value]
+
+    async def scenario():
+        return [await load(3), await load(3)]
+
+    assert asyncio.run(scenario()) == [[3], [3]]
+    assert calls == [3]
+
+def test_invalidate_tags_nowait_leaves_redis_to_a_background_task(redis_cache):
+    service, async_service = redis_cache
+    service.set("projects:a", 1, tags=["projects"])
+
+    async def scenario():
+        async_service.invalidate_tags_nowait("projects")
+        # Local entries go at once; the Redis round trips run after the caller returns
+        assert service.memory_cache.get("projects:a") is None
+        assert await async_service.redis_client.exists("projects:a") == 1
+        await asyncio.gather(*async_service._background_tasks)
+        assert await async_service.redis_client.exists("projects:a", f"{TAG_PREFIX}projects") == 0
+
+    asyncio.run(scenario())
+
+# ==============================================
+# STAMPEDE PROTECTION TESTS
+# ==============================================
+
+def test_get_or_load_coalesces_concurrent_misses(memory_only_cache):
+    calls = []
+    release = threading.Event()
+
+    def loader():
+        calls.append(1)
+        release.wait(1)
+        return "value"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(memory_only_cache.get_or_load("k", loader, ttl=60)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["value"] * 5
+    assert len(calls) == 1
+
+def test_get_or_load_serves_stale_while_refreshing(memory_only_cache):
+    values = iter(["old", "new"])
+    refreshed = threading.Event()
+
+    def loader():
+        value = next(values)
+        if value == "new":
+            refreshed.set()
+        return value
+
+    assert memory_only_cache.get_or_load("k", loader, ttl=0, stale_ttl=60) == "old"
+    # Expired but inside the stale window: the old value is served immediately
+    assert memory_only_cache.get_or_load("k", loader, ttl=0, stale_ttl=60) == "old"
+    assert refreshed.wait(1)
+
+def test_async_get_or_load_coalesces_concurrent_misses(memory_only_cache):
+    async_service = AsyncCacheService(memory_only_cache)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"projects": []}
+
+    async def scenario():
+        return await asyncio.gather(
+            *[async_service.get_or_load("k", loader, ttl=60) for _ in range(5)]
+        )
+
+    assert asyncio.run(scenario()) == [{"projects": []}] * 5
+    assert len(calls) == 1
+
+def test_async_get_or_load_propagates_loader_errors(memory_only_cache):
+    async_service = AsyncCacheService(memory_only_cache)
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def scenario():
+        return await asyncio.gather(
+            *[async_service.get_or_load("k", loader) for _ in range(3)],
+            return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert async_service._inflight == {}
+
+# ==============================================
+# BULK API TESTS
+# ==============================================
+
+def test_lru_bulk_operations():
+    lru = LRUCache(max_entries=10, max_bytes=1024, default_ttl=60)
+
+    assert lru.set_many({"a": (1, 1), "b": (2, 1), "huge": (3, 2048)}, tags=["t"]) == 2
+    assert lru.get_many(["a", "b", "c"]) == {"a": 1, "b": 2}
+    assert lru.delete_many(["a", "c"]) == 1
+    assert lru.delete_tag("t") == 1
+
+def test_service_bulk_round_trip(memory_only_cache):
+    assert memory_only_cache.set_many({"k1": [1], "k2": [2]}, ttl=60, tags=["bulk"])
+
+    assert memory_only_cache.get_many(["k1", "k2", "k3"]) == {"k1": [1], "k2": [2]}
+    assert memory_only_cache.delete_many(["k1", "k3"]) == 1
+    assert memory_only_cache.get_many(["k1", "k2"]) == {"k2": [2]}
+
+# ==============================================
+# CROSS-WORKER INVALIDATION TESTS
+# ==============================================
+
+def _broadcast(payload):
+    return {"type": "message", "data": json.dumps(payload)}
+
+def test_invalidation_broadcast_evicts_local_entries(memory_only_cache):
+    memory_only_cache.set("projects:v1:a", 1, tags=["projects"])
+    memory_only_cache.set("projects:v1:b", 2)
+    memory_only_cache.set("tracks:v1:a", 3)
+
+    memory_only_cache._handle_invalidation_message(
+        _broadcast({"kind": "tags", "tags": ["projects"], "keys": ["projects:v1:b"], "origin": "peer"})
+    )
+
+    assert memory_only_cache.get("projects:v1:a") is None
+    assert memory_only_cache.get("projects:v1:b") is None
+    assert memory_only_cache.get("tracks:v1:a") == 3
+
+def test_namespace_broadcast_moves_local_version(memory_only_cache):
+    memory_only_cache.set(memory_only_cache.make_key("projects", page=1), 1)
+
+    memory_only_cache.apply_invalidation({"kind": "namespace", "namespace": "projects", "version": 7})
+
+    assert memory_only_cache.get_namespace_version("projects") == 7
+    assert len(memory_only_cache.memory_cache) == 0
+
+def test_own_broadcasts_are_ignored(memory_only_cache):
+    memory_only_cache.set("k", 1)
+
+    memory_only_cache._handle_invalidation_message(
+        _broadcast({"kind": "keys", "keys": ["k"], "origin": memory_only_cache.instance_id})
+    )
+
+    assert memory_only_cache.get("k") == 1
+
+# ==============================================
+# REDIS TIER TESTS (fakeredis)
+# ==============================================
+
+def test_tags_are_registered_and_invalidated_in_redis(redis_cache, redis_server):
+    service, _ = redis_cache
+    peer, _ = redis_backed_cache(redis_server)
+    service.set("projects:a", 1, tags=["projects"])
+    service.set("projects:b", 2, tags=["projects", "beginner"])
+    service.set("tracks:a", 3, tags=["tracks"])
+    assert service.redis_client.smembers(f"{TAG_PREFIX}projects") == {b"projects:a", b"projects:b"}
+    # Promoted into the peer's in-process tier without its tags
+    assert peer.get("projects:a") == 1
+
+    assert peer.invalidate_tags("projects")["deleted"] == 2
+
+    assert peer.get("projects:a") is None
+    assert service.redis_client.exists("projects:a", "projects:b", f"{TAG_PREFIX}projects") == 0
+    assert service.get("tracks:a") == 3
+
+def test_namespace_bumps_are_shared_through_redis(redis_cache, redis_server):
+    service, _ = redis_cache
+    peer, async_peer = redis_backed_cache(redis_server)
+    old_key = service.make_key("projects", page=1)
+    service.set(old_key, ["old"])
+
+    assert service.bump_namespace("projects") == 2
+    assert service.redis_client.get(f"{NAMESPACE_VERSION_PREFIX}projects") == b"2"
+    assert peer.get_namespace_version("projects") == 2
+    assert asyncio.run(async_peer.get_namespace_version("projects")) == 2
+    assert peer.make_key("projects", page=1) != old_key
+
+def test_get_or_load_runs_one_loader_across_workers(redis_cache, redis_server, monkeypatch):
+    monkeypatch.setattr(cache_module.settings, "cache_lock_poll_interval", 0.01)
+    workers = [redis_cache[0], redis_backed_cache(redis_server)[0], redis_backed_cache(redis_server)[0]]
+    calls, results = [], []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"projects": [1, 2]}
+
+    threads = [
+        threading.Thread(target=lambda worker=worker: results.append(worker.get_or_load("projects:all", loader)))
+        for worker in workers
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"projects": [1, 2]}] * 3
+
+def test_memory_and_redis_hits_return_the_same_types(redis_cache, redis_server):
+    service, async_service = redis_cache
+    peer, _ = redis_backed_cache(redis_server)
+    value = {"ids": (1, 2), "tags": ["a"], "hours": 5}
+    service.set("projects:v1:a", value)
+
+    from_memory = service.get("projects:v1:a")
+    from_redis = peer.get("projects:v1:a")
+    from_async = asyncio.run(async_service.get("projects:v1:a"))
+
+    assert from_memory == from_redis == from_async == {"ids": [1, 2], "tags": ["a"], "hours": 5}
+    assert type(from_memory["ids"]) is type(from_redis["ids"]) is list
+    # Promoted entries decode the same as the ones written locally
+    assert peer.get("projects:v1:a") == from_redis
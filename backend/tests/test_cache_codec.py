@@ -0,0 +1,86 @@
+"""
+Tests for the cache value codec in app.core.cache_codec
+"""
+
+import json
+import pickle
+import time
+from datetime import datetime
+
+import pytest
+
+from app.core.cache_codec import (
+    COMPRESSION_NONE, ENCODER_JSON, ENCODER_PICKLE, HEADER_MARKER, CacheCodec, CodecError
+)
+
+PROJECTS = [
+    {"id": i, "title": f"Project {i}", "description": "Build a thing. " * 40, "tags": ["python"]}
+    for i in range(50)
+]
+
+def _header(data: bytes):
+    return data[0] & 0x07, (data[0] >> 3) & 0x07
+
+def test_json_values_round_trip_compressed():
+    codec = CacheCodec(compression_threshold=1024)
+    data = codec.dumps(PROJECTS)
+
+    encoder, compression = _header(data)
+    assert data[0] & HEADER_MARKER == HEADER_MARKER
+    assert encoder == ENCODER_JSON
+    assert compression != COMPRESSION_NONE
+    assert len(data) < len(pickle.dumps(PROJECTS)) / 4
+    assert codec.loads(data) == PROJECTS
+
+def test_small_values_are_not_compressed():
+    codec = CacheCodec(compression_threshold=1024)
+    data = codec.dumps({"id": 1})
+
+    assert _header(data) == (ENCODER_JSON, COMPRESSION_NONE)
+    assert codec.loads(data) == {"id": 1}
+
+def test_non_json_values_fall_back_to_pickle():
+    codec = CacheCodec(allow_pickle=True)
+    value = {"created_at": datetime(2024, 1, 1)}
+    data = codec.dumps(value)
+
+    assert _header(data)[0] == ENCODER_PICKLE
+    assert codec.loads(data) == value
+
+def test_pickle_is_refused_by_default():
+    codec = CacheCodec()
+
+    with pytest.raises(CodecError):
+        codec.dumps({"created_at": datetime(2024, 1, 1)})
+    with pytest.raises(CodecError):
+        codec.loads(pickle.dumps([1, 2]))
+
+def test_legacy_entries_remain_readable():
+    codec = CacheCodec(pickle_read_until=time.time() + 60)
+
+    assert codec.loads(pickle.dumps(PROJECTS)) == PROJECTS
+    assert codec.loads(json.dumps({"a": 1}).encode("utf-8")) == {"a": 1}
+
+def test_migration_window_reads_pickle_without_writing_it():
+    old_release = CacheCodec(allow_pickle=True)
+    entry = old_release.dumps({"created_at": datetime(2024, 1, 1)})
+    codec = CacheCodec(pickle_read_until=time.time() + 60)
+
+    assert codec.loads(entry) == {"created_at": datetime(2024, 1, 1)}
+    with pytest.raises(CodecError):
+        codec.dumps({"created_at": datetime(2024, 1, 1)})
+
+def test_pickle_is_refused_once_the_window_closes():
+    codec = CacheCodec(pickle_read_until=time.time() - 1)
+
+    with pytest.raises(CodecError):
+        codec.loads(pickle.dumps(PROJECTS))
+
+def test_pickle_encoder_needs_allow_pickle():
+    assert CacheCodec(encoder="pickle").encoder == ENCODER_JSON
+    assert CacheCodec(encoder="pickle", allow_pickle=True).encoder == ENCODER_PICKLE
+
+@pytest.mark.parametrize("compression", ["zstd", "lz4", "zlib", "none"])
+def test_every_compression_setting_round_trips(compression):
+    codec = CacheCodec(compression=compression, compression_threshold=0)
+    assert codec.loads(codec.dumps(PROJECTS)) == PROJECTS
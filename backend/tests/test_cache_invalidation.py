@@ -0,0 +1,135 @@
+"""
+Tests for model-driven cache invalidation in app.core.cache_invalidation
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+from app.api.v1.endpoints import projects as projects_endpoint
+from app.core import cache_invalidation
+from app.core.cache_invalidation import install_cache_invalidation, register_cache_tags
+from app.core.security import get_current_admin_user
+
+TestBase = declarative_base()
+
+class Widget(TestBase):
+    __tablename__ = "widgets"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+class Untracked(TestBase):
+    __tablename__ = "untracked"
+
+    id = Column(Integer, primary_key=True)
+
+register_cache_tags(Widget, "widgets", instance_tags=lambda widget: [f"widget:{widget.id}"])
+
+@pytest.fixture
+def invalidated(monkeypatch):
+    calls = []
+    monkeypatch.setattr(cache_invalidation, "invalidate_tags", lambda *tags: calls.append(set(tags)))
+    return calls
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    TestBase.metadata.create_all(engine)
+    install_cache_invalidation(Session)
+    with Session(engine) as db:
+        yield db
+
+def test_commit_invalidates_registered_tags(session, invalidated):
+    session.add(Widget(id=1, name="a"))
+    session.commit()
+
+    assert invalidated == [{"widgets", "widget:1"}]
+
+def test_update_and_delete_invalidate(session, invalidated):
+    widget = Widget(id=2, name="a")
+    session.add(widget)
+    session.commit()
+
+    widget.name = "b"
+    session.commit()
+    session.delete(widget)
+    session.commit()
+
+    assert invalidated[1:] == [{"widgets", "widget:2"}, {"widgets", "widget:2"}]
+
+def test_rollback_and_unregistered_models_do_not_invalidate(session, invalidated):
+    session.add(Widget(id=3, name="a"))
+    session.flush()
+    session.rollback()
+    session.add(Untracked(id=1))
+    session.commit()
+
+    assert invalidated == []
+
+def test_async_session_commit_invalidates(invalidated, monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(
+        cache_invalidation.async_cache, "invalidate_tags_nowait", lambda *tags: scheduled.append(set(tags))
+    )
+
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(TestBase.metadata.create_all)
+        async with AsyncSession(engine) as db:
+            db.add(Widget(id=4, name="a"))
+            await db.commit()
+        await engine.dispose()
+
+    install_cache_invalidation(Session)
+    asyncio.run(scenario())
+
+    # Handed to the async client instead of blocking the event loop on sync Redis calls
+    assert scheduled == [{"widgets", "widget:4"}]
+    assert invalidated == []
+
+# ==============================================
+# INVALIDATION ENDPOINT TESTS
+# ==============================================
+
+@pytest.fixture
+def invalidation_api(catalog_api, memory_only_cache, monkeypatch):
+    monkeypatch.setattr(projects_endpoint, "cache", memory_only_cache)
+    memory_only_cache.set("projects:v1:page", [1])
+    memory_only_cache.set("users:v1:page", [2])
+    return catalog_api
+
+def test_invalidation_endpoint_requires_an_admin(invalidation_api):
+    response = invalidation_api.client.post("/projects/cache/invalidate", params={"pattern": "projects:*"})
+
+    assert response.status_code == 403
+    assert projects_endpoint.cache.get("projects:v1:page") == [1]
+
+def test_invalidation_pattern_is_limited_to_project_keys(invalidation_api):
+    invalidation_api.app.dependency_overrides[get_current_admin_user] = lambda: SimpleNamespace(role="admin")
+    client = invalidation_api.client
+
+    assert client.post("/projects/cache/invalidate", params={"pattern": "*"}).status_code == 400
+    assert projects_endpoint.cache.get("users:v1:page") == [2]
+
+    response = client.post("/projects/cache/invalidate", params={"pattern": "projects:*"})
+    assert response.status_code == 200
+    assert projects_endpoint.cache.get("projects:v1:page") is None
+    assert projects_endpoint.cache.get("users:v1:page") == [2]
+
+def test_invalidation_failures_are_errors(invalidation_api, monkeypatch):
+    invalidation_api.app.dependency_overrides[get_current_admin_user] = lambda: SimpleNamespace(role="admin")
+
+    def fail(pattern):
+        raise RuntimeError("redis down")
+
+    monkeypatch.setattr(projects_endpoint.cache, "invalidate_pattern", fail)
+    response = invalidation_api.client.post("/projects/cache/invalidate", params={"pattern": "projects:*"})
+
+    assert response.status_code == 500
@@ -0,0 +1,64 @@
+"""
+Tests for per-namespace cache metrics in app.core.cache_metrics
+"""
+
+import pytest
+
+from app.core.cache_metrics import CacheMetrics
+
+@pytest.fixture
+def memory_only_cache(memory_only_cache):
+    """The shared memory-only cache, sampling every lookup for hot keys"""
+    memory_only_cache.metrics = CacheMetrics(hot_key_sample_rate=1.0)
+    memory_only_cache.memory_cache.on_evict = memory_only_cache.metrics.record_eviction
+    return memory_only_cache
+
+def test_counters_are_grouped_by_namespace(memory_only_cache):
+    memory_only_cache.set("projects:v1:a", [1])
+    memory_only_cache.get("projects:v1:a")
+    memory_only_cache.get("projects:v1:missing")
+    memory_only_cache.get("tracks:v1:a")
+
+    namespaces = memory_only_cache.inspect()["namespaces"]
+
+    assert namespaces["projects"]["memory_hits"] == 1
+    assert namespaces["projects"]["misses"] == 1
+    assert namespaces["projects"]["hit_rate"] == 0.5
+    assert namespaces["projects"]["bytes_written"] > 0
+    assert namespaces["projects"]["memory_entries"] == 1
+    assert namespaces["tracks"]["misses"] == 1
+
+def test_loads_and_stale_serves_are_recorded(memory_only_cache):
+    memory_only_cache.get_or_load("projects:v1:list", lambda: ["a"], ttl=0, stale_ttl=60)
+    memory_only_cache.get_or_load("projects:v1:list", lambda: ["b"], ttl=0, stale_ttl=60)
+
+    counters = memory_only_cache.inspect()["namespaces"]["projects"]
+    assert counters["loads"] >= 1
+    assert counters["stale_serves"] == 1
+
+def test_hot_keys_are_ranked(memory_only_cache):
+    for _ in range(3):
+        memory_only_cache.get("projects:v1:hot")
+    memory_only_cache.get("projects:v1:cold")
+
+    hot_keys = memory_only_cache.inspect(hot_key_limit=1)["hot_keys"]
+    assert hot_keys == [{"key": "projects:v1:hot", "sampled_hits": 3, "estimated_hits": 3}]
+
+def test_evictions_are_attributed_to_namespace(memory_only_cache):
+    memory_only_cache.memory_cache.max_entries = 1
+    memory_only_cache.set("projects:v1:a", 1)
+    memory_only_cache.set("tracks:v1:b", 2)
+
+    assert memory_only_cache.inspect()["namespaces"]["projects"]["evictions"] == 1
+
+def test_prometheus_rendering(memory_only_cache):
+    memory_only_cache.get("projects:v1:a")
+    memory_only_cache.set("projects:v1:a", 1)
+    memory_only_cache.get("projects:v1:a")
+
+    text = memory_only_cache.render_metrics()
+
+    assert "# TYPE cache_hits_total counter" in text
+    assert 'cache_hits_total{namespace="projects",tier="memory"} 1' in text
+    assert 'cache_misses_total{namespace="projects"} 1' in text
+    assert 'cache_memory_entries{namespace="projects"} 1' in text
@@ -0,0 +1,154 @@
+"""
+Tests for the memory-mapped catalog snapshot file in app.services.catalog_file
+"""
+
+import asyncio
+import os
+from datetime import timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.services.catalog import CatalogSnapshot, CatalogStore
+from app.services.catalog_file import (
+    MappedCatalogSnapshot, acquire_publisher_lock, file_key, rebuild_catalog_file, write_catalog_file
+)
+
+from conftest import START, async_sessions, make_project, summary
+
+def make_snapshot(count=4, version=0):
+    items = [summary(1, tags=None, hours=8, title="Café robot")] + [
+        summary(id, "advanced" if id % 2 else "beginner", ["React", "css"][: id % 3], id * 5)
+        for id in range(2, count + 1)
+    ]
+    return CatalogSnapshot(items, [(1, "mobile"), (3, "web-dev"), (4, "web-dev")], version)
+
+@pytest.fixture
+def mapped(tmp_path):
+    snapshot = make_snapshot(version=7)
+    write_catalog_file(str(tmp_path / "catalog.snapshot"), snapshot)
+    return snapshot, MappedCatalogSnapshot(str(tmp_path / "catalog.snapshot"))
+
+# ==============================================
+# File format
+# ==============================================
+
+def test_rows_round_trip(mapped):
+    snapshot, mapped = mapped
+
+    assert len(mapped) == 4 and mapped.version == 7 and mapped.built_at == snapshot.built_at
+    assert list(mapped.items) == list(snapshot.items)
+    assert mapped.items[-1]["title"] == "Café robot" and mapped.items[-1]["tags"] is None
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"difficulty": "advanced"},
+    {"tag": "REACT"},
+    {"domain": "web-dev", "hours": "10-20"},
+    {"domain": "robot"},
+    {"difficulty": "beginner", "tag": "css"},
+    {"after": (START + timedelta(days=3), 3)},
+    {"limit": 2, "offset": 1},
+])
+def test_select_matches_the_in_memory_snapshot(mapped, filters):
+    snapshot, mapped = mapped
+
+    assert mapped.select(**filters) == snapshot.select(**filters)
+
+def test_published_file_is_readable_by_other_users(mapped, tmp_path):
+    assert os.stat(tmp_path / "catalog.snapshot").st_mode & 0o777 == 0o644
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "catalog.snapshot"
+    path.write_bytes(b"not a snapshot" * 10)
+
+    with pytest.raises(ValueError):
+        MappedCatalogSnapshot(str(path))
+
+# ==============================================
+# Store
+# ==============================================
+
+@pytest.fixture
+def database(catalog_db):
+    url, engine = catalog_db
+    with Session(engine) as db:
+        db.add(make_project(1, "Flutter chat", ["flutter"]))
+        db.commit()
+    return engine, async_sessions(url)
+
+def test_workers_map_the_file_and_follow_replacements(tmp_path, database):
+    engine, factory = database
+    path = str(tmp_path / "catalog.snapshot")
+    rebuild_catalog_file(engine, path)
+    store = CatalogStore(path, check_interval=0)
+
+    async def scenario():
+        first = await store.get(factory)
+        assert isinstance(first, MappedCatalogSnapshot) and first.version == 1
+        assert [item["title"] for item in first.select(domain="mobile")] == ["Flutter chat"]
+
+        write_catalog_file(path, make_snapshot(version=first.version))
+        second = await store.get(factory)
+        assert second is not first and len(second) == 4
+        # Readers still holding the replaced version keep a valid mapping
+        assert [item["id"] for item in first.select()] == [1]
+
+    asyncio.run(scenario())
+
+def test_fresh_workers_do_not_start_on_an_old_file(tmp_path, database):
+    engine, factory = database
+    path = str(tmp_path / "catalog.snapshot")
+    write_catalog_file(path, make_snapshot(version=0))
+
+    snapshot = asyncio.run(CatalogStore(path).get(factory))
+
+    assert snapshot.version == 1 and [item["id"] for item in snapshot.select()] == [1]
+
+def test_a_write_is_republished_by_the_lock_holder(tmp_path, database):
+    engine, factory = database
+    path = str(tmp_path / "catalog.snapshot")
+    rebuild_catalog_file(engine, path)
+    store = CatalogStore(path, check_interval=0)
+
+    async def scenario():
+        first = await store.get(factory)
+        with Session(engine) as db:
+            db.add(make_project(2, "Todo app", ["react"]))
+            db.commit()
+
+        # The version moved: a rebuild starts and the stale file is served meanwhile
+        assert await store.get(factory) is first
+        republished = await store.refresh(factory)
+        assert isinstance(republished, MappedCatalogSnapshot) and republished.version == 2
+        assert [item["id"] for item in republished.select()] == [2, 1]
+
+    asyncio.run(scenario())
+
+def test_only_one_worker_publishes(tmp_path, database):
+    engine, factory = database
+    path = str(tmp_path / "catalog.snapshot")
+    rebuild_catalog_file(engine, path)
+    store = CatalogStore(path, check_interval=0)
+
+    async def scenario():
+        first = await store.get(factory)
+        with Session(engine) as db:
+            db.add(make_project(2, "Todo app", ["react"]))
+            db.commit()
+
+        # Another worker holds the lock: keep serving, leave the file to it
+        lock = acquire_publisher_lock(path)
+        try:
+            published = file_key(os.stat(path))
+            assert await store.refresh(factory) is first
+            assert file_key(os.stat(path)) == published
+        finally:
+            os.close(lock)
+
+        # Its file replaces the stale snapshot at the next check
+        rebuild_catalog_file(engine, path)
+        current = await store.get(factory)
+        assert current.version == 2 and len(current) == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,127 @@
+"""
+Tests for the in-process catalog snapshot in app.services.catalog
+"""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.services.catalog import CatalogSnapshot, CatalogStore
+
+from conftest import START, async_sessions, make_project, summary
+
+@pytest.fixture
+def snapshot():
+    return CatalogSnapshot(
+        [
+            summary(1, tags=["React"], hours=8),
+            summary(2, "advanced", ["flutter"], 25),
+            summary(3, tags=["react", "css"], hours=12),
+            summary(4, "advanced", ["css"], 45, title="Robot arm"),
+        ],
+        [(2, "mobile"), (3, "web-dev"), (1, "web-dev")],
+    )
+
+# ==============================================
+# Snapshot
+# ==============================================
+
+def test_items_are_newest_first(snapshot):
+    assert [item["id"] for item in snapshot.select()] == [4, 3, 2, 1]
+
+def test_postings_intersect(snapshot):
+    assert snapshot.postings["tag"]["react"] == frozenset({1, 3})
+    assert [item["id"] for item in snapshot.select(difficulty="beginner", tag="REACT")] == [3, 1]
+    assert [item["id"] for item in snapshot.select(domain="web-dev", hours="10-20")] == [3]
+    assert [item["id"] for item in snapshot.select(difficulty="all", domain="mobile")] == [2]
+    assert snapshot.select(tag="css", domain="mobile") == []
+
+def test_unknown_domains_match_as_keywords(snapshot):
+    assert [item["id"] for item in snapshot.select(domain="robot")] == [4]
+
+def test_cursor_and_offset(snapshot):
+    after = (START + timedelta(days=3), 3)
+
+    assert [item["id"] for item in snapshot.select(after=after)] == [2, 1]
+    assert [item["id"] for item in snapshot.select(tag="css", after=after)] == []
+    assert [item["id"] for item in snapshot.select(limit=2, offset=1)] == [3, 2]
+
+# ==============================================
+# Store
+# ==============================================
+
+@pytest.fixture
+def sessions(catalog_db):
+    url, engine = catalog_db
+    with Session(engine) as db:
+        db.add(make_project(1, "Flutter chat", ["flutter"]))
+        db.commit()
+    return engine, async_sessions(url)
+
+def test_invalidation_rebuilds_and_swaps(sessions):
+    engine, factory = sessions
+    store = CatalogStore()
+
+    async def scenario():
+        first, again = await asyncio.gather(store.get(factory), store.get(factory))
+        assert first is again
+        assert [item["id"] for item in first.select(domain="mobile")] == [1]
+
+        with Session(engine) as db:
+            db.add(make_project(2, "Todo app", ["react"]))
+            db.commit()
+        assert await store.get(factory) is first
+
+        store.invalidate()
+        # Served from the previous snapshot while the single rebuild runs
+        during = await asyncio.gather(*(store.get(factory) for _ in range(3)))
+        assert all(snapshot is first for snapshot in during)
+        second = await store.refresh(factory)
+        assert second is not first and await store.get(factory) is second
+        assert [item["id"] for item in second.select()] == [2, 1]
+        # The previous snapshot is untouched for readers still holding it
+        assert len(first) == 1
+
+    asyncio.run(scenario())
+
+def test_old_snapshots_are_rebuilt_without_an_invalidation(sessions):
+    engine, factory = sessions
+    store = CatalogStore(max_age=0)
+
+    async def scenario():
+        first = await store.get(factory)
+        assert await store.get(factory) is first
+        second = await store.refresh(factory)
+        assert second is not first
+
+    asyncio.run(scenario())
+
+def test_tag_invalidation_notifies_listeners(memory_only_cache):
+    memory_only = memory_only_cache
+    store = CatalogStore()
+    memory_only.add_tag_listener("projects", store.invalidate)
+
+    memory_only.invalidate_tags("users")
+    assert store._generation == 0
+    memory_only.invalidate_tags("projects")
+    assert store._generation == 1
+
+def test_writes_from_other_processes_are_seen_through_the_version(sessions):
+    engine, factory = sessions
+    store = CatalogStore(check_interval=0)
+
+    async def scenario():
+        first = await store.get(factory)
+        assert first.version == 1
+        # No invalidation reaches this store; the committed version does
+        with Session(engine) as db:
+            db.get(Project, 1).title = "Flutter messenger"
+            db.commit()
+        assert await store.get(factory) is first
+        second = await store.refresh(factory)
+        assert second.version == 2 and second.items[0]["title"] == "Flutter messenger"
+
+    asyncio.run(scenario())
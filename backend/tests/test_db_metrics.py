@@ -0,0 +1,112 @@
+"""
+Tests for the connection pool and query latency exporter in app.core.db_metrics
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core import db_metrics as db_metrics_module
+from app.core.db_metrics import DatabaseMetrics, Histogram, InstrumentedQueuePool, table_of
+from app.core.query_profiler import QueryProfiler
+
+@pytest.fixture
+def metrics(monkeypatch):
+    fresh = DatabaseMetrics()
+    monkeypatch.setattr(db_metrics_module, "db_metrics", fresh)
+    return fresh
+
+@pytest.fixture
+def small_pool_engine(tmp_path, metrics):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'metrics.db'}",
+        connect_args={"check_same_thread": False},
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name="test",
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    metrics.register_engine("test", engine)
+    yield engine
+    engine.dispose()
+
+# ==============================================
+# Histogram and table extraction
+# ==============================================
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram(buckets=(0.01, 0.1))
+    histogram.observe(("a",), 0.005)
+    histogram.observe(("a",), 0.05)
+    histogram.observe(("a",), 5)
+
+    text_lines = histogram.render("x_seconds", "help", ("label",))
+
+    assert 'x_seconds_bucket{label="a",le="0.01"} 1' in text_lines
+    assert 'x_seconds_bucket{label="a",le="0.1"} 2' in text_lines
+    assert 'x_seconds_bucket{label="a",le="+Inf"} 3' in text_lines
+    assert 'x_seconds_count{label="a"} 3' in text_lines
+    assert histogram.snapshot()[("a",)]["count"] == 3
+
+def test_table_of_picks_the_first_table():
+    assert table_of('SELECT projects.id FROM projects WHERE projects.status = ?') == "projects"
+    assert table_of('INSERT INTO "user_badges" (id) VALUES (?)') == "user_badges"
+    assert table_of('UPDATE user_progress SET total_xp=?') == "user_progress"
+    assert table_of('SELECT 1') == "other"
+
+# ==============================================
+# Pool metrics
+# ==============================================
+
+def test_pool_wait_checkout_and_overflow_are_recorded(small_pool_engine, metrics):
+    with small_pool_engine.connect() as first, small_pool_engine.connect() as second:
+        first.execute(text("SELECT 1"))
+        second.execute(text("SELECT 1"))
+
+    assert metrics.pool_wait.snapshot()[("test",)]["count"] == 2
+    assert metrics.pool_checkout.snapshot()[("test",)]["count"] == 2
+    assert metrics.pool_status()["test"]["overflow_peak"] == 1
+
+def test_pool_timeouts_are_counted(small_pool_engine, metrics):
+    with small_pool_engine.connect(), small_pool_engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            small_pool_engine.connect()
+
+    assert metrics.pool_status()["test"]["timeouts"] == 1
+    assert 'db_pool_timeouts_total{pool="test"} 1' in metrics.render_prometheus()
+
+# ==============================================
+# Query latency by route
+# ==============================================
+
+def test_query_latency_is_labelled_by_route_template(small_pool_engine, metrics):
+    profiler = QueryProfiler(slow_query_threshold=0)
+    profiler.listeners.append(metrics.record_query)
+    profiler.attach(small_pool_engine)
+
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def collect(request, call_next):
+        token = metrics.start_request()
+        try:
+            return await call_next(request)
+        finally:
+            metrics.finish_request(token, request.scope["route"].path)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        with small_pool_engine.connect() as conn:
+            conn.execute(text("SELECT 1 FROM sqlite_master"))
+        return {"id": item_id}
+
+    client = TestClient(app)
+    client.get("/items/1")
+    client.get("/items/2")
+
+    series = metrics.query_latency.snapshot()
+    assert series[("/items/{item_id}", "sqlite_master")]["count"] == 2
+    assert 'db_query_seconds_count{route="/items/{item_id}",table="sqlite_master"} 2' in metrics.render_prometheus()
@@ -0,0 +1,72 @@
+"""
+Tests for the lazily created request sessions in app.core.database
+"""
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from app.core import database
+from app.core.database import get_async_db, get_db
+
+@pytest.fixture
+def counted(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'lazy.db'}",
+        connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+    )
+    calls = {"sessions": 0, "checkouts": 0}
+    event.listen(engine, "checkout", lambda *args: calls.__setitem__("checkouts", calls["checkouts"] + 1))
+    factory = sessionmaker(bind=engine)
+
+    def session_local():
+        calls["sessions"] += 1
+        return factory()
+
+    monkeypatch.setattr(database, "SessionLocal", session_local)
+    yield calls, engine
+    engine.dispose()
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    cached = {"hit": True}
+
+    @app.get("/items")
+    def list_items(use_db: bool = False, db=Depends(get_db)):
+        if not use_db:
+            return cached
+        return {"one": db.execute(text("SELECT 1")).scalar()}
+
+    @app.get("/async-items")
+    async def list_async_items(db=Depends(get_async_db)):
+        return cached
+
+    return TestClient(app)
+
+def test_cache_hit_path_never_builds_a_session(counted, client):
+    calls, engine = counted
+
+    assert client.get("/items").json() == {"hit": True}
+
+    assert calls == {"sessions": 0, "checkouts": 0}
+
+def test_first_statement_builds_the_session_and_close_releases_it(counted, client):
+    calls, engine = counted
+
+    assert client.get("/items", params={"use_db": True}).json() == {"one": 1}
+
+    assert calls == {"sessions": 1, "checkouts": 1}
+    assert engine.pool.checkedout() == 0
+
+def test_async_dependency_is_lazy_too(monkeypatch, client):
+    def fail():
+        raise AssertionError("AsyncSession should not be created")
+
+    monkeypatch.setattr(database, "AsyncSessionLocal", fail)
+
+    assert client.get("/async-items").json() == {"hit": True}
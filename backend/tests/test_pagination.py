@@ -0,0 +1,87 @@
+"""
+Tests for keyset cursors in app.core.pagination and their use by GET /projects
+"""
+
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.services.catalog import CatalogSnapshot
+
+from conftest import make_project, summary
+
+def hand_built_cursor(created_at, row_id):
+    raw = json.dumps([created_at, row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+@pytest.fixture
+def client(catalog_api):
+    with Session(catalog_api.engine) as db:
+        # Same-second server-default timestamps: only the id orders these rows
+        db.add_all([make_project(id) for id in range(1, 6)])
+        db.commit()
+    return catalog_api.client, catalog_api.engine
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+def test_cursor_pages_walk_the_catalog_once(client):
+    client, engine = client
+    seen, cursor = [], None
+
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/projects/", params=params)
+        assert response.status_code == 200
+        seen += [item["id"] for item in response.json()]
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+
+    assert seen == [5, 4, 3, 2, 1]
+
+def test_inserts_do_not_shift_later_pages(client):
+    client, engine = client
+    first = client.get("/projects/", params={"limit": 2})
+
+    with Session(engine) as db:
+        db.add(make_project(6))
+        db.commit()
+    second = client.get("/projects/", params={"limit": 2, "cursor": first.headers[NEXT_CURSOR_HEADER]})
+
+    assert [item["id"] for item in second.json()] == [3, 2]
+
+def test_bad_cursors_are_rejected(client):
+    client, engine = client
+
+    assert client.get("/projects/", params={"cursor": "garbage"}).status_code == 400
+    assert client.get("/projects/", params={"cursor": encode_cursor(datetime(2024, 1, 1), 1), "offset": 2}).status_code == 400
+
+def test_naive_and_aware_cursors_compare_in_utc(client):
+    client, engine = client
+
+    for created_at in ("2099-01-01T00:00:00", "2099-01-01T00:00:00+02:00"):
+        response = client.get("/projects/", params={"cursor": hand_built_cursor(created_at, 1)})
+        assert response.status_code == 200
+        assert [item["id"] for item in response.json()] == [5, 4, 3, 2, 1]
+
+def test_naive_cursor_pages_an_aware_catalog():
+    rows = [summary(id) for id in range(1, 4)]
+    for row in rows:
+        row["created_at"] = (datetime.fromisoformat(row["created_at"]) + timedelta(hours=2)).replace(
+            tzinfo=timezone(timedelta(hours=2))
+        ).isoformat()
+    snapshot = CatalogSnapshot(rows, [])
+
+    # The row created "2024-01-03T02:00:00+02:00" is 2024-01-03 00:00 UTC
+    after = decode_cursor(hand_built_cursor("2024-01-03T00:00:00", 2))
+
+    assert [item["id"] for item in snapshot.select(after=after)] == [1]
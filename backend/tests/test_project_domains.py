@@ -0,0 +1,102 @@
+"""
+Tests for write-time project domain classification in app.core.domains
+"""
+
+import asyncio
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints import projects as projects_endpoint
+from app.core import domains
+from app.core.domains import backfill_project_domains, classify_project
+from app.models.project import Project, ProjectDomain, ProjectFacetCount
+
+from conftest import make_project
+
+def domains_of(engine, project_id):
+    with Session(engine) as db:
+        return set(db.scalars(select(ProjectDomain.domain).where(ProjectDomain.project_id == project_id)))
+
+def facet_counts(engine):
+    with Session(engine) as db:
+        rows = db.execute(
+            select(ProjectFacetCount.value, ProjectFacetCount.count).where(ProjectFacetCount.facet == "domain")
+        )
+        return {value: count for value, count in rows if count}
+
+# ==============================================
+# Classification
+# ==============================================
+
+def test_classification_matches_keywords_anywhere():
+    assert classify_project("Flutter notes", None, []) == ["mobile"]
+    assert classify_project("Todo list", "Made with React", ["encryption"]) == ["web-dev", "cybersecurity"]
+    assert classify_project("Todo", "nothing to see", []) == []
+
+def test_keyword_map_is_configurable(tmp_path, monkeypatch):
+    path = tmp_path / "domains.json"
+    path.write_text('{"games": ["Unity", "godot"]}')
+    monkeypatch.setattr(domains.settings, "project_domains_file", str(path))
+    domains.domain_keywords.cache_clear()
+    try:
+        assert classify_project("A unity platformer", None, []) == ["games"]
+    finally:
+        domains.domain_keywords.cache_clear()
+
+# ==============================================
+# Write-time sync and backfill
+# ==============================================
+
+def test_inserts_and_text_updates_are_classified(catalog_db):
+    _, engine = catalog_db
+
+    with Session(engine) as db:
+        db.add(make_project(1, "Android tracker"))
+        db.commit()
+        assert domains_of(engine, 1) == {"mobile"}
+
+        project = db.get(Project, 1)
+        project.title = "Password vault"
+        project.tags = ["encryption"]
+        db.commit()
+
+    assert domains_of(engine, 1) == {"cybersecurity"}
+
+def test_backfill_classifies_rows_written_behind_the_orm(catalog_db):
+    _, engine = catalog_db
+    with Session(engine) as db:
+        db.add(make_project(1, "Pytorch classifier"))
+        db.commit()
+        db.execute(delete(ProjectDomain))
+        db.commit()
+
+    assert backfill_project_domains(engine) == 1
+    assert domains_of(engine, 1) == {"ai-ml"}
+
+def test_backfill_recounts_domain_facets(catalog_db, tmp_path, monkeypatch):
+    _, engine = catalog_db
+    with Session(engine) as db:
+        db.add_all([make_project(1, "Unity platformer"), make_project(2, "Flutter chat")])
+        db.commit()
+    assert facet_counts(engine) == {"mobile": 1}
+
+    path = tmp_path / "domains.json"
+    path.write_text('{"games": ["unity"], "mobile": ["flutter", "unity"]}')
+    monkeypatch.setattr(domains.settings, "project_domains_file", str(path))
+    domains.domain_keywords.cache_clear()
+    try:
+        backfill_project_domains(engine)
+    finally:
+        domains.domain_keywords.cache_clear()
+
+    assert facet_counts(engine) == {"games": 1, "mobile": 2}
+
+def test_catalog_domain_filter_uses_the_classification(catalog_api):
+    with Session(catalog_api.engine) as db:
+        db.add_all([make_project(1, "Vue storefront"), make_project(2, "Flutter chat")])
+        db.commit()
+
+    items = asyncio.run(projects_endpoint._load_projects(None, 0, None, "mobile", None))
+
+    assert [item["id"] for item in items] == [2]
@@ -0,0 +1,116 @@
+"""
+Tests for the maintained catalog facet counts in app.core.facets and GET /projects/facets
+"""
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.facets import compute_facet_counts, hours_bucket, read_facet_counts
+from app.models.project import Project, ProjectDifficulty, ProjectFacetCount, ProjectStatus
+
+from conftest import make_project
+
+@pytest.fixture
+def engine(catalog_db):
+    _, engine = catalog_db
+    with Session(engine) as db:
+        db.add_all([
+            make_project(1, "Vue storefront", ["Vue", "css"], estimated_hours=8),
+            make_project(2, "Flutter chat", ["flutter"], ProjectDifficulty.ADVANCED, estimated_hours=25),
+            make_project(3, "React blog", ["react", "css"], estimated_hours=12),
+        ])
+        db.commit()
+    return engine
+
+def facet_counts(engine):
+    with Session(engine) as db:
+        return read_facet_counts(db.execute(
+            select(ProjectFacetCount.facet, ProjectFacetCount.value, ProjectFacetCount.count)
+        ).all())
+
+# ==============================================
+# Maintained aggregate
+# ==============================================
+
+def test_hours_buckets():
+    assert [hours_bucket(hours) for hours in (None, 0, 9, 10, 39, 40, 500)] == [
+        None, "under-10", "under-10", "10-20", "20-40", "40-plus", "40-plus"
+    ]
+
+def test_counts_are_maintained_on_write(engine):
+    counts = facet_counts(engine)
+    assert counts["difficulty"] == {"beginner": 2, "advanced": 1}
+    assert counts["tag"] == {"css": 2, "flutter": 1, "react": 1, "vue": 1}
+    assert counts["hours"] == {"10-20": 1, "20-40": 1, "under-10": 1}
+    assert counts["domain"]["mobile"] == 1
+
+    with Session(engine) as db:
+        db.get(Project, 3).status = ProjectStatus.RETIRED
+        db.commit()
+
+    counts = facet_counts(engine)
+    assert counts["difficulty"] == {"beginner": 1, "advanced": 1}
+    assert counts["tag"]["css"] == 1 and "react" not in counts["tag"]
+
+def test_writes_apply_deltas_matching_a_full_recount(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    with Session(engine) as db:
+        db.get(Project, 1).tags = ["vue", "flutter"]
+        db.add(make_project(4, "Kotlin app", ["css"], ProjectDifficulty.INTERMEDIATE, estimated_hours=50))
+        db.commit()
+        # Assigned while expired: the old value is not in the history
+        kotlin = db.get(Project, 4)
+        db.expire(kotlin)
+        kotlin.estimated_hours = 5
+        db.get(Project, 3).status = ProjectStatus.DRAFT
+        db.get(Project, 2).title = "Flutter security scanner"
+        db.commit()
+
+    with engine.connect() as conn:
+        expected = {facet: dict(counter) for facet, counter in compute_facet_counts(conn).items()}
+    assert facet_counts(engine) == read_facet_counts(
+        (facet, value, count) for facet, counter in expected.items() for value, count in counter.items()
+    )
+    assert facet_counts(engine)["tag"] == {"flutter": 2, "css": 1, "vue": 1}
+    # Upserts per touched value, never a rewrite of the whole table
+    assert not any(
+        statement.startswith("DELETE FROM project_facet_counts") and "WHERE" not in statement
+        for statement in statements
+    )
+
+# ==============================================
+# Endpoint
+# ==============================================
+
+@pytest.fixture
+def client(engine, catalog_api):
+    return catalog_api.client
+
+def test_one_request_returns_items_and_facets(client):
+    body = client.get("/projects/facets", params={"tag": "css", "limit": 1}).json()
+
+    assert [item["id"] for item in body["items"]] == [3]
+    assert body["next_cursor"]
+    assert body["total"] == 2
+    assert body["facets"]["tag"]["css"] == 2
+
+    page_two = client.get("/projects/facets", params={"tag": "css", "limit": 1, "cursor": body["next_cursor"]}).json()
+    assert [item["id"] for item in page_two["items"]] == [1]
+
+def test_hours_filter_and_validation(client):
+    body = client.get("/projects/facets", params={"hours": "20-40"}).json()
+
+    assert [item["id"] for item in body["items"]] == [2]
+    assert client.get("/projects/facets", params={"hours": "forever"}).status_code == 400
+    assert client.get("/projects/facets", params={"difficulty": "expert"}).status_code == 400
+
+def test_total_counts_the_filtered_result(client):
+    assert client.get("/projects/facets").json()["total"] == 3
+    assert client.get("/projects/facets", params={"difficulty": "beginner", "hours": "under-10"}).json()["total"] == 1
+
+    body = client.get("/projects/facets", params={"search": "chat", "limit": 1}).json()
+    assert [item["id"] for item in body["items"]] == [2]
+    assert body["total"] == 1
@@ -0,0 +1,94 @@
+"""
+Tests for full-text project search in app.core.search (SQLite FTS5 flavour)
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints import projects as projects_endpoint
+from app.core.search import apply_project_search, install_project_search, render_highlight, search_terms
+from app.models.project import Project, ProjectDifficulty
+
+from conftest import make_project
+
+@pytest.fixture
+def engine(catalog_db):
+    url, engine = catalog_db
+    with Session(engine) as db:
+        # Existing rows are indexed by the install's rebuild
+        db.add(make_project(1, "Weather dashboard", brief="Charts for a city", description="Fetch forecasts in javascript"))
+        db.commit()
+    assert install_project_search(engine)
+    with Session(engine) as db:
+        db.add_all([
+            make_project(2, "Javascript game", ["javascript"], brief="Canvas arcade", description="Sprites and physics"),
+            make_project(3, "Chat bot", ["python", "ai"], ProjectDifficulty.ADVANCED,
+                         brief="Answer questions", description="A python bot"),
+        ])
+        db.commit()
+    return engine
+
+def search(engine, text):
+    query = apply_project_search(select(Project), "sqlite", search_terms(text))
+    with Session(engine) as db:
+        return [(project.id, render_highlight(highlight)) for project, highlight in db.execute(query).all()]
+
+# ==============================================
+# Query parsing
+# ==============================================
+
+def test_search_terms_drop_match_syntax():
+    assert search_terms('java* OR "x" -NEAR(') == ["java", "or", "x", "near"]
+    assert search_terms("   ") == []
+    assert search_terms(None) == []
+
+# ==============================================
+# Index maintenance and ranking
+# ==============================================
+
+def test_title_matches_rank_above_description_matches(engine):
+    results = search(engine, "javascript")
+
+    assert [project_id for project_id, _ in results] == [2, 1]
+    assert "<mark>" in results[0][1]
+
+def test_last_term_matches_as_a_prefix(engine):
+    assert [project_id for project_id, _ in search(engine, "weath")] == [1]
+    assert search(engine, "chat weath") == []
+
+def test_updates_and_deletes_keep_the_index_in_sync(engine):
+    with Session(engine) as db:
+        db.get(Project, 3).title = "Telescope tracker"
+        db.execute(delete(Project).where(Project.id == 2))
+        db.commit()
+
+    assert search(engine, "chat") == []
+    assert [project_id for project_id, _ in search(engine, "telescope")] == [3]
+    assert [project_id for project_id, _ in search(engine, "javascript")] == [1]
+
+def test_highlights_escape_the_project_text(engine):
+    with Session(engine) as db:
+        db.add(make_project(4, "Widget", description='<img src=x onerror="alert(1)"> a telescope <mark>'))
+        db.commit()
+
+    [(project_id, highlight)] = search(engine, "telescope")
+
+    assert project_id == 4
+    assert "<img" not in highlight and "&lt;img src=x onerror=&quot;alert(1)&quot;&gt;" in highlight
+    assert "<mark>telescope</mark>" in highlight and "&lt;mark&gt;" in highlight
+
+def test_catalog_search_combines_with_filters(engine, catalog_api):
+    async def scenario():
+        return (
+            await projects_endpoint._load_projects(None, 0, None, None, "python bot"),
+            await projects_endpoint._load_projects(None, 0, "beginner", None, "python bot"),
+        )
+
+    everything, beginners = asyncio.run(scenario())
+
+    assert [item["id"] for item in everything] == [3]
+    assert "<mark>" in everything[0]["highlight"]
+    assert beginners == []
@@ -0,0 +1,49 @@
+"""
+Tests for the column-projected catalog list views in app.api.v1.endpoints.projects
+"""
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.database import get_async_db
+
+from conftest import make_project
+
+@pytest.fixture
+def client(catalog_api):
+    with Session(catalog_api.engine) as db:
+        db.add(make_project(
+            1, "Kanban board", ["react"], milestones=[{"title": "Board"}], test_spec={"tests": ["drag"]},
+        ))
+        db.commit()
+
+    statements = []
+    event.listen(catalog_api.sessions.kw["bind"].sync_engine, "before_cursor_execute",
+                 lambda *args: statements.append(args[2]))
+
+    async def override_db():
+        async with catalog_api.sessions() as db:
+            yield db
+
+    catalog_api.app.dependency_overrides[get_async_db] = override_db
+    return catalog_api.client, statements
+
+@pytest.mark.parametrize("path", ["/projects/", "/projects/beginner"])
+def test_list_views_skip_the_heavy_columns(client, path):
+    client, statements = client
+
+    items = client.get(path).json()
+
+    assert [item["title"] for item in items] == ["Kanban board"]
+    assert items[0]["tech_stack"] == "react"
+    assert not any("milestones" in statement or "test_spec" in statement for statement in statements)
+
+def test_detail_view_loads_the_heavy_columns(client):
+    client, statements = client
+
+    project = client.get("/projects/1").json()
+
+    assert project["milestones"] == [{"title": "Board"}]
+    assert project["test_spec"] == {"tests": ["drag"]}
+    assert len(statements) == 1
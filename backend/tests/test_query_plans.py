@@ -0,0 +1,37 @@
+"""
+Tests for the hot query plan check in app.core.query_plans
+"""
+
+import pytest
+from sqlalchemy import Index, create_engine
+
+from app.core.database import Base
+from app.core.query_plans import HOT_QUERIES, find_sequential_scans
+from app.models.collaboration import ChatMessage
+from app.models.gamification import UserBadge, UserProgress, XPTransaction
+from app.models.newsletter import NewsletterComment, NewsletterLike
+from app.models.project import Project, ProjectDomain
+
+HOT_TABLES = [
+    model.__table__ for model in
+    (Project, ProjectDomain, XPTransaction, UserBadge, NewsletterComment, NewsletterLike, ChatMessage, UserProgress)
+]
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=HOT_TABLES)
+    return engine
+
+def test_hot_queries_use_an_index(engine):
+    assert find_sequential_scans(engine) == {}
+
+def test_missing_index_is_reported(engine):
+    Index("idx_chat_messages_session_created_at", ChatMessage.__table__.c.session_id).drop(engine)
+
+    assert find_sequential_scans(engine) == {"chat_history": "chat_messages"}
+
+def test_every_hot_query_builds():
+    for build in HOT_QUERIES.values():
+        table, statement = build()
+        assert table in {t.name for t in HOT_TABLES}
@@ -0,0 +1,118 @@
+"""
+Tests for the query profiler in app.core.query_profiler
+"""
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.core.database import query_budget, query_profiler
+from app.core.query_profiler import QueryBudgetExceeded, QueryProfiler, normalize_statement
+from app.middleware.profiling import QueryProfilingMiddleware
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+    return engine
+
+def test_statements_execute_once(engine):
+    profiler = QueryProfiler()
+    profiler.attach(engine)
+    profiler.attach(engine)
+
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO items (name) VALUES ('a')"))
+        count = conn.execute(text("SELECT COUNT(*) FROM items")).scalar()
+
+    assert count == 1
+
+def test_profile_records_count_time_and_slowest(engine):
+    profiler = QueryProfiler(keep_slowest=2)
+    profiler.attach(engine)
+
+    with profiler.profile("GET /items") as profile:
+        with engine.connect() as conn:
+            for i in range(4):
+                conn.execute(text("SELECT :i"), {"i": i})
+
+    assert profile.count == 4
+    assert profile.total_seconds > 0
+    assert len(profile.slowest()) == 2
+    assert profile.slowest()[0]["statement"] == "SELECT ?"
+    assert profiler.recent() == [profile.to_dict()]
+
+def test_queries_outside_a_profile_are_not_collected(engine):
+    profiler = QueryProfiler()
+    profiler.attach(engine)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert profiler.current() is None
+    assert profiler.recent() == []
+
+def test_middleware_reports_queries_per_request(engine):
+    query_profiler.attach(engine)
+    app = FastAPI()
+    app.add_middleware(QueryProfilingMiddleware)
+
+    @app.get("/items")
+    def list_items():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT * FROM items"))
+            conn.execute(text("SELECT COUNT(*) FROM items"))
+        return []
+
+    response = TestClient(app).get("/items")
+
+    assert response.headers["X-DB-Query-Count"] == "2"
+    assert query_profiler.recent(1)[0]["label"] == "GET /items"
+
+# ============================================================================
+# N+1 DETECTION AND QUERY BUDGETS
+# ============================================================================
+
+def test_normalize_statement_groups_equivalent_queries():
+    assert normalize_statement("SELECT * FROM items WHERE id = 1") == normalize_statement(
+        "SELECT *\n  FROM items WHERE id = ?"
+    )
+    assert normalize_statement("SELECT * FROM items WHERE id IN (?, ?, ?) AND name = 'a'") == (
+        "SELECT * FROM items WHERE id IN (?) AND name = ?"
+    )
+
+def test_repeated_statement_shapes_are_flagged(engine):
+    profiler = QueryProfiler(repeat_threshold=3)
+    profiler.attach(engine)
+
+    with profiler.profile("GET /items") as profile:
+        with engine.connect() as conn:
+            for i in range(3):
+                conn.execute(text("SELECT name FROM items WHERE id = :id"), {"id": i})
+            conn.execute(text("SELECT COUNT(*) FROM items"))
+
+    assert profile.repeated() == [{"count": 3, "statement": "SELECT name FROM items WHERE id = ?"}]
+    with pytest.raises(QueryBudgetExceeded, match="N\\+1"):
+        profile.check()
+
+def test_route_budget_fails_the_request_in_strict_mode(engine, monkeypatch):
+    monkeypatch.setattr(settings, "query_budget_strict", True)
+    query_profiler.attach(engine)
+    app = FastAPI()
+    app.add_middleware(QueryProfilingMiddleware)
+
+    @app.get("/items", dependencies=[Depends(query_budget(1))])
+    def list_items():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT * FROM items"))
+            conn.execute(text("SELECT COUNT(*) FROM items"))
+        return []
+
+    with pytest.raises(QueryBudgetExceeded, match="ran 2 queries, budget is 1"):
+        TestClient(app).get("/items")
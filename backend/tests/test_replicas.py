@@ -0,0 +1,145 @@
+"""
+Tests for read-replica routing in app.core.replicas
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI, Request as FastAPIRequest
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, Integer, String, create_engine, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import NullPool
+from starlette.requests import Request
+
+from app.core.replicas import STICKY_COOKIE, RoutingSession, replica_router, route_session
+from app.middleware.replicas import ReplicaStickyMiddleware
+
+TestBase = declarative_base()
+
+class Item(TestBase):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+def _request(method="GET", token="alice", cookie=None):
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+    if cookie:
+        headers.append((b"cookie", cookie.encode()))
+    return Request({
+        "type": "http",
+        "method": method,
+        "headers": headers,
+        "client": ("127.0.0.1", 1234),
+    })
+
+def _names(db):
+    return [item.name for item in db.scalars(select(Item).order_by(Item.id))]
+
+@pytest.fixture
+def databases(tmp_path, monkeypatch):
+    urls = {}
+    for role in ("primary", "replica"):
+        path = tmp_path / f"{role}.db"
+        engine = create_engine(f"sqlite:///{path}", poolclass=NullPool)
+        TestBase.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(Item.__table__.insert(), {"name": role})
+        urls[role] = (engine, f"sqlite+aiosqlite:///{path}")
+
+    monkeypatch.setattr(replica_router, "replicas", [])
+    monkeypatch.setattr(replica_router, "_sticky", {})
+    replica_engine, replica_async_url = urls["replica"]
+    replica = replica_router.add_replica(
+        "replica-0", replica_engine, create_async_engine(replica_async_url, poolclass=NullPool)
+    )
+    return urls, replica
+
+def test_get_requests_read_from_replica(databases):
+    urls, _ = databases
+    with RoutingSession(bind=urls["primary"][0]) as db:
+        route_session(db, _request("GET"))
+        assert _names(db) == ["replica"]
+
+    with RoutingSession(bind=urls["primary"][0]) as db:
+        route_session(db, _request("POST"))
+        assert _names(db) == ["primary"]
+
+def test_writes_go_to_primary_and_pin_the_writer(databases):
+    urls, _ = databases
+    with RoutingSession(bind=urls["primary"][0]) as db:
+        route_session(db, _request("GET"))
+        db.add(Item(name="new"))
+        db.flush()
+        assert _names(db) == ["primary", "new"]
+        db.commit()
+
+    with RoutingSession(bind=urls["primary"][0]) as db:
+        route_session(db, _request("GET"))
+        assert _names(db) == ["primary", "new"]
+
+    with RoutingSession(bind=urls["primary"][0]) as db:
+        route_session(db, _request("GET", token="bob"))
+        assert _names(db) == ["replica"]
+
+def test_sticky_cookie_pins_reads_in_other_workers(databases):
+    urls, _ = databases
+    # Nothing remembered in this worker; the cookie set by the worker that took the write decides
+    with RoutingSession(bind=urls["primary"][0]) as db:
+        route_session(db, _request("GET", cookie=f"{STICKY_COOKIE}={time.time() + 5}"))
+        assert _names(db) == ["primary"]
+
+    with RoutingSession(bind=urls["primary"][0]) as db:
+        route_session(db, _request("GET", cookie=f"{STICKY_COOKIE}={time.time() - 5}"))
+        assert _names(db) == ["replica"]
+
+def test_async_writes_set_the_sticky_cookie(databases, monkeypatch):
+    urls, _ = databases
+    primary = create_async_engine(urls["primary"][1], poolclass=NullPool)
+    app = FastAPI()
+    app.add_middleware(ReplicaStickyMiddleware)
+
+    @app.api_route("/items", methods=["GET", "POST"])
+    async def items(request: FastAPIRequest):
+        async with AsyncSession(primary, sync_session_class=RoutingSession) as db:
+            route_session(db, request)
+            if request.method == "POST":
+                db.add(Item(name="new"))
+                await db.commit()
+            return (await db.scalars(select(Item.name).order_by(Item.id))).all()
+
+    client = TestClient(app)
+    assert client.get("/items").json() == ["replica"]
+    response = client.post("/items")
+    assert STICKY_COOKIE in response.cookies
+
+    # Another worker: no in-process memory of the write, only the cookie the client sends back
+    monkeypatch.setattr(replica_router, "_sticky", {})
+    assert client.get("/items").json() == ["primary", "new"]
+
+def test_unhealthy_replica_falls_back_to_primary(databases):
+    urls, replica = databases
+    replica_router._mark(replica, False, "down")
+
+    with RoutingSession(bind=urls["primary"][0]) as db:
+        route_session(db, _request("GET"))
+        assert _names(db) == ["primary"]
+
+    replica_router.check_health()
+    assert replica.healthy
+
+def test_async_sessions_route_to_async_replica(databases):
+    urls, _ = databases
+
+    async def scenario():
+        engine = create_async_engine(urls["primary"][1], poolclass=NullPool)
+        async with AsyncSession(engine, sync_session_class=RoutingSession) as db:
+            route_session(db, read_only=True)
+            names = (await db.scalars(select(Item.name))).all()
+        await engine.dispose()
+        return names
+
+    assert asyncio.run(scenario()) == ["replica"]
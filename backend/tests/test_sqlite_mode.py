@@ -0,0 +1,117 @@
+"""
+Tests for the file-backed SQLite engine setup in app.core.database
+"""
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import Column, Integer, event, select, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from app.core import database
+from app.core.database import get_engine
+from app.core.replicas import RoutingSession, replica_router
+
+TestBase = declarative_base()
+
+class Counter(TestBase):
+    __tablename__ = "counters"
+
+    id = Column(Integer, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+@pytest.fixture
+def engines(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    engine = get_engine(url)
+    writer = get_engine(url, writer=True)
+    TestBase.metadata.create_all(writer)
+    with writer.begin() as conn:
+        conn.execute(Counter.__table__.insert(), {"id": 1, "value": 0})
+
+    monkeypatch.setattr(replica_router, "writers", {})
+    replica_router.set_writer(engine, writer)
+    yield engine, writer
+    engine.dispose()
+    writer.dispose()
+
+def test_file_database_uses_wal_and_a_real_pool(engines):
+    engine, writer = engines
+
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+    assert isinstance(engine.pool, QueuePool) and engine.pool.size() > 1
+    assert writer.pool.size() == 1
+
+def test_memory_database_keeps_a_single_connection():
+    assert isinstance(get_engine("sqlite://").pool, StaticPool)
+
+def test_writes_go_through_the_writer_connection(engines):
+    engine, writer = engines
+    statements = []
+    event.listen(writer, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    with RoutingSession(bind=engine) as db:
+        db.get(Counter, 1)
+        assert statements == []
+        db.get(Counter, 1).value += 1
+        db.flush()
+        assert db.scalar(select(Counter.value)) == 1
+        db.commit()
+
+    assert statements[0].startswith("UPDATE counters")
+    assert statements[1].startswith("SELECT counters.value")
+
+def test_raw_sql_writes_use_the_writer_connection(engines):
+    engine, writer = engines
+    statements = []
+    event.listen(writer, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    with RoutingSession(bind=engine) as db:
+        assert db.execute(text("SELECT value FROM counters")).scalar() == 0
+        assert statements == []
+        db.execute(text("UPDATE counters SET value = value + 1"))
+        db.commit()
+
+    assert statements == ["UPDATE counters SET value = value + 1"]
+
+def test_writers_wait_no_longer_than_the_busy_timeout(tmp_path, monkeypatch):
+    monkeypatch.setattr(database.settings, "sqlite_busy_timeout_ms", 200)
+    writer = get_engine(f"sqlite:///{tmp_path / 'busy.db'}", writer=True)
+
+    with writer.connect():
+        started = time.monotonic()
+        with pytest.raises(PoolTimeoutError):
+            writer.connect()
+    assert time.monotonic() - started < 2
+    writer.dispose()
+
+def test_concurrent_writers_do_not_hit_database_locked(engines):
+    engine, _ = engines
+    errors = []
+
+    def award():
+        try:
+            for _ in range(20):
+                with RoutingSession(bind=engine) as db:
+                    db.execute(
+                        Counter.__table__.update().values(value=Counter.value + 1).where(Counter.id == 1)
+                    )
+                    db.commit()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=award) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with engine.connect() as conn:
+        assert conn.execute(select(Counter.value)).scalar() == 160